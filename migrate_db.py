@@ -5,7 +5,7 @@ Run this ONCE after updating the Trend model.
 from sqlmodel import Session, select, text
 from glint.core.database import get_engine
 from glint.core.models import Trend
-from glint.utils.fingerprint import generate_fingerprint
+from glint.utils.fingerprint import generate_fingerprints
 def migrate():
     """Add content fingerprints to all trends."""
     engine = get_engine()
@@ -35,12 +35,10 @@ def migrate():
         
         print(f"Found {len(trends)} trends to fingerprint...")
         
-        for i, trend in enumerate(trends, 1):
-            # Generate fingerprint
-            trend.content_fingerprint = generate_fingerprint(
-                trend.title,
-                trend.description
-            )
+        # Generate fingerprints, one batch for all trends
+        fingerprints = generate_fingerprints((trend.title, trend.description) for trend in trends)
+        for i, (trend, fingerprint) in enumerate(zip(trends, fingerprints), 1):
+            trend.content_fingerprint = fingerprint
             
             # Progress indicator
             if i % 100 == 0:
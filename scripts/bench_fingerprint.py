@@ -0,0 +1,72 @@
+"""
+Microbenchmark of URL normalization and content fingerprinting.
+
+Builds a synthetic corpus (default 100k items, a share of them repeated
+like the stories sources return fetch after fetch) and prints the cost per
+item of the single-item functions and of their batch variants.
+
+    python scripts/bench_fingerprint.py [items]
+"""
+import random
+import sys
+import time
+from glint.utils.fingerprint import generate_fingerprint, generate_fingerprints
+from glint.utils.url_utils import URL_CACHE_SIZE, normalize_url, normalize_urls
+
+WORDS = (
+    "python rust release async compiler database postgres sqlite kernel linux "
+    "browser model training inference open source framework api cloud edge "
+    "wasm runtime garbage collector benchmark security patch vulnerability"
+).split()
+HOSTS = ["github.com", "www.example.com", "news.ycombinator.com", "dev.to", "www.reddit.com"]
+TRACKING = ["", "?utm_source=hn", "?ref=glint&utm_medium=rss", "?id=42&b=2&a=1"]
+REPEATED = 0.3  # share of items already seen in the corpus
+
+
+def corpus(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    items = []
+    for i in range(size):
+        if items and rng.random() < REPEATED:
+            items.append(rng.choice(items))
+            continue
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10)))
+        title = f"{title.capitalize()} {rng.randint(1, 9)}.{rng.randint(0, 20)}"
+        description = f"Score: {rng.randint(0, 500)} by user{i} https://{rng.choice(HOSTS)}/x"
+        url = f"http://{rng.choice(HOSTS)}/{rng.choice(WORDS)}/{i}/{rng.choice(TRACKING)}"
+        items.append((title, description, url))
+    return items
+
+
+def timed(label: str, function, size: int):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:7.3f}s  {elapsed / size * 1e6:7.2f} µs/item")
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    items = corpus(size)
+    urls = [url for _, _, url in items]
+    pairs = [(title, description) for title, description, _ in items]
+    print(f"{size} items, {len(set(urls))} distinct URLs\n")
+
+    normalize_url.cache_clear()
+    single = timed("normalize_url", lambda: [normalize_url(url) for url in urls], size)
+    normalize_url.cache_clear()
+    batch = timed("normalize_urls", lambda: normalize_urls(urls), size)
+    assert batch == single
+    # The next fetch returns mostly stories the memo already holds
+    recent = urls[-URL_CACHE_SIZE // 2:]
+    normalize_urls(recent)
+    timed("normalize_url (memo hits)", lambda: [normalize_url(url) for url in recent], len(recent))
+
+    single = timed("generate_fingerprint", lambda: [generate_fingerprint(*pair) for pair in pairs], size)
+    batch = timed("generate_fingerprints", lambda: generate_fingerprints(pairs), size)
+    assert batch == single
+
+
+if __name__ == "__main__":
+    main()
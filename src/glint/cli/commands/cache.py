@@ -1,6 +1,11 @@
 import typer
 from rich.console import Console
+from rich.table import Table
+from sqlmodel import Session
+from glint.core.database import get_engine
+from glint.core.seen_filter import seen_filter
 from glint.utils.cache import trend_cache
+from glint.utils.http_client import http_client
 
 
 app = typer.Typer()
@@ -8,14 +13,74 @@ console = Console()
 
 @app.command()
 def clear():
-    """Clear the trend cache"""
+    """Clear the trend cache and the HTTP response cache"""
     trend_cache.clear()
+    http_client.cache.clear()
     console.print("[green]Cache cleared successfully[/green]")
 #end clear
 
 @app.command()
 def stats():
     """show cache statistics"""
-    cache_size = len(trend_cache._cache)
-    console.print(f"Cache entries: {cache_size}")
-    console.print(f"TIME TO LIVE: {trend_cache._ttl} seconds")
\ No newline at end of file
+    cache_stats = trend_cache.stats()
+    table = Table(title="Trend cache")
+    table.add_column("Source", style="cyan")
+    table.add_column("Entries", justify="right")
+    table.add_column("Stale", justify="right")
+    table.add_column("KB", justify="right")
+    table.add_column("Hit rate", justify="right")
+    table.add_column("Stale hits", justify="right")
+    table.add_column("Misses", justify="right")
+    for source, row in sorted(cache_stats["sources"].items()):
+        hits, stale, misses = row.get("hits", 0), row.get("stale", 0), row.get("misses", 0)
+        lookups = hits + stale + misses
+        table.add_row(
+            source or "-",
+            str(row["entries"]),
+            str(row["stale"]),
+            f"{row['bytes'] / 1024:.1f}",
+            f"{(hits + stale) / lookups:.0%}" if lookups else "-",
+            str(stale),
+            str(misses)
+        )
+    console.print(table)
+
+    console.print(
+        f"Cache entries: {cache_stats['entries']} ({cache_stats['stale']} stale) of {trend_cache.max_entries}, "
+        f"{cache_stats['bytes'] / 1024:.1f} KB of {trend_cache.max_bytes / (1024 * 1024):.0f} MB"
+    )
+    if cache_stats["entries"]:
+        console.print(
+            f"Entry ages: newest {cache_stats['newest']:.0f}s, "
+            f"mean {cache_stats['mean_age']:.0f}s, oldest {cache_stats['oldest']:.0f}s"
+        )
+    console.print(f"Evictions: {cache_stats['evictions']}")
+    console.print(f"Served stale for up to {trend_cache.max_stale} seconds after expiry")
+    http_stats = http_client.cache.stats()
+    console.print(
+        f"HTTP cache: {http_stats['entries']} responses, "
+        f"{http_stats['bytes'] / 1024:.1f} KB of {http_client.cache.max_bytes / (1024 * 1024):.0f} MB"
+    )
+    filter_stats = seen_filter.stats()
+    if filter_stats:
+        console.print(
+            f"Seen filter: {filter_stats['items']} URLs and fingerprints of {filter_stats['capacity']}, "
+            f"{filter_stats['bytes'] / 1024:.0f} KB, {filter_stats['hashes']} hashes, "
+            f"{filter_stats['fill_ratio']:.1%} bits set, "
+            f"false-positive rate {filter_stats['false_positive_rate']:.3%}"
+        )
+    else:
+        console.print("Seen filter: not built yet, run glint cache rebuild-filter or glint fetch")
+#end stats
+
+@app.command("rebuild-filter")
+def rebuild_filter():
+    """Rebuild the Bloom filter of seen URLs and fingerprints from the trend table"""
+    with Session(get_engine()) as session:
+        seen_filter.rebuild(session)
+    filter_stats = seen_filter.stats()
+    console.print(
+        f"[green]Seen filter rebuilt: {filter_stats['items']} URLs and fingerprints, "
+        f"false-positive rate {filter_stats['false_positive_rate']:.3%}[/green]"
+    )
+#end rebuild_filter
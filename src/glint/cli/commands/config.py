@@ -44,6 +44,75 @@ def show_secrets():
         
     console.print(table)
 
+# Per-source tuning
+sources_app = typer.Typer(help="Tune per-source fetching (max_workers, topic_timeout, hackernews strategy...)")
+app.add_typer(sources_app, name="sources")
+
+from glint.sources.base import DEFAULT_MAX_WORKERS, DEFAULT_TOPIC_TIMEOUT
+from glint.sources.hackernews import STRATEGIES, DEFAULT_MAX_ITEMS, DEFAULT_FAN_OUT, DEFAULT_SEARCH_MAX_TOPICS
+
+SOURCE_SETTINGS = {
+    # key: (type, smallest value or allowed values, default, what it sets)
+    "max_workers": (int, 1, DEFAULT_MAX_WORKERS, "topics fetched concurrently by the source"),
+    "topic_timeout": (float, 1, DEFAULT_TOPIC_TIMEOUT, "seconds before a single topic is abandoned"),
+    "max_items": (int, 1, DEFAULT_MAX_ITEMS, "hackernews: top stories scanned per fetch"),
+    "fan_out": (int, 1, DEFAULT_FAN_OUT, "hackernews: item requests sent concurrently"),
+    "search_max_topics": (int, 0, DEFAULT_SEARCH_MAX_TOPICS, "hackernews: auto searches up to this many topics, 0 never"),
+    "strategy": (str, STRATEGIES, "auto", "hackernews: search per topic, scan the top stories, or auto"),
+}
+
+@sources_app.command("set")
+def set_source_setting(source: str, key: str, value: str):
+    """Set a source setting (e.g., github max_workers 8, hackernews strategy search)."""
+    if key not in SOURCE_SETTINGS:
+        console.print(f"[red]Unknown setting '{key}'. Available: {', '.join(SOURCE_SETTINGS)}[/red]")
+        return
+    kind, allowed, _, _ = SOURCE_SETTINGS[key]
+    try:
+        parsed = kind(value.lower() if kind is str else value)
+    except ValueError:
+        console.print(f"[red]Invalid value for {key}: {value}[/red]")
+        return
+    if isinstance(allowed, tuple):
+        if parsed not in allowed:
+            console.print(f"[red]{key} must be one of: {', '.join(allowed)}.[/red]")
+            return
+    elif parsed < allowed:
+        console.print(f"[red]{key} must be at least {allowed}.[/red]")
+        return
+
+    config_manager.set_source_setting(source.lower(), key, parsed)
+    console.print(f"[green]{source.lower()}.{key} set to {parsed}.[/green]")
+
+@sources_app.command("show")
+def show_source_settings():
+    """Show the settable keys and the per-source settings (defaults apply to unlisted ones)."""
+    keys = Table(title="Settable Keys")
+    keys.add_column("Key", style="cyan")
+    keys.add_column("Default", justify="right", style="magenta")
+    keys.add_column("Allowed")
+    keys.add_column("Description")
+    for key, (_, allowed, default, description) in SOURCE_SETTINGS.items():
+        allowed_text = ", ".join(allowed) if isinstance(allowed, tuple) else f">= {allowed}"
+        keys.add_row(key, str(default), allowed_text, description)
+    console.print(keys)
+
+    settings = config_manager.get_all_source_settings()
+    if not settings:
+        console.print("[yellow]No source overrides configured.[/yellow]")
+        return
+
+    table = Table(title="Source Settings")
+    table.add_column("Source", style="cyan")
+    table.add_column("Key")
+    table.add_column("Value", justify="right", style="magenta")
+
+    for source, values in settings.items():
+        for key, value in values.items():
+            table.add_row(source, key, str(value))
+
+    console.print(table)
+
 @topics_app.command("list")
 def list_topics():
     """List all watched topics and their status."""
@@ -103,8 +172,8 @@ def delete_topic(
             return
         
         # Import here to avoid circular imports
-        from sqlmodel import func, select as sql_select
-        from glint.core.models import Trend, UserActivity
+        from sqlmodel import func, delete, select as sql_select
+        from glint.core.models import Trend, TrendBand, UserActivity
         from glint.utils.ml_exporter import export_topic_data
         
         # Count associated data
@@ -165,12 +234,13 @@ def delete_topic(
             console.print("[yellow]Continuing with deletion...[/yellow]\n")
         
         # Manual CASCADE delete
-        # Order matters: UserActivity → Trends → Topic
+        # Order matters: UserActivity, TrendBand → Trends → Topic
         
-        # 1. Delete user activities
+        # 1. Delete user activities and near-duplicate index rows
         if trend_ids:
             for activity in activities:
                 session.delete(activity)
+            session.exec(delete(TrendBand).where(TrendBand.trend_id.in_(trend_ids)))
         
         # 2. Delete trends
         for trend in trends:
@@ -1,33 +1,37 @@
 import typer
 import time
+from typing import Optional
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 from sqlmodel import Session, select
 from glint.core.database import get_engine
-from glint.core.models import Trend, Topic
-from glint.core.parallel_fetcher import ParallelFetcher 
-from glint.utils.url_utils import normalize_url 
-from glint.utils.relevance import calculate_relevance
-from glint.utils.fingerprint import generate_fingerprint
+from glint.core.models import Topic
+from glint.core.parallel_fetcher import ParallelFetcher
+from glint.core.pipeline import run_pipeline, OVERLAPPING_STAGES
 
 
 console = Console()
 app = typer.Typer()
 
 @app.command()
-def fetch():
+def fetch(
+    full: bool = typer.Option(False, "--full", help="Full backfill: ignore watermarks and refetch the whole window"),
+    timings: bool = typer.Option(False, "--timings", help="Show the time spent in each pipeline stage"),
+    deadline: Optional[float] = typer.Option(None, "--deadline", help="Seconds allowed for the whole fetch (default: settings, 60)"),
+):
     """
     Fetch the latest tech trends for watched topics.
     """
-    console.print("[bold blue]Fetching latest tech trends...[/bold blue]")
+    mode = "full backfill" if full else "incremental"
+    console.print(f"[bold blue]Fetching latest tech trends ({mode})...[/bold blue]")
 
     #create parallel fetcher
-    coordinator = ParallelFetcher()
-    new_trends_count = 0
+    coordinator = ParallelFetcher(backfill=full, deadline=deadline)
 
-    engine = get_engine()
+    db_engine = get_engine()
 
-    with Session(engine) as session:
+    with Session(db_engine) as session:
         # Get ALL topics (active and inactive) - inactive topics are in "standby mode"
         all_topics = session.exec(select(Topic)).all()
         
@@ -41,76 +45,58 @@ def fetch():
             TextColumn("[progress.description]{task.description}"),
             transient=True,
         ) as progress:
-            task = progress.add_task(description="Fetching from all sources ...", total=None)
+            task = progress.add_task(description="Fetching and ingesting from all sources ...", total=None)
             
             # Measure fetch time
             start_time = time.time()
             
-            # PARALLEL FETCH - All sources at once!
-            all_trends = coordinator.fetch_all(all_topics)
+            # PARALLEL FETCH - All sources at once, each one ingested as soon as it finishes
+            result = run_pipeline(session, coordinator.fetch_all(all_topics), all_topics)
+            new_trends_count = result.added
             
             elapsed_time = time.time() - start_time
-            
-            progress.update(task, description="Processing and deduplicating trends...")
-            
-            # Process all fetched trends (deduplication, scoring)
-            for trend in all_trends:
-                # Normalize URL
-                normalized_url = normalize_url(trend.url)
-                
-                # Check for URL duplicates
-                existing_trend = session.exec(
-                    select(Trend).where(Trend.url_normalized == normalized_url)
-                ).first()
-                
-                if not existing_trend:
-                    # Store normalized URL
-                    trend.url_normalized = normalized_url
-                    
-                    # Generate fingerprint
-                    trend.content_fingerprint = generate_fingerprint(
-                        trend.title,
-                        trend.description
-                    )
-                    
-                    # Check for content duplicates
-                    fingerprint_match = session.exec(
-                        select(Trend).where(
-                            Trend.content_fingerprint == trend.content_fingerprint
-                        )
-                    ).first()
-                    
-                    if not fingerprint_match:
-                        # Find which topic this trend matched
-                        matched_topic = None
-                        for topic in all_topics:
-                            if trend.topic_id == topic.id:
-                                matched_topic = topic
-                                break
-                        
-                        if matched_topic:
-                            # Calculate relevance score
-                            trend.relevance_score = calculate_relevance(trend, matched_topic)
-                            
-                            # Set status based on score threshold
-                            if trend.relevance_score >= 0.3:
-                                trend.status = "approved"
-                            else:
-                                trend.status = "rejected"
-                        else:
-                            trend.relevance_score = 0.0
-                            trend.status = "rejected"
-                        
-                        # Save ALL trends (approved or rejected)
-                        session.add(trend)
-                        new_trends_count += 1
-        
-        # Commit all at once (faster than individual commits)
-        session.commit()
     
     # Show results with timing
     if new_trends_count > 0:
         console.print(f"[green]✓ Fetch complete in {elapsed_time:.1f}s![/green]")
         console.print(f"[green]✓ Added {new_trends_count} new trends to database[/green]")
     else:
-        console.print(f"[dim]Fetch complete in {elapsed_time:.1f}s. No new trends found.[/dim]")
\ No newline at end of file
+        console.print(f"[dim]Fetch complete in {elapsed_time:.1f}s. No new trends found.[/dim]")
+    if coordinator.timed_out:
+        console.print(
+            f"[yellow]Timed out after {coordinator.deadline:g}s: {', '.join(coordinator.timed_out)}[/yellow]"
+        )
+    if result.dropped_by_url or result.dropped_by_fingerprint or result.dropped_as_near_duplicate:
+        console.print(
+            f"[dim]Skipped {result.dropped_by_url} duplicate URLs, "
+            f"{result.dropped_by_fingerprint} duplicate contents and "
+            f"{result.dropped_as_near_duplicate} near-duplicates[/dim]"
+        )
+    if result.merged or result.updated:
+        console.print(
+            f"[dim]Merged {result.merged} cross-posts, updated the points of {result.updated} stored trends[/dim]"
+        )
+
+    if timings:
+        show_timings(result)
+
+def show_timings(result):
+    """Print the per-stage breakdown of a pipeline run"""
+    table = Table(title="Pipeline timings")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Time", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("Items in", justify="right")
+    table.add_column("Items out", justify="right")
+
+    total = result.total_seconds or 1.0
+    for stage in result.stages.values():
+        overlapping = stage.name in OVERLAPPING_STAGES
+        table.add_row(
+            stage.name + (" (in fetch)" if overlapping else ""),
+            f"{stage.seconds:.3f}s",
+            f"{stage.seconds / total:.0%}",
+            str(stage.items_in) if stage.name != "fetch" and not overlapping else "-",
+            str(stage.items_out) if not overlapping else "-"
+        )
+    console.print(table)
@@ -3,7 +3,7 @@
 import typer
 import sys
 from rich.console import Console
-from glint.core.database import create_db_and_tables
+from glint.core.database import create_db_and_tables, get_db_path
 from glint.cli.commands import init, topics, fetch, status, clear, config, show, daemon, analyze, cache
 from glint.core.logger import setup_logging
 
@@ -32,13 +32,19 @@ app.add_typer(config.app, name="config")
 app.add_typer(analyze.app, name="analyze")
 app.add_typer(cache.app, name="cache")
 
+@app.callback()
+def upgrade_database():
+    """Create missing tables and columns before any command, the `glint` script starts here"""
+    # Before `glint init` there is no ~/.glint to put the database in
+    if get_db_path().parent.exists():
+        create_db_and_tables()
+
 def main():
     """Main entry point for Glint CLI"""
-    # Ensure DB exists
-    create_db_and_tables()
-    
     # If no arguments provided (double-click), launch the web UI
     if len(sys.argv) == 1:
+        # Ensure DB exists
+        create_db_and_tables()
         from glint.web.server import start_server, open_dashboard
         import threading
         
@@ -54,6 +54,28 @@ class ConfigManager:
         config["api_keys"][key] = value
         self._save_to_file(config)
 
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        """Get a value from the settings section."""
+        config = self._load_from_file()
+        return config.get("settings", {}).get(key, default)
+
+    def get_source_settings(self, source: str) -> Dict[str, Any]:
+        """Get the tuning settings of a source (e.g., max_workers, topic_timeout)."""
+        config = self._load_from_file()
+        return config.get("settings", {}).get("sources", {}).get(source, {})
+
+    def set_source_setting(self, source: str, key: str, value: Any):
+        """Set a tuning setting for a source."""
+        config = self._load_from_file()
+        sources = config.setdefault("settings", {}).setdefault("sources", {})
+        sources.setdefault(source, {})[key] = value
+        self._save_to_file(config)
+
+    def get_all_source_settings(self) -> Dict[str, Dict[str, Any]]:
+        """Get the tuning settings of every configured source (for display)."""
+        config = self._load_from_file()
+        return config.get("settings", {}).get("sources", {})
+
     def get_all_secrets(self) -> Dict[str, str]:
         """Get all secrets (for display)."""
         config = self._load_from_file()
@@ -1,5 +1,16 @@
+import sqlite3
 from sqlmodel import SQLModel, create_engine
+from sqlalchemy import inspect, insert, text
 from pathlib import Path
+from glint.core.models import Trend, TrendBand
+from glint.utils.canonical import canonical_url
+from glint.utils.fingerprint import minhash_signature, lsh_bands
+
+# INSERT ... ON CONFLICT DO NOTHING RETURNING, used by the ingest pipeline
+MIN_SQLITE_VERSION = (3, 35, 0)
+# PRAGMA user_version: data migrations already applied, see upgrade_data()
+DATA_VERSION = 2
+MIGRATION_BATCH = 1000  # trends updated per statement by a data migration
 
 # Define where the file will live
 # We'll default to a relative path for now, but init command will set this up properly
@@ -19,5 +30,142 @@ def get_engine():
     return create_engine(sqlite_url)
 
 def create_db_and_tables():
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"Glint needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer, "
+            f"this Python has SQLite {sqlite3.sqlite_version}"
+        )
     engine = get_engine()
     SQLModel.metadata.create_all(engine)
+    if upgrade_schema(engine):
+        # The seen filter holds the URLs from before the upgrade, the next ingest rebuilds it
+        (get_db_path().parent / "seen.bloom").unlink(missing_ok=True)
+
+def upgrade_schema(engine):
+    """
+    Bring an existing database up to date with the models.
+    create_all() only creates missing tables, so columns added to a model
+    later are added here (they must be nullable or have a server default).
+    Returns True if stored trends were rewritten by a data migration.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)  # on the same connection, inside the transaction
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                if column.index:
+                    unique = "UNIQUE " if column.unique else ""
+                    conn.execute(text(
+                        f'CREATE {unique}INDEX IF NOT EXISTS "ix_{table.name}_{column.name}" '
+                        f'ON "{table.name}" ("{column.name}")'
+                    ))
+    changed = upgrade_data(engine)
+    upgrade_unique_indexes(engine)
+    return changed
+
+def upgrade_data(engine) -> bool:
+    """
+    Run the data migrations the database has not seen yet, once each.
+    Returns True if stored URLs were rewritten.
+    """
+    with engine.begin() as conn:
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+        if version >= DATA_VERSION:
+            return False
+        changed = False
+        if version < 1:
+            changed = canonicalize_urls(conn) or changed
+        if version < 2:
+            index_near_duplicates(conn)
+        conn.execute(text(f"PRAGMA user_version = {DATA_VERSION}"))
+    return changed
+
+def canonicalize_urls(conn) -> bool:
+    """
+    Version 1: url_normalized holds the canonical URL (glint.utils.canonical),
+    rows stored before only had the normalized one. Rows that now share a URL
+    are collapsed; upgrade_unique_indexes() then restores the unique index.
+    """
+    rows = conn.execute(text("SELECT id, url, url_normalized FROM trend")).all()
+    updates = []
+    for trend_id, url, url_normalized in rows:
+        canonical = canonical_url(url)
+        if canonical != url_normalized:
+            updates.append({"id": trend_id, "url": canonical})
+    if not updates:
+        return False
+    conn.execute(text('DROP INDEX IF EXISTS "ix_trend_url_normalized"'))
+    conn.execute(text("UPDATE trend SET url_normalized = :url WHERE id = :id"), updates)
+    collapse_duplicates(conn, Trend.__table__, "url_normalized")
+    return True
+
+def index_near_duplicates(conn):
+    """
+    Version 2: trends stored before near-duplicate detection have no MinHash
+    signature nor TrendBand rows, so new trends were never compared to them.
+    """
+    rows = conn.execute(text("SELECT id, title FROM trend WHERE minhash IS NULL")).all()
+    for i in range(0, len(rows), MIGRATION_BATCH):
+        signatures = []
+        bands = []
+        for trend_id, title in rows[i:i + MIGRATION_BATCH]:
+            signature = minhash_signature(title or "")
+            if signature is None:
+                continue  # too few terms, like at ingest
+            signatures.append({"id": trend_id, "minhash": signature})
+            bands.extend({"key": key, "trend_id": trend_id} for key in lsh_bands(signature))
+        if signatures:
+            conn.execute(text("UPDATE trend SET minhash = :minhash WHERE id = :id"), signatures)
+            conn.execute(insert(TrendBand), bands)
+
+def upgrade_unique_indexes(engine):
+    """
+    Turn indexes that became unique in the models into unique indexes.
+    Existing duplicates are collapsed first: the oldest row is kept and rows
+    of other tables pointing to a removed duplicate are repointed to it.
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)  # on the same connection, inside the transaction
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"]: index for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if not index.unique:
+                    continue
+                current = existing.get(index.name)
+                if current is not None and current["unique"]:
+                    continue
+                for column in index.columns:
+                    collapse_duplicates(conn, table, column.name)
+                columns = ", ".join(f'"{column.name}"' for column in index.columns)
+                conn.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+                conn.execute(text(f'CREATE UNIQUE INDEX "{index.name}" ON "{table.name}" ({columns})'))
+
+def collapse_duplicates(conn, table, column_name: str):
+    """Delete rows of `table` sharing a non-null `column_name`, keeping the lowest id"""
+    keepers = (
+        f'SELECT MIN(id) FROM "{table.name}" WHERE "{column_name}" IS NOT NULL GROUP BY "{column_name}"'
+    )
+    duplicates = (
+        f'SELECT id FROM "{table.name}" WHERE "{column_name}" IS NOT NULL AND id NOT IN ({keepers})'
+    )
+    # Repoint foreign keys (e.g. useractivity.trend_id) to the row that is kept
+    for other in SQLModel.metadata.sorted_tables:
+        for foreign_key in other.foreign_keys:
+            if foreign_key.column.table is not table or foreign_key.column.name != "id":
+                continue
+            fk = foreign_key.parent.name
+            conn.execute(text(
+                f'UPDATE "{other.name}" SET "{fk}" = ('
+                f'SELECT MIN(kept.id) FROM "{table.name}" kept, "{table.name}" dup '
+                f'WHERE dup.id = "{other.name}"."{fk}" AND kept."{column_name}" = dup."{column_name}"'
+                f') WHERE "{fk}" IN ({duplicates})'
+            ))
+    conn.execute(text(f'DELETE FROM "{table.name}" WHERE id IN ({duplicates})'))
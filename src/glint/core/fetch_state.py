@@ -0,0 +1,181 @@
+"""
+Fetch state kept in the FetchMetadata table.
+
+Rows with a URL hold the HTTP validators (ETag / Last-Modified) returned
+for one request of a (source, topic), so the next fetch can send a
+conditional request and get a cheap 304 when nothing changed.
+
+Rows without a URL hold the high watermark (last_cursor) of a
+(source, topic): newest published date, max item id... so the next fetch
+only asks for newer items.
+
+Both are staged while a source fetches and only stored by commit() once its
+trends are committed, see ParallelFetcher.fetch_all. Each fetch stages under
+its own token, carried to the fetch threads by a context variable: two fetches
+of the same source in one process (web command and GUI notifier, background
+cache refresh) never store or drop each other's state. State set outside a
+fetch begun with begin() (e.g. a cache refresh) is never stored.
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlmodel import Session, select
+from glint.core.database import get_engine
+from glint.core.models import FetchMetadata
+from glint.core.logger import get_logger
+
+logger = get_logger("FetchState")
+
+Validators = Tuple[Optional[str], Optional[str]]  # (etag, last_modified)
+
+# Token of the fetch running in this context, copied to the worker threads it starts
+_current_fetch: ContextVar[Optional[str]] = ContextVar("glint_fetch", default=None)
+
+
+class FetchStateStore:
+    """Read-through, write-through cache of FetchMetadata, safe to share between fetch threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._validators: Optional[Dict[Tuple[str, str, str], Validators]] = None
+        self._cursors: Optional[Dict[Tuple[str, str], str]] = None
+        # fetch token -> {(source, topic_name, url or None for the watermark): validators or cursor} not stored yet
+        self._pending: Dict[str, Dict[Tuple[str, str, Optional[str]], Any]] = {}
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+
+    def begin(self) -> str:
+        """Token of a new fetch, its state is staged under it until commit(token) or rollback(token)"""
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._pending[token] = {}
+        return token
+
+    @contextmanager
+    def staging(self, token: Optional[str]):
+        """Stage the state set in this block, and in the threads it starts, under `token` (None: not at all)"""
+        reset = _current_fetch.set(token)
+        try:
+            yield
+        finally:
+            _current_fetch.reset(reset)
+
+    def _stage(self, key: Tuple[str, str, Optional[str]], state: Any):
+        pending = self._pending.get(_current_fetch.get())
+        # Not part of a fetch that will be committed: a cache refresh, a topic
+        # still running after its fetch was handed over...
+        if pending is not None:
+            pending[key] = state
+
+    def _load_validators(self) -> Dict[Tuple[str, str, str], Validators]:
+        """Load every validator row at once, the table is small"""
+        try:
+            with Session(self._get_engine()) as session:
+                rows = session.exec(
+                    select(FetchMetadata).where(FetchMetadata.url != None)
+                ).all()
+            return {
+                (row.source, row.topic_name, row.url): (row.last_etag, row.last_modified)
+                for row in rows
+            }
+        except Exception as e:
+            logger.debug(f"Could not load fetch metadata: {e}")
+            return {}
+
+    def get_validators(self, source: str, topic_name: str, url: str) -> Validators:
+        """Return the (etag, last_modified) stored for a request, (None, None) if unknown"""
+        with self._lock:
+            if self._validators is None:
+                self._validators = self._load_validators()
+            return self._validators.get((source, topic_name, url), (None, None))
+
+    def save_validators(
+        self,
+        source: str,
+        topic_name: str,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str]
+    ):
+        """Stage the validators of a request, stored by commit() of the current fetch"""
+        with self._lock:
+            self._stage((source, topic_name, url), (etag, last_modified))
+
+    def _load_cursors(self) -> Dict[Tuple[str, str], str]:
+        try:
+            with Session(self._get_engine()) as session:
+                rows = session.exec(
+                    select(FetchMetadata).where(FetchMetadata.url == None)
+                ).all()
+            return {(row.source, row.topic_name): row.last_cursor for row in rows}
+        except Exception as e:
+            logger.debug(f"Could not load fetch metadata: {e}")
+            return {}
+
+    def get_cursor(self, source: str, topic_name: str) -> Optional[str]:
+        """Return the high watermark of a (source, topic), None if never fetched"""
+        with self._lock:
+            if self._cursors is None:
+                self._cursors = self._load_cursors()
+            return self._cursors.get((source, topic_name))
+
+    def set_cursor(self, source: str, topic_name: str, cursor: str):
+        """Stage the high watermark of a (source, topic), stored by commit() of the current fetch"""
+        with self._lock:
+            self._stage((source, topic_name, None), cursor)
+
+    def commit(self, token: str):
+        """
+        Store the validators and watermarks staged by the fetch `token`,
+        once the trends it fetched are committed: if ingestion fails, the
+        next fetch asks for the same items again instead of getting a 304 or
+        starting after them.
+        """
+        with self._lock:
+            pending = self._pending.pop(token, None)
+            if not pending:
+                return
+            if self._validators is None:
+                self._validators = self._load_validators()
+            if self._cursors is None:
+                self._cursors = self._load_cursors()
+            for (source, topic_name, url), state in pending.items():
+                if url is None:
+                    self._cursors[(source, topic_name)] = state
+                else:
+                    self._validators[(source, topic_name, url)] = state
+            sources = {source for source, _, _ in pending}
+            try:
+                with Session(self._get_engine()) as session:
+                    rows = session.exec(select(FetchMetadata).where(FetchMetadata.source.in_(sources))).all()
+                    rows_by_key = {(row.source, row.topic_name, row.url): row for row in rows}
+                    now = datetime.utcnow()
+                    for (source, topic_name, url), state in pending.items():
+                        row = rows_by_key.get((source, topic_name, url))
+                        if row is None:
+                            row = FetchMetadata(source=source, topic_name=topic_name, url=url, last_fetch_at=now)
+                        if url is None:
+                            row.last_cursor = state
+                        else:
+                            row.last_etag, row.last_modified = state
+                        row.last_fetch_at = now
+                        session.add(row)
+                    session.commit()
+            except Exception as e:
+                logger.debug(f"Could not save fetch metadata for {', '.join(sorted(sources))}: {e}")
+
+    def rollback(self, token: str):
+        """Forget the validators and watermarks staged by the fetch `token`, its trends were not stored"""
+        with self._lock:
+            self._pending.pop(token, None)
+
+# Global instance
+fetch_state = FetchStateStore()
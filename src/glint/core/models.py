@@ -1,5 +1,7 @@
-from typing import Optional
+import json
+from typing import Dict, List, Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 from enum import Enum
 
@@ -19,8 +21,8 @@ class Trend(SQLModel, table=True):
     title: str
     description: Optional[str] = None
     url: str
-    url_normalized: Optional[str]= Field(default=None,index=True)
-    content_fingerprint: Optional[str] = Field(default=None,index=True)
+    url_normalized: Optional[str]= Field(default=None,index=True,unique=True)
+    content_fingerprint: Optional[str] = Field(default=None,index=True,unique=True)
     relevance_score: Optional[float] = Field(default=None, index=True)
     status: Optional[str] = Field(default="approved", index=True)
     source: str  # e.g., "github", "hackernews"
@@ -30,6 +32,119 @@ class Trend(SQLModel, table=True):
     is_read: bool = Field(default=False)
     # Foreign key to link to Topic
     topic_id: Optional[int] = Field(default=None, foreign_key="topic.id")
+    minhash: Optional[bytes] = None # MinHash signature of the title, see utils/fingerprint.py
+    # Every source that posted the story, as JSON {source: [points, comments]}, and their totals
+    sources: Optional[str] = None
+    points: Optional[int] = Field(default=None, index=True)
+    comments: Optional[int] = None
+
+class TrendBand(SQLModel, table=True):
+    """LSH band keys of a trend's MinHash signature: trends sharing a key are near-duplicate candidates"""
+    __table_args__ = (Index("ix_trendband_key", "key"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: int # band number and band slots hashed to a signed 64-bit integer
+    trend_id: int = Field(foreign_key="trend.id")
+
+class TrendRecord:
+    """
+    A fetched trend before it is stored: what sources return and trend_cache keeps.
+    A plain __slots__ object, so it is cheap to build and pickles as a
+    small tuple, with no SQLAlchemy state. The pipeline fills in the
+    normalized URL, fingerprint, score and status, then stores it with to_row().
+
+    `points` and `comments` are the engagement on its source (upvotes, stars,
+    reactions...). When the same story comes from several sources the
+    pipeline merges them into one record: `engagement` keeps them per source.
+    """
+    __slots__ = (
+        "title", "description", "url", "source", "category", "published_at", "topic_id", "fetched_at",
+        "points", "comments",
+        "url_normalized", "content_fingerprint", "relevance_score", "status", "minhash", "engagement"
+    )
+
+    def __init__(
+        self,
+        title: str,
+        description: Optional[str],
+        url: str,
+        source: str,
+        category: str = "general",
+        published_at: Optional[datetime] = None,
+        topic_id: Optional[int] = None,
+        fetched_at: Optional[datetime] = None,
+        relevance_score: Optional[float] = None,
+        status: Optional[str] = "approved",
+        points: Optional[int] = None,
+        comments: Optional[int] = None
+    ):
+        self.title = title
+        self.description = description
+        self.url = url
+        self.source = source
+        self.category = category
+        self.published_at = published_at
+        self.topic_id = topic_id
+        self.fetched_at = fetched_at or datetime.utcnow()
+        self.points = points
+        self.comments = comments
+        self.url_normalized: Optional[str] = None
+        self.content_fingerprint: Optional[str] = None
+        self.relevance_score = relevance_score
+        self.status = status
+        self.minhash: Optional[bytes] = None
+        self.engagement: Dict[str, List[Optional[int]]] = {source: [points, comments]}
+
+    def __reduce__(self):
+        # Only the fetched fields, the pipeline recomputes the others
+        return (TrendRecord, (
+            self.title, self.description, self.url, self.source, self.category,
+            self.published_at, self.topic_id, self.fetched_at, None, "approved", self.points, self.comments
+        ))
+
+    def __repr__(self) -> str:
+        return f"TrendRecord(source={self.source!r}, title={self.title!r}, url={self.url!r})"
+
+    def absorb(self, other: "TrendRecord"):
+        """Merge the engagement of the same story fetched from another source (or topic)"""
+        for source, (points, comments) in other.engagement.items():
+            mine = self.engagement.setdefault(source, [None, None])
+            mine[0] = _max(mine[0], points)
+            mine[1] = _max(mine[1], comments)
+
+    def to_row(self) -> dict:
+        """Column values of the Trend row to insert"""
+        return {
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "url_normalized": self.url_normalized,
+            "content_fingerprint": self.content_fingerprint,
+            "relevance_score": self.relevance_score,
+            "status": self.status,
+            "source": self.source,
+            "category": self.category,
+            "published_at": self.published_at,
+            "fetched_at": self.fetched_at,
+            "is_read": False,
+            "topic_id": self.topic_id,
+            "minhash": self.minhash,
+            **engagement_columns(self.engagement),
+        }
+
+def engagement_columns(engagement: Dict[str, List[Optional[int]]]) -> dict:
+    """sources / points / comments columns of a trend posted on every source of `engagement`"""
+    return {
+        "sources": json.dumps(engagement, sort_keys=True),
+        "points": _total(values[0] for values in engagement.values()),
+        "comments": _total(values[1] for values in engagement.values()),
+    }
+
+def _total(values) -> Optional[int]:
+    known = [value for value in values if value is not None]
+    return sum(known) if known else None
+
+def _max(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    return b if a is None else a if b is None else max(a, b)
 
 class Project(SQLModel, table = True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -59,6 +174,20 @@ class FetchMetadata(SQLModel, table= True):
     id: Optional[int] = Field(default=None, primary_key=True)
     source: str = Field(index=True)
     topic_name :str = Field(index=True)
+    url: Optional[str] = Field(default=None, index=True) # set for HTTP validator rows
     last_fetch_at: datetime
     last_etag: Optional[str] = None
-    last_cursor:Optional[str] = None
\ No newline at end of file
+    last_modified: Optional[str] = None # Last-Modified header, sent back as If-Modified-Since
+    last_cursor:Optional[str] = None
+
+class HackerNewsItem(SQLModel, table=True):
+    """Local copy of a Hacker News item, so each fetch only downloads new stories"""
+    id: int = Field(primary_key=True) # HN item id
+    title: Optional[str] = None
+    url: Optional[str] = None # None for items without a link (Ask HN, comments...)
+    text: Optional[str] = None
+    by: Optional[str] = None
+    time: int = Field(default=0) # Unix timestamp
+    score: int = Field(default=0)
+    descendants: int = Field(default=0) # number of comments
+    score_fetched_at: datetime = Field(default_factory=datetime.utcnow) # scores go stale, title/url do not
@@ -3,11 +3,10 @@ import time
 from plyer import notification
 from sqlmodel import Session, select
 from glint.core.database import get_engine
+from glint.core.models import Topic, UserConfig
 from datetime import datetime
 from glint.core.parallel_fetcher import ParallelFetcher
-from glint.utils.url_utils import normalize_url
-from glint.utils.relevance import calculate_relevance
-from glint.utils.fingerprint import generate_fingerprint
+from glint.core.pipeline import run_pipeline
 
 class Notifier:
     def __init__(self, interval_seconds=300):
@@ -66,7 +65,6 @@ class Notifier:
     def _fetch_and_notify(self):
         try:
             engine = get_engine()
-            new_active_trends_count = 0  # Only count trends from active topics for notification
             
             with Session(engine) as session:
                 # Get ALL topics (active and inactive) - inactive are in "standby mode"
@@ -75,65 +73,11 @@ class Notifier:
                 if not all_topics:
                     return
 
-                # Get active topic IDs for notification filtering
-                active_topic_ids = [t.id for t in all_topics if t.is_active]
-                
-                # PARALLEL FETCH - All sources at once!
-                all_trends = self.coordinator.fetch_all(all_topics)
-                
-                for trend in all_trends:
-                    # Normalize URL
-                    normalized_url = normalize_url(trend.url)
-                    
-                    # Check for URL duplicates
-                    existing_trend = session.exec(
-                        select(Trend).where(Trend.url_normalized == normalized_url)
-                    ).first()
-                    
-                    if not existing_trend:
-                        # Store normalized URL
-                        trend.url_normalized = normalized_url
-                        
-                        # Generate fingerprint
-                        trend.content_fingerprint = generate_fingerprint(
-                            trend.title,
-                            trend.description
-                        )
-                        
-                        # Check for content duplicates
-                        fingerprint_match = session.exec(
-                            select(Trend).where(
-                                Trend.content_fingerprint == trend.content_fingerprint
-                            )
-                        ).first()
-                        
-                        if not fingerprint_match:
-                            # Find which topic this trend matched
-                            matched_topic = next((t for t in all_topics if t.id == trend.topic_id), None)
-                            
-                            if matched_topic:
-                                # Calculate relevance score
-                                trend.relevance_score = calculate_relevance(trend, matched_topic)
-                                
-                                # Set status based on score threshold
-                                if trend.relevance_score >= 0.3:
-                                    trend.status = "approved"
-                                    
-                                    # Only notify if linked to an active topic AND approved
-                                    if trend.topic_id in active_topic_ids:
-                                        new_active_trends_count += 1
-                                else:
-                                    trend.status = "rejected"
-                            else:
-                                trend.relevance_score = 0.0
-                                trend.status = "rejected"
-                            
-                            # Save trend (approved or rejected)
-                            session.add(trend)
-                
-                session.commit()
+                # PARALLEL FETCH - All sources at once, each one ingested as soon as it finishes
+                result = run_pipeline(session, self.coordinator.fetch_all(all_topics), all_topics)
             
             # Only notify about trends from active topics
+            new_active_trends_count = result.approved_active
             if new_active_trends_count > 0:
                 self.send_notification(
                     "New Tech Trends",
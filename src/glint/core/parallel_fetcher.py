@@ -1,19 +1,99 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
-from glint.core.models import Topic, Trend
+import threading
+import time
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Tuple
+from glint.core.config import config_manager
+from glint.core.fetch_state import fetch_state
+from glint.core.models import Topic, TrendRecord
+from glint.utils.daemon_executor import DaemonThreadPoolExecutor
+from glint.utils.http_client import http_client
 from glint.sources import (
     GitHubFetcher,
-    HackerNewsFetcher, 
-    RedditFetcher, 
+    HackerNewsFetcher,
+    RedditFetcher,
     DevToFetcher,
     ProductHuntFetcher,
-    ArXivFetcher, 
-    SemanticScholarFetcher, 
+    ArXivFetcher,
+    SemanticScholarFetcher,
     OpenAlexFetcher
 )
 
-class ParallelFetcher:
+DEFAULT_DEADLINE = 60  # seconds allowed for a whole fetch
+
+
+class BackgroundFetches:
+    """
+    What outlives one fetch: sources still running after a deadline, their late
+    results, and the workers they run on. One per process, shared by every
+    ParallelFetcher, since the CLI, web and GUI create one per fetch.
+    Workers are daemon threads, so an abandoned source never delays the exit.
+    """
     def __init__(self):
+        self._lock = threading.Lock()
+        self._running: Dict[str, Future] = {}  # sources still running after their deadline
+        self._late_results: Dict[str, Tuple[str, List[TrendRecord]]] = {}  # (fetch token, results) for the next fetch
+        self._executor: Optional[DaemonThreadPoolExecutor] = None
+    #end __init__
+
+    def is_running(self, name: str) -> bool:
+        with self._lock:
+            return name in self._running
+    #end is_running
+
+    def take_late_results(self) -> Dict[str, Tuple[str, List[TrendRecord]]]:
+        """Results of the sources that finished after their deadline, removed from the store"""
+        with self._lock:
+            late_results, self._late_results = self._late_results, {}
+        return late_results
+    #end take_late_results
+
+    def abandon(self, name: str, token: str, future: Future):
+        """Keep the result of a source that missed its deadline, if it arrives"""
+        with self._lock:
+            self._running[name] = future
+        future.add_done_callback(lambda done: self._keep_late_result(name, token, done))
+    #end abandon
+
+    def _keep_late_result(self, name: str, token: str, future: Future):
+        with self._lock:
+            self._running.pop(name, None)
+            if future.cancelled() or future.exception() is not None:
+                fetch_state.rollback(token)
+                return
+            self._late_results[name] = (token, future.result())
+    #end _keep_late_result
+
+    def executor(self, max_workers: int) -> DaemonThreadPoolExecutor:
+        """One worker per source"""
+        with self._lock:
+            if self._executor is None or self._executor.max_workers < max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)  # its running sources finish first
+                self._executor = DaemonThreadPoolExecutor(max_workers, thread_name_prefix="glint-fetch")
+            return self._executor
+    #end executor
+#end BackgroundFetches
+
+background_fetches = BackgroundFetches()
+
+
+class ParallelFetcher:
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        backfill: bool = False,
+        deadline: Optional[float] = None
+    ):
+        """
+        Args:
+            max_in_flight: global cap on concurrent HTTP requests
+            backfill: fetch the full window of every source instead of only what is newer than its watermark
+            deadline: seconds allowed for a whole fetch, defaults to settings -> fetch_deadline in config.json
+        """
+        self.max_in_flight = max_in_flight
+        if deadline is None:
+            deadline = config_manager.get_setting("fetch_deadline", DEFAULT_DEADLINE)
+        self.deadline = float(deadline)
         self.fetchers = [
             # Developer sources
             GitHubFetcher(),
@@ -26,28 +106,103 @@ class ParallelFetcher:
             SemanticScholarFetcher(),
             OpenAlexFetcher(),
         ]
+        for fetcher in self.fetchers:
+            fetcher.backfill = backfill
         self.max_workers = len(self.fetchers)
+
+        self.timed_out: List[str] = []  # sources that missed the deadline of the last fetch
     #end __init__
 
-    def fetch_all(self, topics: List[Topic]) -> List[Trend]:
-        """Fetch from all sources in parallel"""
-        all_trends = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            #submit all fetch tasks
-            future_to_fetcher = {
-                executor.submit(fetcher.fetch, topics): fetcher
-                for fetcher in self.fetchers
-            }
-
-            #collect results as they complete
-            for future in as_completed(future_to_fetcher):
-                fetcher = future_to_fetcher[future]
-                try:
-                    trends = future.result(timeout=60)
-                    all_trends.extend(trends)
-                    print(f"[OK] {fetcher.__class__.__name__}: {len(trends)} trends")
-                except Exception as ex:
-                    print(f"[ERR] {fetcher.__class__.__name__}: {ex}")
-        return all_trends
-    #end fetch_all
\ No newline at end of file
+    def fetch_all(self, topics: List[Topic]) -> Iterator[List[TrendRecord]]:
+        """
+        Fetch from all sources in parallel, one worker thread per source.
+        Yields each source's trends as soon as that source finishes,
+        so the fastest sources can be ingested while slow ones are still running.
+
+        Sources still running when the deadline expires are abandoned and
+        listed in `timed_out`. They keep running in the background: their
+        results are yielded first by the next fetch_all() of any ParallelFetcher
+        of the process, and they are not restarted (but listed in `timed_out`
+        again) while they are still running.
+
+        The validators and watermarks of a source are stored once the consumer
+        asks for the next batch, i.e. once it committed this source's trends
+        (IngestPipeline commits each batch as it arrives).
+        """
+        http_client.set_max_in_flight(self.max_in_flight)
+        return self._collect(topics)
+    #end fetch_all
+
+    def _collect(self, topics: List[Topic]) -> Iterator[List[TrendRecord]]:
+        self.timed_out = []
+
+        # Results of sources that missed the previous deadline
+        for name, (token, trends) in background_fetches.take_late_results().items():
+            print(f"[LATE] {name}: {len(trends)} trends from the previous fetch")
+            yield from self._hand_over(token, trends)
+
+        #submit all fetch tasks
+        future_to_fetcher = {}
+        tokens = {}  # future -> token its fetch state is staged under
+        for fetcher in self.fetchers:
+            name = fetcher.__class__.__name__
+            if background_fetches.is_running(name):
+                self.timed_out.append(name)
+                print(f"[SKIP] {name}: still running from a previous fetch")
+                continue
+            token = fetch_state.begin()
+            future = self._submit(fetcher, topics, token)
+            future_to_fetcher[future] = fetcher
+            tokens[future] = token
+
+        #hand results over as they complete, until the deadline
+        deadline = time.monotonic() + self.deadline
+        pending = set(future_to_fetcher)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fetcher = future_to_fetcher[future]
+                    try:
+                        trends = future.result()
+                        print(f"[OK] {fetcher.__class__.__name__}: {len(trends)} trends")
+                    except Exception as ex:
+                        print(f"[ERR] {fetcher.__class__.__name__}: {ex}")
+                        fetch_state.rollback(tokens[future])
+                        continue
+                    yield from self._hand_over(tokens[future], trends)
+        finally:
+            # deadline expired or consumer stopped early: leave the stragglers running
+            for future in pending:
+                self._abandon(future_to_fetcher[future], tokens[future], future)
+    #end _collect
+
+    def _hand_over(self, token: str, trends: List[TrendRecord]) -> Iterator[List[TrendRecord]]:
+        """Yield a source's trends, then store its fetch state unless the consumer failed or stopped"""
+        try:
+            yield trends
+        except BaseException:
+            fetch_state.rollback(token)
+            raise
+        fetch_state.commit(token)
+    #end _hand_over
+
+    def _submit(self, fetcher, topics: List[Topic], token: str) -> Future:
+        """Start one source's fetch on its worker, staging its fetch state under `token`"""
+        def fetch():
+            with fetch_state.staging(token):
+                return fetcher.fetch(topics)
+        return background_fetches.executor(self.max_workers).submit(fetch)
+    #end _submit
+
+    def _abandon(self, fetcher, token: str, future: Future):
+        """Mark a source as timed out, its result is kept for the next fetch if it arrives"""
+        name = fetcher.__class__.__name__
+        self.timed_out.append(name)
+        background_fetches.abandon(name, token, future)
+        print(f"[TIMEOUT] {name}: no result after {self.deadline:g}s, kept for the next fetch")
+    #end _abandon
+#end ParallelFetcher
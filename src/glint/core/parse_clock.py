@@ -0,0 +1,54 @@
+"""
+Time the sources spend parsing their responses into trends.
+
+Sources parse in their own fetch threads while the ingest pipeline waits on
+them, so parsing cannot be timed as a step of the pipeline's loop. Parse
+methods decorated with @timed_parse (or blocks under parse_clock.timing())
+add their time to the process-wide parse_clock, and IngestPipeline reports
+what was added during a run as its "parse" stage.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable
+
+
+class ParseClock:
+    """Seconds spent parsing, summed over every fetch thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()  # nested timed calls only count once
+        self.seconds = 0.0
+        self.calls = 0  # outermost timed calls
+    #end __init__
+
+    @contextmanager
+    def timing(self):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.seconds += elapsed
+                    self.calls += 1
+    #end timing
+#end ParseClock
+
+parse_clock = ParseClock()
+
+
+def timed_parse(method: Callable) -> Callable:
+    """Count the time spent in a source's parse method on parse_clock"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with parse_clock.timing():
+            return method(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,423 @@
+"""
+Ingestion pipeline shared by the CLI, the daemon and the web app.
+
+Trends arrive source by source from ParallelFetcher.fetch_all and go
+through explicit batch stages. Each source's trends are committed as soon
+as they arrive, so a slow source never delays the fast ones, in chunks of
+bounded size so memory does not grow with the number of watched topics:
+
+    fetch      waiting on the sources (network, and their parsing below)
+    parse      sources turning responses into trends, timed in their own
+               threads (summed over the threads, inside the fetch wait)
+    normalize  normalized URLs, content fingerprints and MinHash signatures
+    merge      fuse the copies of a story posted on several sources into one
+               trend, keeping the points and comments of each source
+    dedup      drop trends already stored (the seen filter answers first, only
+               possible duplicates cost an SQL probe), then near-duplicates found
+               through the LSH band index; their engagement goes to the stored trend
+    score      relevance score and approved/rejected status
+    commit     bulk insert and transaction commit
+
+Every stage records its time and item counts in PipelineResult.stages.
+The parse time overlaps the fetch wait, so it is left out of the total.
+Trends travel as compact TrendRecords and only become rows of the trend
+table in the commit stage.
+"""
+
+import json
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+from glint.core.config import config_manager
+from glint.core.models import Trend, TrendBand, TrendRecord, Topic, engagement_columns
+from glint.core.parse_clock import parse_clock
+from glint.core.seen_filter import SeenFilter, seen_filter_for
+from glint.utils.canonical import canonical_urls
+from glint.utils.relevance import calculate_relevance
+from glint.utils.fingerprint import generate_fingerprints, minhash_signature, lsh_bands, signature_similarity
+
+CHUNK_SIZE = 200  # most trends committed per transaction
+IN_QUERY_SIZE = 500  # values per IN (...) lookup, SQLite caps bound parameters
+APPROVAL_THRESHOLD = 0.3
+NEAR_DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard similarity of two titles' words
+STAGES = ("fetch", "parse", "normalize", "merge", "dedup", "score", "commit")
+OVERLAPPING_STAGES = ("parse",)  # spent in the source threads, during the fetch wait
+
+
+class StageStats:
+    """Time spent and items seen by one pipeline stage, summed over all chunks"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.items_in = 0
+        self.items_out = 0
+    #end __init__
+
+    def add(self, seconds: float, items_in: int, items_out: int):
+        self.seconds += seconds
+        self.items_in += items_in
+        self.items_out += items_out
+    #end add
+#end StageStats
+
+
+class PipelineResult:
+    """Counters and stage timings collected while ingesting a fetch"""
+
+    def __init__(self):
+        self.fetched = 0  # trends received from the sources
+        self.added = 0  # new trends stored (approved or rejected)
+        self.dropped_by_url = 0  # duplicates of a stored or already ingested URL
+        self.dropped_by_fingerprint = 0  # same content under another URL
+        self.dropped_as_near_duplicate = 0  # reworded copy of a stored or already ingested trend
+        self.probes_skipped = 0  # URL / fingerprint lookups the seen filter answered alone
+        self.merged = 0  # copies of a story fused into another trend of the same chunk
+        self.updated = 0  # stored trends whose points and comments were updated by a copy
+        self.conflicts = 0  # stored meanwhile by another writer, skipped by the unique constraints
+        self.approved_active = 0  # new approved trends linked to an active topic
+        self.chunks = 0  # transactions committed
+        self.stages: Dict[str, StageStats] = {name: StageStats(name) for name in STAGES}
+    #end __init__
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for name, stage in self.stages.items() if name not in OVERLAPPING_STAGES)
+    #end total_seconds
+#end PipelineResult
+
+
+class IngestPipeline:
+    """
+    Normalize, dedup, score and persist batches of fetched trends.
+
+    Usage:
+        pipeline = IngestPipeline(session, topics)
+        result = pipeline.run(coordinator.fetch_all(topics))
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        topics: List[Topic],
+        chunk_size: int = CHUNK_SIZE,
+        similarity_threshold: Optional[float] = None,
+        seen_filter: Optional[SeenFilter] = None
+    ):
+        """
+        Args:
+            session: open database session
+            topics: all topics (active and inactive) the trends may be linked to
+            chunk_size: most trends processed per transaction
+            similarity_threshold: title similarity from which a trend is a near-duplicate,
+                defaults to settings -> near_duplicate_threshold in config.json (above 1 turns it off)
+            seen_filter: Bloom filter of the stored trends, defaults to the one of glint's database
+        """
+        self.session = session
+        self.chunk_size = chunk_size
+        if similarity_threshold is None:
+            similarity_threshold = config_manager.get_setting("near_duplicate_threshold", NEAR_DUPLICATE_THRESHOLD)
+        self.similarity_threshold = float(similarity_threshold)
+        self.seen = seen_filter or seen_filter_for(session)
+        self.topics_by_id = {topic.id: topic for topic in topics}
+        self.active_topic_ids = {topic.id for topic in topics if topic.is_active}
+        self._copies_of_stored: Dict[int, List[TrendRecord]] = {}  # stored trend id -> copies in the chunk
+    #end __init__
+
+    def run(self, batches: Iterable[List[TrendRecord]]) -> PipelineResult:
+        """
+        Ingest trends batch by batch: each batch is committed as soon as it
+        arrives, in transactions of at most `chunk_size` trends.
+
+        Args:
+            batches: iterable of trend lists, typically ParallelFetcher.fetch_all(topics)
+        Returns:
+            PipelineResult with the counters and stage timings of this run
+        """
+        result = PipelineResult()
+        parsed_seconds, parsed_calls = parse_clock.seconds, parse_clock.calls
+        if self.seen:
+            # Catch up with the trends stored since the filter was saved
+            start = time.perf_counter()
+            self.seen.sync(self.session)
+            result.stages["dedup"].add(time.perf_counter() - start, 0, 0)
+        for batch in self._timed_batches(batches, result):
+            result.fetched += len(batch)
+            for i in range(0, len(batch), self.chunk_size):
+                self._process_chunk(batch[i:i + self.chunk_size], result)
+
+        if self.seen:
+            self.seen.save()
+        # Parsing of this run's sources (and of any other fetch of the process meanwhile)
+        result.stages["parse"].add(parse_clock.seconds - parsed_seconds, parse_clock.calls - parsed_calls, 0)
+        return result
+    #end run
+
+    def _timed_batches(self, batches: Iterable[List[TrendRecord]], result: PipelineResult) -> Iterator[List[TrendRecord]]:
+        """Yield the batches, charging the time spent waiting for each one to the fetch stage"""
+        iterator = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                result.stages["fetch"].add(time.perf_counter() - start, 0, 0)
+                return
+            result.stages["fetch"].add(time.perf_counter() - start, 0, len(batch))
+            yield batch
+    #end _timed_batches
+
+    def _process_chunk(self, chunk: List[TrendRecord], result: PipelineResult):
+        """Run one chunk through every stage, in a single transaction"""
+        trends = self._stage(result, "normalize", self._normalize, chunk)
+        trends = self._stage(result, "merge", self._merge, trends, result)
+        trends = self._stage(result, "dedup", self._dedup, trends, result)
+        trends = self._stage(result, "score", self._score, trends)
+        inserted = self._stage(result, "commit", self._commit, trends, result)
+        result.chunks += 1
+
+        # Only notify if linked to an active topic AND approved
+        for trend in inserted:
+            if trend.status == "approved" and trend.topic_id in self.active_topic_ids:
+                result.approved_active += 1
+    #end _process_chunk
+
+    def _stage(self, result: PipelineResult, name: str, function, trends: List[TrendRecord], *args) -> List[TrendRecord]:
+        start = time.perf_counter()
+        output = function(trends, *args)
+        result.stages[name].add(time.perf_counter() - start, len(trends), len(output))
+        return output
+    #end _stage
+
+    def _normalize(self, trends: List[TrendRecord]) -> List[TrendRecord]:
+        """Compute the canonical URL, content fingerprint and MinHash signature of every trend"""
+        urls = canonical_urls([trend.url for trend in trends])
+        fingerprints = generate_fingerprints([(trend.title, trend.description) for trend in trends])
+        for trend, url, fingerprint in zip(trends, urls, fingerprints):
+            trend.url_normalized = url
+            trend.content_fingerprint = fingerprint
+            trend.minhash = minhash_signature(trend.title)
+        return trends
+    #end _normalize
+
+    def _merge(self, trends: List[TrendRecord], result: PipelineResult) -> List[TrendRecord]:
+        """
+        Fuse the copies of a story inside the chunk (same normalized URL or content
+        fingerprint) into the first one, which keeps the engagement of every source.
+        The story is then deduplicated, scored and stored once.
+        """
+        by_url: Dict[str, TrendRecord] = {}
+        by_fingerprint: Dict[str, TrendRecord] = {}
+        merged = []
+        for trend in trends:
+            first = by_url.get(trend.url_normalized) or by_fingerprint.get(trend.content_fingerprint)
+            if first is not None:
+                first.absorb(trend)
+                result.merged += 1
+                continue
+            by_url[trend.url_normalized] = trend
+            by_fingerprint[trend.content_fingerprint] = trend
+            merged.append(trend)
+        return merged
+    #end _merge
+
+    def _dedup(self, trends: List[TrendRecord], result: PipelineResult) -> List[TrendRecord]:
+        """
+        Drop the trends already stored, first by normalized URL then by content fingerprint.
+        Each check is a handful of IN (...) queries for the whole chunk.
+        The engagement of a dropped copy is added to the stored trend at commit.
+        """
+        # Check for URL duplicates
+        stored_urls = self._existing_ids(
+            Trend.url_normalized, {trend.url_normalized for trend in trends},
+            self.seen.might_contain_url if self.seen else None, result
+        )
+        by_url = []
+        for trend in trends:
+            if trend.url_normalized in stored_urls:
+                result.dropped_by_url += 1
+                self._copies_of_stored.setdefault(stored_urls[trend.url_normalized], []).append(trend)
+                continue
+            by_url.append(trend)
+
+        # Check for content duplicates
+        stored_fingerprints = self._existing_ids(
+            Trend.content_fingerprint, {trend.content_fingerprint for trend in by_url},
+            self.seen.might_contain_fingerprint if self.seen else None, result
+        )
+        unique = []
+        for trend in by_url:
+            if trend.content_fingerprint in stored_fingerprints:
+                result.dropped_by_fingerprint += 1
+                self._copies_of_stored.setdefault(stored_fingerprints[trend.content_fingerprint], []).append(trend)
+                continue
+            unique.append(trend)
+        return self._near_dedup(unique, result)
+    #end _dedup
+
+    def _near_dedup(self, trends: List[TrendRecord], result: PipelineResult) -> List[TrendRecord]:
+        """
+        Drop reworded copies of stored trends or of earlier trends in the chunk.
+        Candidates share an LSH band key with the trend (one IN (...) lookup on the
+        band index for the whole chunk), and are confirmed by signature similarity.
+        """
+        if self.similarity_threshold > 1:
+            return trends
+        keys_by_trend = {id(trend): lsh_bands(trend.minhash) for trend in trends if trend.minhash}
+        # band key -> [(stored trend id or trend of this chunk, signature)]
+        candidates_by_key = self._stored_signatures({key for keys in keys_by_trend.values() for key in keys})
+
+        unique = []
+        for trend in trends:
+            keys = keys_by_trend.get(id(trend))
+            if keys is None:
+                unique.append(trend)  # too short to compare
+                continue
+            candidates = {candidate for key in keys for candidate in candidates_by_key.get(key, ())}
+            original = next((
+                owner for owner, signature in candidates
+                if signature_similarity(trend.minhash, signature) >= self.similarity_threshold
+            ), None)
+            if original is not None:
+                result.dropped_as_near_duplicate += 1
+                if isinstance(original, TrendRecord):
+                    original.absorb(trend)
+                else:
+                    self._copies_of_stored.setdefault(original, []).append(trend)
+                continue
+            for key in keys:  # later copies in this chunk are near-duplicates
+                candidates_by_key.setdefault(key, []).append((trend, trend.minhash))
+            unique.append(trend)
+        return unique
+    #end _near_dedup
+
+    def _stored_signatures(self, keys: Set[int]) -> Dict[int, List[Tuple[int, bytes]]]:
+        """(id, signature) of the stored trends having one of the band `keys`, by key"""
+        keys = list(keys)
+        signatures: Dict[int, List[Tuple[int, bytes]]] = {}
+        for i in range(0, len(keys), IN_QUERY_SIZE):
+            rows = self.session.exec(
+                select(TrendBand.key, Trend.id, Trend.minhash)
+                .join(Trend, Trend.id == TrendBand.trend_id)
+                .where(TrendBand.key.in_(keys[i:i + IN_QUERY_SIZE]))
+            ).all()
+            for key, trend_id, signature in rows:
+                signatures.setdefault(key, []).append((trend_id, signature))
+        return signatures
+    #end _stored_signatures
+
+    def _existing_ids(
+        self,
+        column,
+        values: Set[str],
+        might_contain: Optional[Callable[[str], bool]] = None,
+        result: Optional[PipelineResult] = None
+    ) -> Dict[str, int]:
+        """
+        Return {value: trend id} for the `values` already stored in `column`, with chunked IN (...) queries.
+        Values `might_contain` rules out are not looked up.
+        """
+        if might_contain is not None:
+            candidates = [value for value in values if might_contain(value)]
+            result.probes_skipped += len(values) - len(candidates)
+            values = candidates
+        values = list(values)
+        found = {}
+        for i in range(0, len(values), IN_QUERY_SIZE):
+            found.update(self.session.exec(
+                select(column, Trend.id).where(column.in_(values[i:i + IN_QUERY_SIZE]))
+            ).all())
+        return found
+    #end _existing_ids
+
+    def _score(self, trends: List[TrendRecord]) -> List[TrendRecord]:
+        """Set relevance score and status, rejected trends are kept too"""
+        for trend in trends:
+            # Find which topic this trend matched
+            matched_topic = self.topics_by_id.get(trend.topic_id)
+
+            if matched_topic:
+                # Calculate relevance score
+                trend.relevance_score = calculate_relevance(trend, matched_topic)
+
+                # Set status based on score threshold
+                if trend.relevance_score >= APPROVAL_THRESHOLD:
+                    trend.status = "approved"
+                else:
+                    trend.status = "rejected"
+            else:
+                trend.relevance_score = 0.0
+                trend.status = "rejected"
+        return trends
+    #end _score
+
+    def _commit(self, trends: List[TrendRecord], result: PipelineResult) -> List[TrendRecord]:
+        """
+        Bulk INSERT ... ON CONFLICT DO NOTHING, then commit.
+        Rows colliding with the unique url_normalized / content_fingerprint of a trend
+        stored meanwhile by another writer (daemon, web, GUI) are skipped.
+        Returns the trends actually inserted.
+        """
+        ids_by_url = {}
+        if trends:
+            rows = [trend.to_row() for trend in trends]
+            statement = insert(Trend).on_conflict_do_nothing().returning(Trend.url_normalized, Trend.id)
+            ids_by_url = dict(self.session.execute(statement, rows).all())
+
+        inserted = [trend for trend in trends if trend.url_normalized in ids_by_url]
+        # Index the new signatures for the near-duplicate lookups
+        bands = [
+            {"key": key, "trend_id": ids_by_url[trend.url_normalized]}
+            for trend in inserted if trend.minhash
+            for key in lsh_bands(trend.minhash)
+        ]
+        if bands:
+            self.session.execute(insert(TrendBand), bands)
+        self._update_engagement(result)
+        self.session.commit()
+        if self.seen:
+            self.seen.add(inserted)
+
+        result.added += len(inserted)
+        result.conflicts += len(trends) - len(inserted)
+        return inserted
+    #end _commit
+
+    def _update_engagement(self, result: PipelineResult):
+        """
+        Record the sources, points and comments of the copies dropped by dedup on the
+        stored trends they duplicate. The latest numbers of a source replace the stored
+        ones, so a story seen again on the same source is not counted twice.
+        """
+        copies, self._copies_of_stored = self._copies_of_stored, {}
+        ids = list(copies)
+        updates = []
+        for i in range(0, len(ids), IN_QUERY_SIZE):
+            rows = self.session.exec(
+                select(Trend.id, Trend.source, Trend.sources).where(Trend.id.in_(ids[i:i + IN_QUERY_SIZE]))
+            ).all()
+            for trend_id, source, sources in rows:
+                engagement = json.loads(sources) if sources else {source: [None, None]}
+                for copy in copies[trend_id]:
+                    engagement.update(copy.engagement)
+                updates.append({"id": trend_id, **engagement_columns(engagement)})
+        if updates:
+            self.session.execute(update(Trend), updates)
+        result.updated += len(updates)
+    #end _update_engagement
+#end IngestPipeline
+
+
+def run_pipeline(
+    session: Session,
+    batches: Iterable[List[TrendRecord]],
+    topics: List[Topic],
+    chunk_size: int = CHUNK_SIZE,
+    similarity_threshold: Optional[float] = None,
+    seen_filter: Optional[SeenFilter] = None
+) -> PipelineResult:
+    """Shortcut for IngestPipeline(session, topics, chunk_size, similarity_threshold, seen_filter).run(batches)"""
+    return IngestPipeline(session, topics, chunk_size, similarity_threshold, seen_filter).run(batches)
+#end run_pipeline
@@ -0,0 +1,139 @@
+"""
+Bloom filter of the normalized URLs and content fingerprints of the trend
+table, kept in ~/.glint/seen.bloom.
+
+The ingest pipeline asks it before probing the database: a trend the filter
+has never seen is new for sure and skips the SQL lookup, only the "maybe
+seen" ones are checked against the trend table. The file records the last
+trend id it covers and every ingest first adds the rows stored since, by
+any glint process, so the filter keeps up with the database. A stored trend
+it would still miss (e.g. a reused id) is rejected by the unique constraints
+of the trend table at commit.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from sqlmodel import Session, select, func
+from glint.core.database import get_db_path
+from glint.core.models import Trend
+from glint.core.logger import get_logger
+from glint.utils.bloom import BloomFilter
+
+logger = get_logger("SeenFilter")
+
+DEFAULT_CAPACITY = 200_000  # items, two per trend
+ERROR_RATE = 0.01
+
+
+class SeenFilter:
+    """Persistent Bloom filter of stored trends, safe to share between threads"""
+
+    def __init__(self, path: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY, error_rate: float = ERROR_RATE):
+        self.path = path or Path.home() / ".glint" / "seen.bloom"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def sync(self, session: Session):
+        """Add the trends stored since the filter was saved, rebuild it if it is missing or full"""
+        with self._lock:
+            if self._bloom is None:
+                self._bloom = BloomFilter.load(self.path)
+            if self._bloom is None or self._bloom.count > self._bloom.capacity:
+                self._rebuild(session)
+            else:
+                self._add_rows(session, self._bloom.extra)
+
+    def rebuild(self, session: Session):
+        """Rebuild the filter from the trend table and save it"""
+        with self._lock:
+            self._rebuild(session)
+            self._save()
+
+    def _rebuild(self, session: Session):
+        total = session.exec(select(func.count(Trend.id))).one()
+        # Two items per trend, and room for the table to double
+        self._bloom = BloomFilter(max(self.capacity, 4 * total), self.error_rate)
+        self._add_rows(session, 0)
+        self._dirty = True
+        logger.info(f"Rebuilt seen filter from {total} trends")
+
+    def _add_rows(self, session: Session, after_id: int):
+        rows = session.exec(
+            select(Trend.id, Trend.url_normalized, Trend.content_fingerprint)
+            .where(Trend.id > after_id)
+            .order_by(Trend.id)
+        ).all()
+        for trend_id, url, fingerprint in rows:
+            self._add(url, fingerprint)
+            self._bloom.extra = trend_id  # last trend covered
+        if rows:
+            self._dirty = True
+
+    def _add(self, url: Optional[str], fingerprint: Optional[str]):
+        if url:
+            self._bloom.add("u:" + url)
+        if fingerprint:
+            self._bloom.add("f:" + fingerprint)
+
+    def might_contain_url(self, url: str) -> bool:
+        """False if no stored trend has this normalized URL"""
+        return self._bloom is None or ("u:" + url) in self._bloom
+
+    def might_contain_fingerprint(self, fingerprint: str) -> bool:
+        """False if no stored trend has this content fingerprint"""
+        return self._bloom is None or ("f:" + fingerprint) in self._bloom
+
+    def add(self, trends: Iterable):
+        """Record trends just stored (the last covered id moves on the next sync)"""
+        with self._lock:
+            if self._bloom is None:
+                return
+            for trend in trends:
+                self._add(trend.url_normalized, trend.content_fingerprint)
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if self._bloom is None or not self._dirty:
+            return
+        try:
+            self._bloom.save(self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not save seen filter: {e}")
+
+    def stats(self) -> Optional[Dict[str, float]]:
+        """Size and estimated false-positive rate of the saved filter, None if there is none"""
+        with self._lock:
+            bloom = self._bloom or BloomFilter.load(self.path)
+        if bloom is None:
+            return None
+        return {
+            "items": bloom.count,
+            "capacity": bloom.capacity,
+            "bytes": len(bloom.bits),
+            "hashes": bloom.num_hashes,
+            "fill_ratio": bloom.fill_ratio(),
+            "false_positive_rate": bloom.false_positive_rate(),
+            "last_trend_id": bloom.extra,
+        }
+#end SeenFilter
+
+
+def seen_filter_for(session: Session) -> Optional[SeenFilter]:
+    """The seen filter of the session's database: only glint's own database has one"""
+    bind = session.get_bind()
+    if getattr(bind.url, "database", None) != str(get_db_path()):
+        return None
+    return seen_filter
+
+
+# Global instance
+seen_filter = SeenFilter()
@@ -119,7 +119,7 @@ class Terminal(ctk.CTkFrame):
                     status.status()
                     
                 elif command == "fetch":
-                    fetch.fetch()
+                    fetch.fetch(full="--full" in args, timings="--timings" in args, deadline=None)
                     self.app.dashboard.refresh_notifications()
                 elif command == "theme":
                     if args:
@@ -2,9 +2,10 @@
 
 import re
 import xml.etree.ElementTree as ET
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
 
@@ -36,89 +37,69 @@ class ArXivFetcher(BaseFetcher):
         }
     
     @cached_fetch(ttl=600)  # 10 minutes cache
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
+        # One worker per topic, see BaseFetcher.fetch_all
+        if not topics:
+            return self._fetch_single_topic(None)
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         trends = []
-        seen_ids = set()
         
         try:
-            # Calculate cutoff date
-            cutoff_date = datetime.now() - timedelta(days=self.days_back)
+            # Only papers newer than the topic's watermark (last 30 days at most)
+            cutoff_date = self._since(topic, datetime.utcnow() - timedelta(days=self.days_back))
             
-            if not topics:
-                # No topics: fetch recent papers from popular CS categories
-                papers = self._fetch_category("cs.AI", cutoff_date)
-                trends.extend(self._process_papers(papers, None, seen_ids))
-            else:
-                # Fetch for each topic
-                for topic in topics:
-                    # Try to map topic to ArXiv category
-                    category = self._get_arxiv_category(topic.name)
-                    
-                    if category:
-                        # Category search (e.g., cs.AI)
-                        papers = self._fetch_category(category, cutoff_date)
-                    else:
-                        # Keyword search in title/abstract
-                        papers = self._fetch_keyword(topic.name, cutoff_date)
-                    
-                    trends.extend(self._process_papers(papers, topic, seen_ids))
+            papers = self._fetch_query(self._build_query(topic, cutoff_date), cutoff_date)
+            trends.extend(self._process_papers(papers, topic, set()))
                     
         except Exception as e:
             self.logger.error(f"Error fetching from ArXiv: {e}")
         
+        self._advance_watermark(topic, trends)
         return trends
-    
+
     def _get_arxiv_category(self, topic_name: str) -> str:
         """Map topic name to ArXiv category if possible"""
         topic_lower = topic_name.lower().replace(" ", "-")
         return self.category_map.get(topic_lower)
     
-    def _fetch_category(self, category: str, cutoff_date: datetime) -> List[dict]:
-        """Fetch papers from a specific ArXiv category"""
+    def _build_query(self, topic: Optional[Topic], since: datetime) -> str:
+        """
+        Category search (e.g., cat:cs.AI) if the topic maps to one, keyword search in title/abstract otherwise,
+        restricted to papers submitted after `since`.
+        """
+        if topic is None:
+            # No topics: fetch recent papers from popular CS categories
+            query = "cat:cs.AI"
+        else:
+            category = self._get_arxiv_category(topic.name)
+            query = f"cat:{category}" if category else f"all:{topic.name}"
+        return f"{query} AND submittedDate:[{since.strftime('%Y%m%d%H%M')} TO 299912312359]"
+    
+    def _build_params(self, query: str) -> dict:
+        return {
+            "search_query": query,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+            "max_results": self.max_results
+        }
+    
+    def _fetch_query(self, query: str, cutoff_date: datetime) -> List[dict]:
+        """Fetch papers matching an ArXiv search query"""
         try:
-            # Build query: category AND recent
-            query = f"cat:{category}"
-            
-            params = {
-                "search_query": query,
-                "sortBy": "submittedDate",
-                "sortOrder": "descending",
-                "max_results": self.max_results
-            }
-            
-            response = self.http.get(self.base_url, params=params)
-            
-            if response.status_code == 200:
-                return self._parse_atom_feed(response.content, cutoff_date)
-            else:
-                self.logger.warning(f"ArXiv API error: {response.status_code}")
-                
+            response = self.http.get(self.base_url, params=self._build_params(query))
+            return self._parse_response(response, cutoff_date)
         except Exception as e:
-            self.logger.error(f"Error fetching ArXiv category {category}: {e}")
+            self.logger.error(f"Error fetching ArXiv query {query}: {e}")
         
         return []
     
-    def _fetch_keyword(self, keyword: str, cutoff_date: datetime) -> List[dict]:
-        """Fetch papers matching keyword in title/abstract"""
-        try:
-            # Search in title and abstract
-            query = f"all:{keyword}"
-            
-            params = {
-                "search_query": query,
-                "sortBy": "submittedDate",
-                "sortOrder": "descending",
-                "max_results": self.max_results
-            }
-            
-            response = self.http.get(self.base_url, params=params)
-            
-            if response.status_code == 200:
-                return self._parse_atom_feed(response.content, cutoff_date)
-                
-        except Exception as e:
-            self.logger.error(f"Error fetching ArXiv keyword {keyword}: {e}")
-        
+    @timed_parse
+    def _parse_response(self, response, cutoff_date: datetime) -> List[dict]:
+        if response.status_code == 200:
+            return self._parse_atom_feed(response.content, cutoff_date)
+        self.logger.warning(f"ArXiv API error: {response.status_code}")
         return []
     
     def _parse_atom_feed(self, content: bytes, cutoff_date: datetime) -> List[dict]:
@@ -191,12 +172,13 @@ class ArXivFetcher(BaseFetcher):
         
         return papers
     
+    @timed_parse
     def _process_papers(
         self, 
         papers: List[dict], 
         topic: Topic, 
         seen_ids: set
-    ) -> List[Trend]:
+    ) -> List[TrendRecord]:
         """Convert ArXiv papers to Trends"""
         trends = []
         
@@ -214,7 +196,7 @@ class ArXivFetcher(BaseFetcher):
             # Determine category
             category = self._determine_category(paper)
             
-            trends.append(Trend(
+            trends.append(TrendRecord(
                 title=paper['title'].strip(),
                 description=description,
                 url=paper['pdf_url'],
@@ -1,52 +1,181 @@
 """Base fetcher class for all content sources."""
 
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import List
-from glint.core.models import Trend, Topic
-from glint.core.logger import get_logger 
+from datetime import datetime, timedelta
+from typing import List, Optional
+from glint.core.models import TrendRecord, Topic
+from glint.core.config import config_manager
+from glint.core.fetch_state import fetch_state
+from glint.core.logger import get_logger
 from glint.utils.http_client import http_client
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from glint.utils.daemon_executor import DaemonThreadPoolExecutor
+from concurrent.futures import wait, FIRST_COMPLETED
+
+DEFAULT_MAX_WORKERS = 5  # concurrent topics per fetcher
+DEFAULT_TOPIC_TIMEOUT = 30  # seconds allowed for a single topic
 
 class BaseFetcher(ABC):
     def __init__(self):
-        self.http = http_client 
-        self.max_workers = 5 # concurrent requests per fetcher
+        self.http = http_client
         self.logger = get_logger(self.__class__.__name__)
+        # Short source name used in config.json, e.g. "github", "devto"
+        self.name = self.__class__.__name__.replace("Fetcher", "").lower()
+
+        # Per-source tuning: settings -> sources -> <name> in config.json
+        settings = config_manager.get_source_settings(self.name)
+        self.max_workers = int(settings.get("max_workers", DEFAULT_MAX_WORKERS))
+        self.topic_timeout = float(settings.get("topic_timeout", DEFAULT_TOPIC_TIMEOUT))
+
+        # Full backfill (glint fetch --full): ignore watermarks, validators and cached results
+        self.backfill = False
+        # Watermarks are moved back by this much, so items that only pass the
+        # quality filters (stars, reactions...) a while after publication are not missed
+        self.watermark_overlap = timedelta(0)
 
     @abstractmethod
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
         """Fetch trends for given topics."""
         pass
     #end fetch
 
-    def fetch_all(self, topics: List[Topic]) -> List[Trend]:
-        """Fetch trends in parallel for multiple topics"""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            #submit all topic fetch tasks
-            futures = {
-                executor.submit(self._fetch_single_topic, topic): topic
-                for topic in topics
-            }
+    def fetch_all(self, topics: List[Topic]) -> List[TrendRecord]:
+        """
+        Fetch trends in parallel for multiple topics.
+        At most `max_workers` topics run at once, and a topic still running
+        after `topic_timeout` seconds is abandoned.
+        """
+        executor = DaemonThreadPoolExecutor(self.max_workers, thread_name_prefix="glint-topic")
+        started = {}  # topic index -> time its worker picked it up
+
+        def run(index: int, topic: Topic) -> List[TrendRecord]:
+            started[index] = time.monotonic()
+            return self._fetch_single_topic(topic)
 
-            all_trends = []
+        #submit all topic fetch tasks
+        futures = {
+            executor.submit(run, index, topic): index
+            for index, topic in enumerate(topics)
+        }
+        results = {}
+        pending = set(futures)
+        try:
             #collect results as they complete
-            for future in as_completed(futures):
-                try:
-                    trends = future.result(timeout=30) # TODO: make timeout configurable
-                    all_trends.extend(trends)
-                except Exception as ex:
-                    topic = futures[future]
-                    self.logger.error(f"Failed to fetch {topic.name}: {ex}")
-            return all_trends
-        #end fetch_all
-    #end BaseFetcher
+            while pending:
+                done, pending = wait(
+                    pending, timeout=self._next_deadline(started, futures, pending),
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as ex:
+                        self.logger.error(f"Failed to fetch {topics[index].name}: {ex}")
+
+                # Abandon topics that have been running for too long
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] > self.topic_timeout:
+                        self.logger.error(
+                            f"Timed out fetching {topics[index].name} after {self.topic_timeout:g}s"
+                        )
+                        pending.discard(future)
+        finally:
+            # abandoned topics keep their worker, topics not started yet are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._merge_topic_results(results[index] for index in sorted(results))
+    #end fetch_all
 
-    def _fetch_single_topic(self,topic: Topic) -> List[Trend]:
+    def _next_deadline(self, started: dict, futures: dict, pending: set) -> float:
+        """Seconds until the earliest running topic hits its timeout"""
+        now = time.monotonic()
+        remaining = [
+            started[futures[future]] + self.topic_timeout - now
+            for future in pending if futures[future] in started
+        ]
+        # Nothing running yet: check again shortly
+        return max(0.05, min(remaining)) if remaining else 0.5
+    #end _next_deadline
+
+    def _state_key(self, topics: List[Topic]) -> tuple:
+        """
+        (source, topic_name) key for FetchMetadata rows of a request shared by several topics.
+        The topic set is part of the key, so adding a topic invalidates the stored validators.
+        """
+        if not topics:
+            return self.name, "*"
+        names = ",".join(sorted(topic.name for topic in topics))
+        return self.name, "topics:" + hashlib.md5(names.encode()).hexdigest()[:12]
+    #end _state_key
+
+    def _topic_key(self, topic: Optional[Topic]) -> str:
+        """topic_name used in FetchMetadata for a per-topic request"""
+        return topic.name if topic else "*"
+    #end _topic_key
+
+    def _conditional(self, key: tuple) -> Optional[tuple]:
+        """conditional= argument for http.get(), disabled during a backfill"""
+        return None if self.backfill else key
+    #end _conditional
+
+    def _since(self, topic: Optional[Topic], window_start: datetime) -> datetime:
+        """
+        Start of the fetch window of a topic: its stored watermark minus
+        `watermark_overlap`, never earlier than `window_start`.
+        Returns `window_start` on the first fetch and during a backfill.
+        """
+        if self.backfill:
+            return window_start
+        cursor = fetch_state.get_cursor(self.name, self._topic_key(topic))
+        if not cursor:
+            return window_start
+        try:
+            watermark = datetime.fromisoformat(cursor)
+        except ValueError:
+            return window_start
+        return max(window_start, watermark - self.watermark_overlap)
+    #end _since
+
+    def _advance_watermark(self, topic: Optional[Topic], trends: List[TrendRecord]):
+        """Move the watermark of a topic to the newest published date fetched"""
+        published = [trend.published_at for trend in trends if trend.published_at]
+        if not published:
+            return
+        newest = max(published)
+        topic_key = self._topic_key(topic)
+        cursor = fetch_state.get_cursor(self.name, topic_key)
+        try:
+            if cursor and datetime.fromisoformat(cursor) >= newest:
+                return
+        except ValueError:
+            pass
+        fetch_state.set_cursor(self.name, topic_key, newest.isoformat())
+    #end _advance_watermark
+
+    def _merge_topic_results(self, results) -> List[TrendRecord]:
+        """Concatenate per-topic results in topic order, keeping the first topic of a duplicated URL"""
+        all_trends = []
+        seen_urls = set()
+        for trends in results:
+            for trend in trends:
+                if trend.url in seen_urls:
+                    continue
+                seen_urls.add(trend.url)
+                all_trends.append(trend)
+        return all_trends
+    #end _merge_topic_results
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         """
         Override in subclasses to fetch for a single topic.
-        This enbales parallel fetching across topics
+        This enbales parallel fetching across topics.
+        `topic` is None when no topics are configured.
         """
         raise NotImplementedError(
             f"{self.__class__.__name__} must implement _fetch_single_topic()"
         )
-            
+    #end BaseFetcher
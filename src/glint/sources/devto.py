@@ -1,9 +1,10 @@
 """Dev.to fetcher."""
 
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
 from glint.core.config import config_manager
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
 
@@ -16,78 +17,90 @@ class DevToFetcher(BaseFetcher):
         self.base_url = "https://dev.to/api"
 
     @cached_fetch(ttl=180) # 3 minutes
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
+        # One worker per topic, see BaseFetcher.fetch_all
+        if not topics:
+            return self._fetch_single_topic(None)
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         trends = []
-        seen_articles = set()
         
         try:
-            # Calculate cutoff time for last 30 days
-            cutoff_time = datetime.now() - timedelta(days=self.days_back)
+            # No watermark: `top` ranks by reactions, older articles keep climbing
+            cutoff_time = datetime.utcnow() - timedelta(days=self.days_back)
             
-            if not topics:
+            if topic is None:
                 # No topics: fetch latest articles
-                articles = self._fetch_articles(tag=None, per_page=30)
-                trends.extend(self._process_articles(articles, None, cutoff_time, seen_articles))
+                articles = self._fetch_articles(tag=None, per_page=30, days=self.days_back)
             else:
-                # Fetch articles for each topic
-                for topic in topics:
-                    # Dev.to uses tags, so we'll search by tag
-                    articles = self._fetch_articles(tag=topic.name, per_page=20)
-                    trends.extend(self._process_articles(articles, topic, cutoff_time, seen_articles))
+                # Dev.to uses tags, so we'll search by tag
+                articles = self._fetch_articles(tag=topic.name, per_page=20, days=self.days_back)
+            trends.extend(self._process_articles(articles, topic, cutoff_time, set()))
                     
         except Exception as e:
             self.logger.error(f"Error fetching from Dev.to: {e}")
         
         return trends
-    
-    def _fetch_articles(self, tag: str = None, per_page: int = 30) -> list:
+
+    def _fetch_articles(self, tag: str = None, per_page: int = 30, days: int = 30) -> list:
         """
         Fetch articles from Dev.to API.
         """
-        articles = []
-        
         try:
-            # Dev.to API endpoint
-            url = f"{self.base_url}/articles"
-            
-            params = {
-                "per_page": per_page,
-                "top": 30  # Get top articles from last 30 days
-            }
-            
-            if tag:
-                params["tag"] = tag
-            
-            # Use API key if available for higher rate limits
-            headers = {'User-Agent': 'Glint/1.0 (Tech Watch Assistant)'}
-            devto_key = config_manager.get_secret("devto")
-            if devto_key:
-                headers["api-key"] = devto_key
-                self.logger.debug("Using Dev.to API key")
-            
+            url, params, headers = self._build_request(tag, per_page, days)
             response = self.http.get(
                 url,
                 params=params,
                 headers=headers
             )
-            
-            if response.status_code == 200:
-                articles = response.json()
-            elif response.status_code == 429:
-                self.logger.warning("Dev.to rate limit hit")
+            return self._parse_articles(response)
                 
         except Exception as e:
             self.logger.error(f"Error fetching Dev.to articles: {e}")
         
-        return articles
+        return []
+    
+    def _build_request(self, tag: str, per_page: int, days: int = 30) -> tuple:
+        """
+        Build (url, params, headers) for an articles request.
+        """
+        # Dev.to API endpoint
+        url = f"{self.base_url}/articles"
+        
+        params = {
+            "per_page": per_page,
+            "top": days  # Get top articles from the last `days` days
+        }
+        
+        if tag:
+            params["tag"] = tag
+        
+        # Use API key if available for higher rate limits
+        headers = {'User-Agent': 'Glint/1.0 (Tech Watch Assistant)'}
+        devto_key = config_manager.get_secret("devto")
+        if devto_key:
+            headers["api-key"] = devto_key
+            self.logger.debug("Using Dev.to API key")
+        
+        return url, params, headers
+    
+    @timed_parse
+    def _parse_articles(self, response) -> list:
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 429:
+            self.logger.warning("Dev.to rate limit hit")
+        return []
     
+    @timed_parse
     def _process_articles(
         self, 
         articles: list, 
         topic: Topic, 
         cutoff_time: datetime,
         seen_articles: set
-    ) -> List[Trend]:
+    ) -> List[TrendRecord]:
         """
         Process articles and convert to Trends.
         """
@@ -122,14 +135,16 @@ class DevToFetcher(BaseFetcher):
             seen_articles.add(article_id)
             
             # Build trend
-            trends.append(Trend(
+            trends.append(TrendRecord(
                 title=article.get("title", "Untitled"),
                 description=self._build_description(article),
                 url=article.get("url", ""),
                 source="Dev.to",
                 category=self._determine_category(article),
                 published_at=published_at,
-                topic_id=topic.id if topic else None
+                topic_id=topic.id if topic else None,
+                points=article.get("positive_reactions_count"),
+                comments=article.get("comments_count")
             ))
         
         return trends
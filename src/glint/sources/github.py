@@ -1,9 +1,10 @@
 """GitHub repository fetcher."""
 
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
 from glint.core.config import config_manager
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
 
@@ -15,97 +16,131 @@ class GitHubFetcher(BaseFetcher):
         self.min_stars = 50  # Minimum stars to be considered trending
       
     @cached_fetch(ttl=180) # 3 minutes
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
+        # One worker per topic, see BaseFetcher.fetch_all
+        if not topics:
+            return self._fetch_single_topic(None)
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         trends = []
         seen_repos = set()  # Avoid duplicates
         
         try:
-            # Calculate date filter for last 30 days
-            date_filter = (datetime.now() - timedelta(days=self.days_back)).strftime("%Y-%m-%d")
-            
-            if not topics:
-                # If no topics, fetch general trending repos
-                search_queries = [
-                    (None, f"created:>{date_filter} stars:>{self.min_stars} sort:stars", "new_repo"),
-                ]
-            else:
-                # For each topic, use multiple search strategies
-                search_queries = []
-                for topic in topics:
-                    # Strategy 1: New repos with this topic (created in last 30 days)
-                    search_queries.append((
-                        topic, 
-                        f"topic:{topic.name} created:>{date_filter} stars:>10 sort:stars",
-                        "new_repo"
-                    ))
-                    
-                    # Strategy 2: Trending repos (recently updated, high activity)
-                    search_queries.append((
-                        topic,
-                        f"topic:{topic.name} pushed:>{date_filter} stars:>{self.min_stars} sort:stars",
-                        "trending"
-                    ))
-                    
-                    # Strategy 3: Keyword search in name/description (for broader matching)
-                    search_queries.append((
-                        topic,
-                        f"{topic.name} in:name,description created:>{date_filter} stars:>10 sort:stars",
-                        "keyword"
-                    ))
-
-            for topic, query, strategy in search_queries:
-                url = f"https://api.github.com/search/repositories?q={query}&per_page=5"
-                
-                # Use API token if available for higher rate limits
-                headers = {}
-                github_token = config_manager.get_secret("github_token")
-                if github_token:
-                    headers["Authorization"] = f"token {github_token}"
-                    self.logger.debug("Using GitHub API token")
-                
-                response = self.http.get(url, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    for item in data.get("items", []):
-                        repo_id = item["id"]
-                        
-                        # Skip duplicates
-                        if repo_id in seen_repos:
-                            continue
-                        seen_repos.add(repo_id)
-                        
-                        # Smart filtering: quality checks
-                        if not self._is_quality_repo(item):
-                            continue
-                        
-                        # Determine category based on strategy and repo characteristics
-                        category = self._determine_category(item, strategy)
-                        
-                        # Enhanced description with metrics
-                        description = self._build_description(item)
-                        
-                        trends.append(Trend(
-                            title=item["full_name"],
-                            description=description,
-                            url=item["html_url"],
-                            source="GitHub",
-                            category=category,
-                            published_at=datetime.strptime(item["created_at"], "%Y-%m-%dT%H:%M:%SZ"),
-                            topic_id=topic.id if topic else None
-                        ))
-                        
-                elif response.status_code == 403:
-                    # Rate limit hit
-                    self.logger.warning(f"GitHub API rate limit exceeded.")
+            headers = self._build_headers()
+            for query, strategy in self._build_search_queries(topic):
+                response = self.http.get(
+                    self._search_url(query), headers=headers,
+                    conditional=self._conditional((self.name, self._topic_key(topic)))
+                )
+                if not self._process_response(response, topic, strategy, seen_repos, trends):
                     break
-                elif response.status_code != 404:
-                    self.logger.error(f"GitHub API error: {response.status_code}")
                     
         except Exception as ex:
             self.logger.error(f"Error fetching from GitHub: {ex}")
         
         return trends
+
+    def _build_search_queries(self, topic: Optional[Topic]) -> list:
+        """
+        Build (query, strategy) search pairs for a topic.
+        No watermark: the searches rank by stars, so an old repo gaining stars
+        must still be found. Conditional requests make unchanged results cheap.
+        """
+        # Whole days: the query, hence its validators, stays the same all day
+        date_filter = (datetime.utcnow() - timedelta(days=self.days_back)).strftime("%Y-%m-%d")
+        
+        if topic is None:
+            # If no topics, fetch general trending repos
+            return [
+                (f"created:>{date_filter} stars:>{self.min_stars} sort:stars", "new_repo"),
+            ]
+        
+        # Use multiple search strategies per topic
+        return [
+            # Strategy 1: New repos with this topic (created in last 30 days)
+            (
+                f"topic:{topic.name} created:>{date_filter} stars:>10 sort:stars",
+                "new_repo"
+            ),
+            # Strategy 2: Trending repos (recently updated, high activity)
+            (
+                f"topic:{topic.name} pushed:>{date_filter} stars:>{self.min_stars} sort:stars",
+                "trending"
+            ),
+            # Strategy 3: Keyword search in name/description (for broader matching)
+            (
+                f"{topic.name} in:name,description created:>{date_filter} stars:>10 sort:stars",
+                "keyword"
+            ),
+        ]
+    
+    def _search_url(self, query: str) -> str:
+        return f"https://api.github.com/search/repositories?q={query}&per_page=5"
+    
+    def _build_headers(self) -> dict:
+        # Use API token if available for higher rate limits
+        headers = {}
+        github_token = config_manager.get_secret("github_token")
+        if github_token:
+            headers["Authorization"] = f"token {github_token}"
+            self.logger.debug("Using GitHub API token")
+        return headers
+    
+    @timed_parse
+    def _process_response(
+        self,
+        response,
+        topic: Topic,
+        strategy: str,
+        seen_repos: set,
+        trends: List[TrendRecord]
+    ) -> bool:
+        """
+        Turn one search response into Trends.
+        Returns False when the rate limit is hit and searching should stop.
+        """
+        if response.status_code == 304:
+            # Not modified since the last fetch: nothing new to parse
+            return True
+        elif response.status_code == 200:
+            data = response.json()
+            for item in data.get("items", []):
+                repo_id = item["id"]
+                
+                # Skip duplicates
+                if repo_id in seen_repos:
+                    continue
+                seen_repos.add(repo_id)
+                
+                # Smart filtering: quality checks
+                if not self._is_quality_repo(item):
+                    continue
+                
+                # Determine category based on strategy and repo characteristics
+                category = self._determine_category(item, strategy)
+                
+                # Enhanced description with metrics
+                description = self._build_description(item)
+                
+                trends.append(TrendRecord(
+                    title=item["full_name"],
+                    description=description,
+                    url=item["html_url"],
+                    source="GitHub",
+                    category=category,
+                    published_at=datetime.strptime(item["created_at"], "%Y-%m-%dT%H:%M:%SZ"),
+                    topic_id=topic.id if topic else None,
+                    points=item.get("stargazers_count")
+                ))
+                
+        elif response.status_code == 403:
+            # Rate limit hit
+            self.logger.warning(f"GitHub API rate limit exceeded.")
+            return False
+        elif response.status_code != 404:
+            self.logger.error(f"GitHub API error: {response.status_code}")
+        return True
     
     def _is_quality_repo(self, repo: dict) -> bool:
         """
@@ -1,77 +1,237 @@
 """Hacker News fetcher."""
 
-import re
-from typing import List
-from datetime import datetime
-from glint.core.models import Trend, Topic
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, select
+from glint.core.database import get_engine
+from glint.core.models import TrendRecord, Topic, HackerNewsItem
+from glint.core.config import config_manager
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
+from glint.utils.daemon_executor import DaemonThreadPoolExecutor
+from glint.utils.topic_matcher import TopicMatcher
+
+STRATEGIES = ("auto", "top", "search")
+DEFAULT_SEARCH_MAX_TOPICS = 10  # "auto" searches up to this many topics
+DEFAULT_MAX_ITEMS = 100  # top stories scanned per fetch
+DEFAULT_FAN_OUT = 10  # concurrent item requests
 
 
 class HackerNewsFetcher(BaseFetcher):
+    """
+    Two strategies:
+    - "top": scan the top stories and keep the ones matching a topic
+      (1 request + new items, whatever the number of topics)
+    - "search": one search_by_date request per topic on the HN search API,
+      which also finds niche topics that rarely reach the front page
+    "auto" (default) searches when there are at most `search_max_topics` topics
+    (0: always the top stories).
+    Set sources.hackernews.strategy in config.json to force one.
+    """
+    def __init__(self):
+        super().__init__()
+        settings = config_manager.get_source_settings(self.name)
+        self.base_url = settings.get("base_url", "https://hacker-news.firebaseio.com/v0")
+        self.search_url = settings.get("search_url", "https://hn.algolia.com/api/v1")
+        self.strategy = settings.get("strategy", "auto")
+        self.search_max_topics = int(settings.get("search_max_topics", DEFAULT_SEARCH_MAX_TOPICS))
+        self.search_days = 7  # search window on the first fetch of a topic
+        self.min_points = 10  # search results are not filtered by the front page
+        self.watermark_overlap = timedelta(days=1)  # stories need time to collect points
+        # Cached items cost nothing, so the top list can be scanned much deeper than 30
+        self.max_items = int(settings.get("max_items", DEFAULT_MAX_ITEMS))
+        self.fan_out = int(settings.get("fan_out", DEFAULT_FAN_OUT))
+        self.score_ttl = timedelta(minutes=10)  # scores of matching stories are refreshed after this
+        self._engine = None
+
     @cached_fetch(ttl=180) # 3 minutes
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
         trends = []
-        
+
         # If no active topics, return empty list (Option 2: strict filtering)
         if not topics:
             return trends
-        
+        if self._use_search(topics):
+            # One worker per topic, see BaseFetcher.fetch_all
+            return self.fetch_all(topics)
+
         try:
             # Get top stories IDs - fetch more to increase match chances
-            top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-            response = self.http.get(top_stories_url)
+            response = self.http.get(f"{self.base_url}/topstories.json")
             if response.status_code == 200:
-                ids = response.json()[:30]  # Fetch top 30 instead of 10
-                
-                for id in ids:
-                    item_url = f"https://hacker-news.firebaseio.com/v0/item/{id}.json"
-                    item_resp = self.http.get(item_url)
-                    if item_resp.status_code == 200:
-                        item = item_resp.json()
-                        if "url" in item:  # Only stories with URLs
-                            title = item.get("title", "No Title")
-                            text = item.get("text", "")  # Get story text if available
-                            
-                            # Improved keyword matching for topics
-                            matched_topic = None
-                            for topic in topics:
-                                if self._matches_topic(topic.name, title, text):
-                                    matched_topic = topic
-                                    break
-                            
-                            # Only add trend if it matches a watched topic (Option 2)
-                            if matched_topic:
-                                trends.append(Trend(
-                                    title=title,
-                                    description=f"Score: {item.get('score', 0)} by {item.get('by', 'unknown')}",
-                                    url=item.get("url", ""),
-                                    source="Hacker News",
-                                    category="news",
-                                    published_at=datetime.fromtimestamp(item.get("time", 0)),
-                                    topic_id=matched_topic.id
-                                ))
+                ids = response.json()[:self.max_items]
+                items = self._load_items(ids)
+                matcher = TopicMatcher(topics)
+
+                to_fetch = self._ids_to_fetch(ids, items, matcher)
+                with DaemonThreadPoolExecutor(self.fan_out, thread_name_prefix="glint-hn") as executor:
+                    item_responses = list(executor.map(self._get_item, to_fetch))
+                self._store_items(items, item_responses)
+                trends = self._build_trends(ids, items, matcher)
         except Exception as e:
             self.logger.error(f"Error fetching from Hacker News: {e}")
         return trends
-    
-    def _matches_topic(self, topic_name: str, title: str, text: str) -> bool:
+
+    def _use_search(self, topics: List[Topic]) -> bool:
         """
-        Improved matching logic:
-        - Checks both title and text
-        - Uses partial word matching (e.g., 'react' matches 'reactjs', 'react-native')
-        - Case-insensitive
+        Pick the cheaper strategy: a search costs one request per topic, the
+        top stories cost one request plus the new items, up to max_items.
         """
-        topic_lower = topic_name.lower()
-        title_lower = title.lower()
-        text_lower = text.lower() if text else ""
-        
-        # Check if topic appears as a whole word or part of a compound word
-        # This handles cases like: "python" matches "python3", "pythonic"
-        # "react" matches "reactjs", "react-native"
-        pattern = rf'\b{re.escape(topic_lower)}\w*'
-        
-        if re.search(pattern, title_lower) or re.search(pattern, text_lower):
-            return True
-        
-        return False
+        if self.strategy in ("top", "search"):
+            return self.strategy == "search"
+        return len(topics) <= self.search_max_topics
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
+        trends = []
+        try:
+            url, params = self._build_search(topic)
+            trends = self._parse_search(self.http.get(url, params=params), topic)
+        except Exception as e:
+            self.logger.error(f"Error searching Hacker News: {e}")
+        self._advance_watermark(topic, trends)
+        return trends
+
+    def _build_search(self, topic: Topic) -> tuple:
+        """(url, params) of a search_by_date request for stories newer than the topic's watermark"""
+        since = self._since(topic, datetime.utcnow() - timedelta(days=self.search_days))
+        created_after = int(since.replace(tzinfo=timezone.utc).timestamp())
+        params = {
+            "query": topic.name,
+            "tags": "story",
+            "numericFilters": f"created_at_i>{created_after},points>={self.min_points}",
+            "hitsPerPage": 50
+        }
+        return f"{self.search_url}/search_by_date", params
+
+    @timed_parse
+    def _parse_search(self, response, topic: Topic) -> List[TrendRecord]:
+        """Turn search hits into Trends, keeping stories whose title or text matches the topic"""
+        if response.status_code != 200:
+            self.logger.warning(f"Hacker News search error: {response.status_code}")
+            return []
+        trends = []
+        matcher = TopicMatcher([topic])
+        for hit in response.json().get("hits", []):
+            url = hit.get("url")
+            title = hit.get("title") or ""
+            if not url or not matcher.match(title, hit.get("story_text")):
+                continue
+            trends.append(TrendRecord(
+                title=title,
+                description=f"Score: {hit.get('points') or 0} by {hit.get('author', 'unknown')}",
+                url=url,
+                source="Hacker News",
+                category="news",
+                published_at=datetime.utcfromtimestamp(hit.get("created_at_i", 0)),
+                topic_id=topic.id,
+                points=hit.get("points"),
+                comments=hit.get("num_comments")
+            ))
+        return trends
+
+    def _item_url(self, item_id: int) -> str:
+        return f"{self.base_url}/item/{item_id}.json"
+
+    def _get_item(self, item_id: int):
+        """Item response, None if the request failed: the other items are kept"""
+        try:
+            return self.http.get(self._item_url(item_id))
+        except Exception as e:
+            self.logger.debug(f"Could not fetch Hacker News item {item_id}: {e}")
+            return None
+
+    def _get_engine(self):
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+
+    def _load_items(self, ids: List[int]) -> Dict[int, HackerNewsItem]:
+        """Cached items among `ids`, by HN id"""
+        try:
+            with Session(self._get_engine()) as session:
+                rows = session.exec(
+                    select(HackerNewsItem).where(HackerNewsItem.id.in_(ids))
+                ).all()
+            return {row.id: row for row in rows}
+        except Exception as e:
+            self.logger.debug(f"Could not load cached Hacker News items: {e}")
+            return {}
+
+    def _ids_to_fetch(self, ids: List[int], items: Dict[int, HackerNewsItem], matcher: TopicMatcher) -> List[int]:
+        """
+        New items, plus cached stories matching a topic whose score is stale.
+        Title and URL of a story never change, so other cached items are not refetched.
+        """
+        stale_before = datetime.utcnow() - self.score_ttl
+        to_fetch = []
+        for id in ids:
+            item = items.get(id)
+            if item is None:
+                to_fetch.append(id)
+            elif item.url and item.score_fetched_at < stale_before and self._match_item(item, matcher):
+                to_fetch.append(id)
+        return to_fetch
+
+    @timed_parse
+    def _store_items(self, items: Dict[int, HackerNewsItem], item_responses: list):
+        """Parse item responses into `items` and save them to the cache"""
+        fetched = []
+        for item_resp in item_responses:
+            if item_resp is None or item_resp.status_code != 200:
+                continue
+            data = item_resp.json()
+            if not data or "id" not in data:
+                continue
+            item = HackerNewsItem(
+                id=data["id"],
+                title=data.get("title", "No Title"),
+                url=data.get("url"),  # Only stories with URLs become trends
+                text=data.get("text", ""),  # Get story text if available
+                by=data.get("by", "unknown"),
+                time=data.get("time", 0),
+                score=data.get("score", 0),
+                descendants=data.get("descendants", 0),
+                score_fetched_at=datetime.utcnow()
+            )
+            items[item.id] = item
+            fetched.append(item)
+
+        if not fetched:
+            return
+        try:
+            with Session(self._get_engine()) as session:
+                for item in fetched:
+                    session.merge(item)
+                session.commit()
+        except Exception as e:
+            self.logger.debug(f"Could not cache Hacker News items: {e}")
+
+    @timed_parse
+    def _build_trends(self, ids: List[int], items: Dict[int, HackerNewsItem], matcher: TopicMatcher) -> List[TrendRecord]:
+        """Turn the top stories matching a watched topic into Trends, in ranking order"""
+        trends = []
+        for id in ids:
+            item = items.get(id)
+            if item is None or not item.url:
+                continue
+
+            # Only add trend if it matches a watched topic (Option 2)
+            matched_topic = self._match_item(item, matcher)
+            if matched_topic:
+                trends.append(TrendRecord(
+                    title=item.title,
+                    description=f"Score: {item.score} by {item.by}",
+                    url=item.url,
+                    source="Hacker News",
+                    category="news",
+                    published_at=datetime.utcfromtimestamp(item.time),  # naive UTC, like the search path
+                    topic_id=matched_topic.id,
+                    points=item.score,
+                    comments=item.descendants
+                ))
+        return trends
+
+    def _match_item(self, item: HackerNewsItem, matcher: TopicMatcher) -> Optional[Topic]:
+        """First watched topic matching the item's title or text"""
+        return matcher.match(item.title, item.text)
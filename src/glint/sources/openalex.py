@@ -1,8 +1,9 @@
 """OpenAlex fetcher for broad academic research coverage."""
 
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
 
@@ -16,63 +17,68 @@ class OpenAlexFetcher(BaseFetcher):
         self.min_citations = 3  # Minimum citations for quality
     
     @cached_fetch(ttl=600)  # 10 minutes cache
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
+        # One worker per topic, see BaseFetcher.fetch_all
+        if not topics:
+            return self._fetch_single_topic(None)
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         trends = []
-        seen_ids = set()
         
         try:
             # Calculate cutoff date
             cutoff_date = datetime.now() - timedelta(days=self.days_back)
             date_filter = cutoff_date.strftime("%Y-%m-%d")
+            # No topics: fetch recent impactful works
+            query = topic.name if topic else "computer science"
             
-            if not topics:
-                # No topics: fetch recent impactful works
-                works = self._search_works("computer science", date_filter)
-                trends.extend(self._process_works(works, None, seen_ids))
-            else:
-                # Fetch for each topic
-                for topic in topics:
-                    works = self._search_works(topic.name, date_filter)
-                    trends.extend(self._process_works(works, topic, seen_ids))
+            works = self._search_works(query, date_filter)
+            trends.extend(self._process_works(works, topic, set()))
                     
         except Exception as e:
             self.logger.error(f"Error fetching from OpenAlex: {e}")
         
         return trends
-    
+
     def _search_works(self, query: str, from_date: str) -> List[dict]:
         """Search for works using OpenAlex API"""
         try:
-            # Build filter
-            # Format: from_publication_date:2024-01-01,default.search:query
-            params = {
-                "filter": f"from_publication_date:{from_date},default.search:{query}",
-                "per-page": self.max_results,
-                "sort": "cited_by_count:desc",  # Sort by citations
-                "mailto": "glint@example.com"  # Polite pool (faster rate limits)
-            }
-            
-            response = self.http.get(self.base_url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('results', [])
-            elif response.status_code == 429:
-                self.logger.warning("OpenAlex rate limit hit")
-            else:
-                self.logger.warning(f"OpenAlex API error: {response.status_code}")
-                
+            response = self.http.get(self.base_url, params=self._build_params(query, from_date))
+            return self._parse_response(response)
         except Exception as e:
             self.logger.error(f"Error searching OpenAlex: {e}")
         
         return []
     
+    def _build_params(self, query: str, from_date: str) -> dict:
+        # Build filter
+        # Format: from_publication_date:2024-01-01,default.search:query
+        return {
+            "filter": f"from_publication_date:{from_date},default.search:{query}",
+            "per-page": self.max_results,
+            "sort": "cited_by_count:desc",  # Sort by citations
+            "mailto": "glint@example.com"  # Polite pool (faster rate limits)
+        }
+    
+    @timed_parse
+    def _parse_response(self, response) -> List[dict]:
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('results', [])
+        elif response.status_code == 429:
+            self.logger.warning("OpenAlex rate limit hit")
+        else:
+            self.logger.warning(f"OpenAlex API error: {response.status_code}")
+        return []
+    
+    @timed_parse
     def _process_works(
         self, 
         works: List[dict], 
         topic: Topic, 
         seen_ids: set
-    ) -> List[Trend]:
+    ) -> List[TrendRecord]:
         """Convert OpenAlex works to Trends"""
         trends = []
         
@@ -118,7 +124,7 @@ class OpenAlexFetcher(BaseFetcher):
             if not title or title == 'Untitled':
                 title = work.get('display_name', 'Untitled')
             
-            trends.append(Trend(
+            trends.append(TrendRecord(
                 title=title.strip(),
                 description=description,
                 url=url,
@@ -1,13 +1,14 @@
 """Product Hunt fetcher."""
 
-import re
 import xml.etree.ElementTree as ET
 from typing import List
 from datetime import datetime, timedelta
 from email.utils import parsedate_to_datetime
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
+from glint.utils.topic_matcher import TopicMatcher
 
 
 class ProductHuntFetcher(BaseFetcher):
@@ -17,9 +18,9 @@ class ProductHuntFetcher(BaseFetcher):
         self.min_votes = 20  # Minimum upvotes to be considered
     
     @cached_fetch(ttl=180) # 3 minutes
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
         trends = []
-        seen_products = set()
+        matcher = TopicMatcher(topics)
         
         try:
             # Use Product Hunt's public RSS feed (no authentication required)
@@ -28,59 +29,15 @@ class ProductHuntFetcher(BaseFetcher):
             response = self.http.get(
                 rss_url,
                 headers={'User-Agent': 'Glint/1.0 (Tech Watch Assistant)'},
-                timeout=10
+                timeout=10,
+                conditional=self._conditional(self._state_key(topics))
             )
             
-            if response.status_code == 200:
-                # Parse RSS feed
-                root = ET.fromstring(response.content)
-                cutoff_time = datetime.now() - timedelta(days=self.days_back)
-                
-                # Find all items in the feed
-                for item in root.findall('.//item'):
-                    try:
-                        title = item.find('title').text if item.find('title') is not None else "Unknown Product"
-                        link = item.find('link').text if item.find('link') is not None else ""
-                        description = item.find('description').text if item.find('description') is not None else ""
-                        pub_date_str = item.find('pubDate').text if item.find('pubDate') is not None else ""
-                        
-                        # Parse date (RSS date format: "Mon, 01 Jan 2024 12:00:00 +0000")
-                        if pub_date_str:
-                            pub_date = parsedate_to_datetime(pub_date_str)
-                        else:
-                            pub_date = datetime.now()
-                        
-                        # Check if within time range
-                        if pub_date < cutoff_time:
-                            continue
-                        
-                        # Skip duplicates
-                        if link in seen_products:
-                            continue
-                        seen_products.add(link)
-                        
-                        # Topic matching (check title and description)
-                        matched_topic = self._match_topic(title, description, topics)
-                        
-                        # If we have topics, only add if matched
-                        if topics and not matched_topic:
-                            continue
-                        
-                        # Build trend
-                        trends.append(Trend(
-                            title=title,
-                            description=description[:200] if description else "No description",
-                            url=link,
-                            source="Product Hunt",
-                            category="product",
-                            published_at=pub_date,
-                            topic_id=matched_topic.id if matched_topic else None
-                        ))
-                        
-                    except Exception as e:
-                        self.logger.debug(f"Error parsing Product Hunt item: {e}")
-                        continue
-                        
+            if response.status_code == 304:
+                # Feed unchanged since the last fetch: nothing new to parse
+                self.logger.debug("Product Hunt feed not modified")
+            elif response.status_code == 200:
+                trends = self._parse_feed(response.content, topics, matcher)
             elif response.status_code == 429:
                 self.logger.warning("Product Hunt rate limit hit")
             else:
@@ -90,20 +47,58 @@ class ProductHuntFetcher(BaseFetcher):
             self.logger.error(f"Error fetching from Product Hunt: {e}")
         
         return trends
-    
-    def _match_topic(self, title: str, description: str, topics: List[Topic]):
-        """Match product to a topic based on title and description."""
-        if not topics:
-            return None
-        
-        title_lower = title.lower()
-        desc_lower = description.lower() if description else ""
-        
-        for topic in topics:
-            topic_lower = topic.name.lower()
-            pattern = rf'\b{re.escape(topic_lower)}\w*'
-            
-            if re.search(pattern, title_lower) or re.search(pattern, desc_lower):
-                return topic
+
+    @timed_parse
+    def _parse_feed(self, content: bytes, topics: List[Topic], matcher: TopicMatcher) -> List[TrendRecord]:
+        """Turn the RSS feed into Trends, keeping the recent products matching a topic"""
+        trends = []
+        seen_products = set()
+        root = ET.fromstring(content)
+        cutoff_time = datetime.now() - timedelta(days=self.days_back)
         
-        return None
+        # Find all items in the feed
+        for item in root.findall('.//item'):
+            try:
+                title = item.find('title').text if item.find('title') is not None else "Unknown Product"
+                link = item.find('link').text if item.find('link') is not None else ""
+                description = item.find('description').text if item.find('description') is not None else ""
+                pub_date_str = item.find('pubDate').text if item.find('pubDate') is not None else ""
+                
+                # Parse date (RSS date format: "Mon, 01 Jan 2024 12:00:00 +0000")
+                if pub_date_str:
+                    pub_date = parsedate_to_datetime(pub_date_str)
+                else:
+                    pub_date = datetime.now()
+                
+                # Check if within time range
+                if pub_date < cutoff_time:
+                    continue
+                
+                # Skip duplicates
+                if link in seen_products:
+                    continue
+                seen_products.add(link)
+                
+                # Topic matching (check title and description)
+                matched_topic = matcher.match(title, description)
+                
+                # If we have topics, only add if matched
+                if topics and not matched_topic:
+                    continue
+                
+                # Build trend
+                trends.append(TrendRecord(
+                    title=title,
+                    description=description[:200] if description else "No description",
+                    url=link,
+                    source="Product Hunt",
+                    category="product",
+                    published_at=pub_date,
+                    topic_id=matched_topic.id if matched_topic else None
+                ))
+                
+            except Exception as e:
+                self.logger.debug(f"Error parsing Product Hunt item: {e}")
+                continue
+
+        return trends
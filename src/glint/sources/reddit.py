@@ -1,11 +1,12 @@
 """Reddit fetcher."""
 
-import re
 from typing import List
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
+from glint.utils.topic_matcher import TopicMatcher
 
 
 class RedditFetcher(BaseFetcher):
@@ -35,44 +36,24 @@ class RedditFetcher(BaseFetcher):
         
         # Default subreddits for general tech news
         self.default_subreddits = ["programming", "webdev", "technology", "coding"]
+        self.headers = {'User-Agent': 'Glint/1.0 (Tech Watch Assistant)'}
     
     @cached_fetch(ttl=180) # 3 minutes
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
         trends = []
         seen_posts = set()  # Avoid duplicates
+        matcher = TopicMatcher(topics)
         
         try:
             # Calculate timestamp for last 30 days
             cutoff_time = datetime.now() - timedelta(days=self.days_back)
             
-            # Determine which subreddits to fetch from
-            subreddits_to_fetch = set()
-            
-            if not topics:
-                # No topics: use default tech subreddits
-                subreddits_to_fetch.update(self.default_subreddits)
-            else:
-                # Map topics to relevant subreddits
-                for topic in topics:
-                    topic_lower = topic.name.lower()
-                    
-                    # Direct match in subreddit map
-                    if topic_lower in self.subreddit_map:
-                        subreddits_to_fetch.update(self.subreddit_map[topic_lower])
-                    else:
-                        # Partial match (e.g., "react" matches "javascript")
-                        for key, subs in self.subreddit_map.items():
-                            if topic_lower in key or key in topic_lower:
-                                subreddits_to_fetch.update(subs)
-                        
-                        # Also add default subreddits for broader coverage
-                        subreddits_to_fetch.update(self.default_subreddits[:2])
-            
             # Fetch from each subreddit
-            for subreddit in subreddits_to_fetch:
+            for subreddit in self._select_subreddits(topics):
                 subreddit_trends = self._fetch_from_subreddit(
                     subreddit, 
                     topics, 
+                    matcher,
                     cutoff_time, 
                     seen_posts
                 )
@@ -82,14 +63,51 @@ class RedditFetcher(BaseFetcher):
             self.logger.error(f"Error fetching from Reddit: {e}")
         
         return trends
+
+    def _select_subreddits(self, topics: List[Topic]) -> set:
+        """
+        Determine which subreddits to fetch from.
+        """
+        subreddits_to_fetch = set()
+        
+        if not topics:
+            # No topics: use default tech subreddits
+            subreddits_to_fetch.update(self.default_subreddits)
+        else:
+            # Map topics to relevant subreddits
+            for topic in topics:
+                topic_lower = topic.name.lower()
+                
+                # Direct match in subreddit map
+                if topic_lower in self.subreddit_map:
+                    subreddits_to_fetch.update(self.subreddit_map[topic_lower])
+                else:
+                    # Partial match (e.g., "react" matches "javascript")
+                    for key, subs in self.subreddit_map.items():
+                        if topic_lower in key or key in topic_lower:
+                            subreddits_to_fetch.update(subs)
+                    
+                    # Also add default subreddits for broader coverage
+                    subreddits_to_fetch.update(self.default_subreddits[:2])
+        
+        return subreddits_to_fetch
+    
+    def _listing_endpoints(self, subreddit: str) -> List[str]:
+        # Reddit JSON API endpoints
+        # We'll fetch from 'hot' and 'top' for better coverage
+        return [
+            f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25",
+            f"https://www.reddit.com/r/{subreddit}/top.json?t=month&limit=25",
+        ]
     
     def _fetch_from_subreddit(
         self, 
         subreddit: str, 
         topics: List[Topic], 
+        matcher: TopicMatcher,
         cutoff_time: datetime,
         seen_posts: set
-    ) -> List[Trend]:
+    ) -> List[TrendRecord]:
         """
         Fetch posts from a specific subreddit.
         Uses Reddit's JSON API (no authentication needed for public posts).
@@ -97,71 +115,91 @@ class RedditFetcher(BaseFetcher):
         trends = []
         
         try:
-            # Reddit JSON API endpoints
-            # We'll fetch from 'hot' and 'top' for better coverage
-            endpoints = [
-                f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25",
-                f"https://www.reddit.com/r/{subreddit}/top.json?t=month&limit=25",
-            ]
-            
-            for endpoint in endpoints:
+            for endpoint in self._listing_endpoints(subreddit):
                 response = self.http.get(
-                    endpoint,
-                    headers={'User-Agent': 'Glint/1.0 (Tech Watch Assistant)'}
+                    endpoint, headers=self.headers, conditional=self._conditional(self._state_key(topics))
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    posts = data.get("data", {}).get("children", [])
-                    
-                    for post_wrapper in posts:
-                        post = post_wrapper.get("data", {})
-                        post_id = post.get("id")
-                        
-                        # Skip duplicates
-                        if post_id in seen_posts:
-                            continue
-                        
-                        # Check time filter
-                        post_time = datetime.fromtimestamp(post.get("created_utc", 0))
-                        if post_time < cutoff_time:
-                            continue
-                        
-                        # Quality filter
-                        if not self._is_quality_post(post):
-                            continue
-                        
-                        # Topic matching
-                        title = post.get("title", "")
-                        selftext = post.get("selftext", "")
-                        matched_topic = self._match_topic(title, selftext, topics)
-                        
-                        # If we have topics, only add if matched
-                        if topics and not matched_topic:
-                            continue
-                        
-                        seen_posts.add(post_id)
-                        
-                        # Build trend
-                        trends.append(Trend(
-                            title=title,
-                            description=self._build_description(post, subreddit),
-                            url=self._get_post_url(post),
-                            source="Reddit",
-                            category=self._determine_category(post, subreddit),
-                            published_at=post_time,
-                            topic_id=matched_topic.id if matched_topic else None
-                        ))
-                        
-                elif response.status_code == 429:
-                    self.logger.warning(f"Reddit rate limit hit for r/{subreddit}")
+                listing_trends = self._process_listing(
+                    response, subreddit, matcher, cutoff_time, seen_posts
+                )
+                if listing_trends is None:
                     break
+                trends.extend(listing_trends)
                     
         except Exception as e:
             self.logger.error(f"Error fetching from r/{subreddit}: {e}")
         
         return trends
     
+    @timed_parse
+    def _process_listing(
+        self,
+        response,
+        subreddit: str,
+        matcher: TopicMatcher,
+        cutoff_time: datetime,
+        seen_posts: set
+    ):
+        """
+        Turn one listing response into Trends.
+        Returns None when the rate limit is hit.
+        """
+        trends = []
+        
+        if response.status_code == 304:
+            # Listing unchanged since the last fetch: nothing new to parse
+            return trends
+        elif response.status_code == 200:
+            data = response.json()
+            posts = data.get("data", {}).get("children", [])
+            
+            for post_wrapper in posts:
+                post = post_wrapper.get("data", {})
+                post_id = post.get("id")
+                
+                # Skip duplicates
+                if post_id in seen_posts:
+                    continue
+                
+                # Check time filter
+                post_time = datetime.fromtimestamp(post.get("created_utc", 0))
+                if post_time < cutoff_time:
+                    continue
+                
+                # Quality filter
+                if not self._is_quality_post(post):
+                    continue
+                
+                # Topic matching
+                title = post.get("title", "")
+                selftext = post.get("selftext", "")
+                matched_topic = matcher.match(title, selftext)
+                
+                # If we have topics, only add if matched
+                if matcher and not matched_topic:
+                    continue
+                
+                seen_posts.add(post_id)
+                
+                # Build trend
+                trends.append(TrendRecord(
+                    title=title,
+                    description=self._build_description(post, subreddit),
+                    url=self._get_post_url(post),
+                    source="Reddit",
+                    category=self._determine_category(post, subreddit),
+                    published_at=post_time,
+                    topic_id=matched_topic.id if matched_topic else None,
+                    points=post.get("score"),
+                    comments=post.get("num_comments")
+                ))
+                
+        elif response.status_code == 429:
+            self.logger.warning(f"Reddit rate limit hit for r/{subreddit}")
+            return None
+        
+        return trends
+    
     def _is_quality_post(self, post: dict) -> bool:
         """
         Filter out low-quality posts based on engagement.
@@ -186,25 +224,6 @@ class RedditFetcher(BaseFetcher):
         
         return True
     
-    def _match_topic(self, title: str, text: str, topics: List[Topic]):
-        """
-        Match post to a topic using similar logic to HackerNewsFetcher.
-        """
-        if not topics:
-            return None
-        
-        title_lower = title.lower()
-        text_lower = text.lower() if text else ""
-        
-        for topic in topics:
-            topic_lower = topic.name.lower()
-            pattern = rf'\b{re.escape(topic_lower)}\w*'
-            
-            if re.search(pattern, title_lower) or re.search(pattern, text_lower):
-                return topic
-        
-        return None
-    
     def _get_post_url(self, post: dict) -> str:
         """
         Get the best URL for the post.
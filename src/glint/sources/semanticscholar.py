@@ -1,12 +1,13 @@
 """Semantic Scholar fetcher for CS research papers with citations."""
 
-import re
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
-from glint.core.models import Trend, Topic
+from glint.core.models import TrendRecord, Topic
 
+from glint.core.parse_clock import timed_parse
 from glint.sources.base import BaseFetcher
 from glint.utils.cache import cached_fetch
+from glint.utils.canonical import arxiv_url, doi_url
 
 
 class SemanticScholarFetcher(BaseFetcher):
@@ -18,64 +19,71 @@ class SemanticScholarFetcher(BaseFetcher):
         self.min_citations = 5  # Minimum citations for quality
     
     @cached_fetch(ttl=600)  # 10 minutes cache
-    def fetch(self, topics: List[Topic]) -> List[Trend]:
+    def fetch(self, topics: List[Topic]) -> List[TrendRecord]:
+        # One worker per topic, see BaseFetcher.fetch_all
+        if not topics:
+            return self._fetch_single_topic(None)
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic: Optional[Topic]) -> List[TrendRecord]:
         trends = []
-        seen_ids = set()
         
         try:
             # Calculate cutoff date
             cutoff_date = datetime.now() - timedelta(days=self.days_back)
             year_filter = cutoff_date.year
+            # No topics: fetch recent influential CS papers
+            query = topic.name if topic else "computer science"
             
-            if not topics:
-                # No topics: fetch recent influential CS papers
-                papers = self._search_papers("computer science", year_filter)
-                trends.extend(self._process_papers(papers, None, seen_ids))
-            else:
-                # Fetch for each topic
-                for topic in topics:
-                    papers = self._search_papers(topic.name, year_filter)
-                    trends.extend(self._process_papers(papers, topic, seen_ids))
+            papers = self._search_papers(query, year_filter)
+            trends.extend(self._process_papers(papers, topic, set()))
                     
         except Exception as e:
             self.logger.error(f"Error fetching from Semantic Scholar: {e}")
         
         return trends
-    
+
     def _search_papers(self, query: str, year: int) -> List[dict]:
         """Search for papers using S2 API"""
         try:
-            # API endpoint
-            url = f"{self.base_url}/paper/search"
-            
-            params = {
-                "query": query,
-                "year": f"{year}-",  # Papers from year onwards  
-                "limit": self.max_results,
-                "fields": "paperId,title,abstract,year,citationCount,influentialCitationCount,authors,publicationDate,url,fieldsOfStudy"
-            }
-            
+            url, params = self._build_request(query, year)
             response = self.http.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('data', [])
-            elif response.status_code == 429:
-                self.logger.warning("Semantic Scholar rate limit hit")
-            else:
-                self.logger.warning(f"Semantic Scholar API error: {response.status_code}")
-                
+            return self._parse_response(response)
         except Exception as e:
             self.logger.error(f"Error searching Semantic Scholar: {e}")
         
         return []
     
+    def _build_request(self, query: str, year: int) -> tuple:
+        # API endpoint
+        url = f"{self.base_url}/paper/search"
+        
+        params = {
+            "query": query,
+            "year": f"{year}-",  # Papers from year onwards  
+            "limit": self.max_results,
+            "fields": "paperId,externalIds,title,abstract,year,citationCount,influentialCitationCount,authors,publicationDate,url,fieldsOfStudy"
+        }
+        return url, params
+    
+    @timed_parse
+    def _parse_response(self, response) -> List[dict]:
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('data', [])
+        elif response.status_code == 429:
+            self.logger.warning("Semantic Scholar rate limit hit")
+        else:
+            self.logger.warning(f"Semantic Scholar API error: {response.status_code}")
+        return []
+    
+    @timed_parse
     def _process_papers(
         self, 
         papers: List[dict], 
         topic: Topic, 
         seen_ids: set
-    ) -> List[Trend]:
+    ) -> List[TrendRecord]:
         """Convert S2 papers to Trends"""
         trends = []
         
@@ -111,10 +119,10 @@ class SemanticScholarFetcher(BaseFetcher):
             # Determine category
             category = self._determine_category(paper)
             
-            # Get URL (prefer S2 URL, fallback to DOI/arxiv)
-            url = paper.get('url', f"https://www.semanticscholar.org/paper/{paper_id}")
+            # Get URL (prefer arXiv / DOI, the links other sources give for the same paper)
+            url = self._paper_url(paper)
             
-            trends.append(Trend(
+            trends.append(TrendRecord(
                 title=paper.get('title', 'Untitled').strip(),
                 description=description,
                 url=url,
@@ -128,6 +136,17 @@ class SemanticScholarFetcher(BaseFetcher):
         
         return trends
     
+    def _paper_url(self, paper: dict) -> str:
+        """arXiv abstract page, else DOI link, else S2 page of a paper"""
+        external_ids = paper.get('externalIds') or {}
+        if external_ids.get('ArXiv'):
+            url = arxiv_url(external_ids['ArXiv'])
+            if url:
+                return url
+        if external_ids.get('DOI'):
+            return doi_url(external_ids['DOI'])
+        return paper.get('url') or f"https://www.semanticscholar.org/paper/{paper.get('paperId', '')}"
+
     def _build_description(self, paper: dict) -> str:
         """Build description with citations and authors"""
         # Get abstract
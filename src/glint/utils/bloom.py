@@ -0,0 +1,96 @@
+"""
+Bloom filter: a compact set that answers "definitely not seen" or "maybe seen".
+
+m bits and k hash functions sized for a capacity and a target false-positive
+rate. Positions come from double hashing of one blake2b digest, so the bits
+of a filter saved to disk mean the same thing in every process.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+MAGIC = b"GLBF1"
+HEADER = struct.Struct(">5sQIQQQ")  # magic, bits, hashes, capacity, count, extra (owner defined)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0  # distinct items added
+        self.extra = 0  # free header field for the owner, e.g. the last row indexed
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """Add an item, return False if it was (maybe) there already"""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def fill_ratio(self) -> float:
+        """Share of bits set"""
+        return sum(bin(byte).count("1") for byte in self.bits) / self.num_bits
+
+    def false_positive_rate(self) -> float:
+        """Current probability that an item never added is reported as maybe seen"""
+        return self.fill_ratio() ** self.num_hashes
+
+    def save(self, path: Path):
+        """
+        Write atomically, readers never see a half-written filter. Each save
+        writes its own temporary file, so concurrent writers (CLI, daemon, web)
+        never interleave; the last rename wins.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False)
+        try:
+            with file:
+                file.write(HEADER.pack(MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count, self.extra))
+                file.write(self.bits)
+            os.replace(file.name, path)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BloomFilter"]:
+        """Filter saved at `path`, None if there is none or it is unreadable"""
+        try:
+            data = path.read_bytes()
+            magic, num_bits, num_hashes, capacity, count, extra = HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        bits = data[HEADER.size:]
+        if magic != MAGIC or len(bits) != (num_bits + 7) // 8:
+            return None
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bytearray(bits)
+        bloom.count = count
+        bloom.extra = extra
+        return bloom
+#end BloomFilter
@@ -1,105 +1,534 @@
 import time
+import atexit
 import hashlib
 import pickle
-import os
+import sqlite3
+import threading
+import uuid
 from pathlib import Path
-from typing import Any, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from functools import wraps
+from glint.core.config import config_manager
+from glint.core.fetch_state import fetch_state
+from glint.utils.daemon_executor import DaemonThreadPoolExecutor
+
+DEFAULT_MAX_STALE = 3600  # seconds an expired entry may still be served while it is refreshed
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_MB = 20  # pickled trends
+SWEEP_INTERVAL = 60  # seconds between two purges of hard-expired entries
+LEASE_SECONDS = 300  # a fetch lease left by a crashed or stuck process expires after this
+LEASE_WAIT = 60  # seconds to wait for topics another process is fetching
+LEASE_POLL = 0.25
+CACHE_VERSION = 3  # bumped when the entry layout or the pickled records change
 
 class CacheManager:
-    def __init__(self, ttl_seconds: int = 180):
-        self._cache = {}
-        self._ttl = ttl_seconds
-        self._cache_file = Path.home() / ".glint" / "cache.pkl"
-        self._load_cache()
-    
-    def _load_cache(self):
-        """Load cache from disk if it exists"""
+    """
+    Persistent result cache, one SQLite row per key in ~/.glint/cache.db.
+    Values are pickled lists of TrendRecord, a few plain tuples per entry.
+    A set() writes only its own entries in one transaction, get() reads only
+    its own entries.
+
+    Every entry has its own ttl. It is fresh for `ttl` seconds, then stale for
+    `max_stale` more seconds: stale entries are only returned on request
+    (stale-while-revalidate). Entries past this hard expiry are purged by a
+    background sweep, and the least recently used ones are evicted once the
+    cache holds more than `max_entries` entries or `max_bytes` bytes.
+
+    Hits, misses and evictions are counted per source in the same file, so
+    `glint cache stats` reports those of every glint process.
+
+    The GUI, the web server and the daemon share the file: it runs in WAL
+    mode so readers never block the writer, and fetch leases let one process
+    fetch a (source, topic) while the others wait for its result.
+    """
+    def __init__(
+        self,
+        ttl_seconds: int = 180,
+        max_stale: int = 0,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        self._ttl = ttl_seconds  # default ttl of set()
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache_file = Path.home() / ".glint" / "cache.db"
+        self._legacy_file = Path.home() / ".glint" / "cache.pkl"  # whole-file pickle of older versions
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the store on first use"""
+        if self._conn is None:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._cache_file), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                # Layout or records of an older version, cached data is disposable
+                self._conn.execute("DROP TABLE IF EXISTS entry")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entry ("
+                " key TEXT PRIMARY KEY, source TEXT, value BLOB, size INTEGER,"
+                " stored_at REAL, expires_at REAL, last_access REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entry_expires_at ON entry (expires_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entry_last_access ON entry (last_access)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lease (key TEXT PRIMARY KEY, owner TEXT, expires_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counter ("
+                " source TEXT, name TEXT, value INTEGER, PRIMARY KEY (source, name))"
+            )
+            self._conn.commit()
+            self._legacy_file.unlink(missing_ok=True)
+            self._start_sweeper()
+        return self._conn
+    
+    def _start_sweeper(self):
+        """Purge hard-expired entries every SWEEP_INTERVAL seconds, off the read and write paths"""
+        def sweep():
+            while True:
+                time.sleep(SWEEP_INTERVAL)
+                try:
+                    self._clean_expired()
+                except Exception:
+                    pass  # Next sweep will retry
+        self._sweeper = threading.Thread(target=sweep, name="glint-cache-sweep", daemon=True)
+        self._sweeper.start()
+    
+    def _clean_expired(self):
+        """Remove entries past their hard expiry"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entry WHERE expires_at <= ?", (time.time() - self.max_stale,))
+            conn.commit()
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_entries and max_bytes"""
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entry").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entry ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM entry WHERE key = ?", (key,))
+            evicted += 1
+            count -= 1
+            total -= size
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+        self._count(conn, "*", "evictions", evicted)
+    
+    def _count(self, conn: sqlite3.Connection, source: str, name: str, value: int):
+        if value:
+            conn.execute(
+                "INSERT INTO counter VALUES (?, ?, ?)"
+                " ON CONFLICT (source, name) DO UPDATE SET value = value + excluded.value",
+                (source, name, value)
+            )
+    
+    def record(self, source: str, hits: int = 0, misses: int = 0, stale: int = 0):
+        """Count lookups of a source: fresh hits, misses and stale hits"""
         try:
-            if self._cache_file.exists():
-                with open(self._cache_file, 'rb') as f:
-                    self._cache = pickle.load(f)
-                # Clean expired entries on load
-                self._clean_expired()
+            with self._lock:
+                conn = self._connect()
+                self._count(conn, source, "hits", hits)
+                self._count(conn, source, "misses", misses)
+                self._count(conn, source, "stale", stale)
+                conn.commit()
         except Exception:
-            # If cache file is corrupt, start fresh
-            self._cache = {}
+            pass  # Statistics are best effort
+    
+    def _generate_key(self, fetcher_name: str, topic_name: str) -> str:
+        """Generate cache key from fetcher + one topic"""
+        key_string = f"{fetcher_name}:{topic_name}"
+        return hashlib.md5(key_string.encode()).hexdigest()
     
-    def _save_cache(self):
-        """Save cache to disk"""
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached data if not expired"""
+        found = self.get_many([key])
+        return found[key][0] if key in found else None
+    
+    def get_many(self, keys: List[str], allow_stale: bool = False) -> Dict[str, Tuple[Any, bool]]:
+        """
+        Cached data of the keys that are present and not expired, in one query,
+        as {key: (data, is_stale)}. With allow_stale, entries past their ttl
+        but within max_stale are returned too.
+        """
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        oldest = now - self.max_stale if allow_stale else now
         try:
-            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, 'wb') as f:
-                pickle.dump(self._cache, f)
+            placeholders = ",".join("?" * len(keys))
+            with self._lock:
+                conn = self._connect()
+                rows = conn.execute(
+                    f"SELECT key, value, expires_at FROM entry WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*keys, oldest)
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        "UPDATE entry SET last_access = ? WHERE key = ?", [(now, row[0]) for row in rows]
+                    )
+                    conn.commit()
+        except Exception:
+            return found
+        for key, value, expires_at in rows:
+            try:
+                found[key] = (pickle.loads(value), expires_at <= now)
+            except Exception:
+                pass  # A corrupt entry is a miss
+        return found
+    
+    def set(self, key: str, data: Any, ttl: Optional[int] = None, source: str = ""):
+        """Cache data for `ttl` seconds, the cache's default ttl if None"""
+        self.set_many({key: data}, ttl, source)
+    
+    def set_many(self, entries: Dict[str, Any], ttl: Optional[int] = None, source: str = ""):
+        """Cache several entries of a source in one transaction"""
+        try:
+            now = time.time()
+            expires_at = now + (self._ttl if ttl is None else ttl)
+            rows = []
+            for key, data in entries.items():
+                value = pickle.dumps(data)
+                rows.append((key, source, value, len(value), now, expires_at, now))
+            with self._lock:
+                conn = self._connect()
+                conn.executemany("INSERT OR REPLACE INTO entry VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._evict(conn)
+                conn.commit()
         except Exception:
             pass  # Fail silently if we can't save
     
-    def _clean_expired(self):
-        """Remove expired entries from cache"""
+    def acquire(self, keys: List[str], owner: str, seconds: float = LEASE_SECONDS) -> List[str]:
+        """
+        Lease `keys` to `owner` for fetching them, across every glint process.
+        Returns the keys leased, the others are being fetched by another owner.
+        """
+        if not keys:
+            return []
         now = time.time()
-        expired_keys = [
-            key for key, (cached_time, _) in self._cache.items()
-            if now - cached_time > self._ttl
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-    
-    def _generate_key(self, fetcher_name: str, topics: list) -> str:
-        """Generate cache key from fetcher + topics"""
-        topic_names = sorted([t.name for t in topics])
-        key_string = f"{fetcher_name}:{','.join(topic_names)}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        placeholders = ",".join("?" * len(keys))
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute("DELETE FROM lease WHERE expires_at <= ?", (now,))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO lease VALUES (?, ?, ?)",
+                        [(key, owner, now + seconds) for key in keys]
+                    )
+                    rows = conn.execute(
+                        f"SELECT key FROM lease WHERE owner = ? AND key IN ({placeholders})", (owner, *keys)
+                    ).fetchall()
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception:
+            return list(keys)  # without leases every process fetches for itself
+        return [row[0] for row in rows]
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get cached data if not expired"""
-        if key not in self._cache:
-            return None
-        
-        cached_time, data = self._cache[key]
-        age = time.time() - cached_time
-        
-        if age > self._ttl:
-            del self._cache[key]  # Expired
-            self._save_cache()
-            return None
-        
-        return data
-    
-    def set(self, key: str, data: Any):
-        """Cache data with timestamp"""
-        self._cache[key] = (time.time(), data)
-        self._save_cache()  # Persist to disk
+    def release(self, keys: List[str], owner: str):
+        """Give back the leases of `owner`"""
+        if not keys:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany("DELETE FROM lease WHERE key = ? AND owner = ?", [(key, owner) for key in keys])
+                conn.commit()
+        except Exception:
+            pass  # The lease expires on its own
+    
+    def leased(self, keys: List[str]) -> List[str]:
+        """Keys currently leased by any owner"""
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT key FROM lease WHERE key IN ({placeholders}) AND expires_at > ?", (*keys, time.time())
+                ).fetchall()
+        except Exception:
+            return []
+        return [row[0] for row in rows]
     
     def clear(self):
         """Clear all cache"""
-        self._cache.clear()
-        self._save_cache()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entry")
+            conn.execute("DELETE FROM counter")
+            conn.commit()
+    
+    def __len__(self) -> int:
+        """Number of live entries"""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM entry WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Entries, bytes and counters per source, plus totals:
+        {"sources": {source: {...}}, "entries", "stale", "bytes", "evictions",
+         "oldest", "mean_age", "newest"} with ages in seconds.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT source, COUNT(*), SUM(expires_at <= ?), SUM(size),"
+                " MIN(stored_at), AVG(stored_at), MAX(stored_at) FROM entry GROUP BY source",
+                (now,)
+            ).fetchall()
+            counters = conn.execute("SELECT source, name, value FROM counter").fetchall()
+
+        sources = {}
+        for source, entries, stale, size, oldest, mean, newest in rows:
+            sources[source] = {
+                "entries": entries, "stale": stale, "bytes": size,
+                "oldest": now - oldest, "mean_age": now - mean, "newest": now - newest,
+            }
+        evictions = 0
+        for source, name, value in counters:
+            if source == "*":
+                evictions += value
+                continue
+            sources.setdefault(source, {"entries": 0, "stale": 0, "bytes": 0})[name] = value
+
+        entries = sum(row[1] for row in rows)
+        return {
+            "sources": sources,
+            "entries": entries,
+            "stale": sum(row[2] for row in rows),
+            "bytes": sum(row[3] for row in rows),
+            "evictions": evictions,
+            "oldest": max((now - row[4] for row in rows), default=0.0),
+            "mean_age": sum((now - row[5]) * row[1] for row in rows) / entries if entries else 0.0,
+            "newest": min((now - row[6] for row in rows), default=0.0),
+        }
+
+# Cache entries of a fetcher called without topics, and of the trends it did not link to a topic
+ALL_TOPICS = "*"
+UNMATCHED = "*unmatched"
 
 # Global cache instance
-trend_cache = CacheManager(ttl_seconds=600)  # 10 minutes
+trend_cache = CacheManager(
+    ttl_seconds=600,  # 10 minutes, for entries stored without their own ttl
+    max_stale=config_manager.get_setting("cache_max_stale", DEFAULT_MAX_STALE),
+    max_entries=config_manager.get_setting("cache_max_entries", DEFAULT_MAX_ENTRIES),
+    max_bytes=config_manager.get_setting("cache_max_mb", DEFAULT_MAX_MB) * 1024 * 1024
+)
+
+# Background refreshes of stale entries, on daemon threads: a short-lived
+# `glint fetch` exits without waiting for them, the stale entry stays served
+# and the next run refreshes it again
+_refresh_executor = DaemonThreadPoolExecutor(2, thread_name_prefix="glint-cache-refresh")
+_unfinished_refreshes: Dict[str, Callable[[], None]] = {}  # lease owner -> release of its leases
+
+
+@atexit.register
+def _release_unfinished_refreshes():
+    """Give back the leases of refreshes cut short by the exit, so the next run retries at once"""
+    for release in list(_unfinished_refreshes.values()):
+        release()
+
+
+class _CachedCall:
+    """One call of a @cached_fetch method: its cache entries, leases and fetched topics"""
+
+    def __init__(self, fetcher, topics: list, ttl: int):
+        self.fetcher = fetcher
+        self.source = fetcher.__class__.__name__
+        self.topics = topics
+        self.ttl = ttl
+        self.names = [topic.name for topic in topics] if topics else [ALL_TOPICS]
+        self.keys = {name: trend_cache._generate_key(self.source, name) for name in self.names + [UNMATCHED]}
+        self.cached: Dict[str, list] = {}  # trends by topic name
+        self.stale: List[str] = []  # cached names past their ttl
+        self.unmatched: list = []  # trends the source did not link to one of the fetched topics
+        self._lookup()
+
+    def _lookup(self):
+        # A backfill always goes to the network, cached results may be incremental
+        if not getattr(self.fetcher, "backfill", False):
+            entries = trend_cache.get_many(list(self.keys.values()), allow_stale=True)
+            for name, key in self.keys.items():
+                if key not in entries:
+                    continue
+                trends, is_stale = entries[key]
+                if name == UNMATCHED:
+                    self.unmatched = trends
+                    continue
+                self.cached[name] = trends
+                if is_stale:
+                    self.stale.append(name)
+
+        hits = len(self.cached)
+        if hits == len(self.names):
+            print(f"[Cache HIT] {self.source}")
+        elif hits == 0:
+            print(f"[Cache MISS] {self.source}")
+        else:
+            print(f"[Cache PARTIAL] {self.source}: {hits} topics cached, {len(self.names) - hits} to fetch")
+        if self.stale:
+            print(f"[Cache STALE] {self.source}: {len(self.stale)} served stale, refreshing in background")
+        trend_cache.record(
+            self.source, hits=hits - len(self.stale), misses=len(self.names) - hits, stale=len(self.stale)
+        )
+
+    def missing(self) -> List[str]:
+        return [name for name in self.names if name not in self.cached]
+
+    def topics_named(self, names: List[str]) -> list:
+        """Topics to pass to the fetcher for `names`, none for the call without topics"""
+        names = set(names)
+        return [topic for topic in self.topics if topic.name in names]
+
+    def claim(self, names: List[str], owner: str) -> Tuple[List[str], List[str]]:
+        """Lease `names`: return (names to fetch, names another process is fetching)"""
+        claimed = set(trend_cache.acquire([self.keys[name] for name in names], owner))
+        mine = [name for name in names if self.keys[name] in claimed]
+        return mine, [name for name in names if self.keys[name] not in claimed]
+
+    def release(self, names: List[str], owner: str):
+        trend_cache.release([self.keys[name] for name in names], owner)
+
+    def pending(self, names: List[str]) -> List[str]:
+        """Pick up the entries another process stored, return the names it is still fetching"""
+        keys = [self.keys[name] for name in names]
+        entries = trend_cache.get_many(keys)
+        for name in names:
+            if self.keys[name] in entries:
+                self.cached[name] = entries[self.keys[name]][0]
+        leased = set(trend_cache.leased([key for key in keys if key not in entries]))
+        return [name for name in names if self.keys[name] in leased]
+
+    def store(self, names: List[str], fresh: list):
+        """Cache the fresh trends of `names`, one entry per topic"""
+        if not self.topics:
+            self.cached[ALL_TOPICS] = fresh
+            trend_cache.set(self.keys[ALL_TOPICS], fresh, self.ttl, self.source)
+            return
+
+        names_by_id = {topic.id: topic.name for topic in self.topics_named(names)}
+        by_topic = {name: [] for name in names}  # empty results are cached too
+        unmatched = []
+        for trend in fresh:
+            name = names_by_id.get(trend.topic_id)
+            (by_topic[name] if name is not None else unmatched).append(trend)
+        self.cached.update(by_topic)
+        self.unmatched = _unique_urls(self.unmatched + unmatched)
+
+        entries = {self.keys[name]: trends for name, trends in by_topic.items()}
+        entries[self.keys[UNMATCHED]] = self.unmatched
+        trend_cache.set_many(entries, self.ttl, self.source)
+
+    def result(self) -> list:
+        """Trends in topic order, then the unmatched ones"""
+        if not self.topics:
+            return self.cached.get(ALL_TOPICS, [])
+        trends = []
+        for topic in self.topics:
+            for trend in self.cached.get(topic.name, []):
+                trend.topic_id = topic.id  # entries are keyed by name, a re-created topic has a new id
+                trends.append(trend)
+        return _unique_urls(trends + self.unmatched)
+
+    def revalidate(self, fetch_func: Callable, args, kwargs):
+        """Refresh the stale topics in the background, unless another call is already on it"""
+        if not self.stale:
+            return
+        owner = uuid.uuid4().hex
+        names, _ = self.claim(self.stale, owner)
+        if not names:
+            return
+
+        _unfinished_refreshes[owner] = lambda: self.release(names, owner)
+
+        def refresh():
+            try:
+                topics = self.topics_named(names)
+                # Its trends only go to the cache: nothing staged for the fetch that started it
+                with fetch_state.staging(None):
+                    fresh = fetch_func(self.fetcher, topics, *args, **kwargs)
+                self.store(names, fresh)
+            except Exception as e:
+                print(f"[Cache] Background refresh of {self.source} failed: {e}")
+            finally:
+                self.release(names, owner)
+                _unfinished_refreshes.pop(owner, None)
+
+        try:
+            _refresh_executor.submit(refresh)
+        except RuntimeError:
+            # interpreter shutting down: the entries stay stale until the next fetch
+            self.release(names, owner)
+            _unfinished_refreshes.pop(owner, None)
+#end _CachedCall
+
 
 def cached_fetch(ttl: int = 600):
-    """Decorator for caching fetch results"""
+    """
+    Decorator for caching the results of a fetcher's fetch(),
+    for `ttl` seconds.
+
+    Results are cached per (source, topic): a call only fetches the topics
+    missing from the cache or expired, and merges them with the cached ones,
+    so adding one topic costs one topic's worth of requests.
+
+    Stale-while-revalidate: topics whose entry expired less than
+    trend_cache.max_stale seconds ago are served from the cache right away
+    and refreshed by a background worker (settings -> cache_max_stale in
+    config.json, 0 turns it off).
+
+    Topics being fetched by another glint process are not fetched twice:
+    the call waits up to LEASE_WAIT seconds for that process to store them.
+    """
     def decorator(fetch_func: Callable):
         @wraps(fetch_func)
         def wrapper(self, topics, *args, **kwargs):
-            # Generate cache key
-            fetcher_name = self.__class__.__name__
-            cache_key = trend_cache._generate_key(fetcher_name, topics)
+            call = _CachedCall(self, topics, ttl)
+            call.revalidate(fetch_func, args, kwargs)
             
-            # Try cache
-            cached = trend_cache.get(cache_key)
-            if cached is not None:
-                print(f"[Cache HIT] {fetcher_name}")
-                return cached
+            # Fetch the missing topics no other process is fetching
+            owner = uuid.uuid4().hex
+            mine, theirs = call.claim(call.missing(), owner)
+            try:
+                if mine:
+                    call.store(mine, fetch_func(self, call.topics_named(mine), *args, **kwargs))
+            finally:
+                call.release(mine, owner)
             
-            # Cache miss - fetch fresh
-            print(f"[Cache MISS] {fetcher_name}")
-            result = fetch_func(self, topics, *args, **kwargs)
-            
-            # Store in cache
-            trend_cache.set(cache_key, result)
-            
-            return result
+            # Wait for the others, fetch what they did not store
+            deadline = time.monotonic() + LEASE_WAIT
+            while theirs and time.monotonic() < deadline:
+                time.sleep(LEASE_POLL)
+                theirs = call.pending(theirs)
+            leftovers = call.missing()
+            if leftovers:
+                call.store(leftovers, fetch_func(self, call.topics_named(leftovers), *args, **kwargs))
+            return call.result()
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+def _unique_urls(trends: list) -> list:
+    """Keep the first trend of each URL"""
+    seen = set()
+    unique = []
+    for trend in trends:
+        if trend.url not in seen:
+            seen.add(trend.url)
+            unique.append(trend)
+    return unique
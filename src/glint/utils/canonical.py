@@ -0,0 +1,119 @@
+"""
+Canonical URLs: one key per document, whatever the link a source gives.
+
+normalize_url only cleans a URL, so the same paper linked as
+arxiv.org/abs/2312.12345v1, arxiv.org/pdf/2312.12345v2 and
+doi.org/10.48550/arXiv.2312.12345 still gives three keys. Canonicalizers
+registered per host map such aliases to one canonical URL, which the
+pipeline stores as url_normalized and deduplicates on.
+
+Add one for a new kind of alias with the decorator:
+
+    @canonicalizer("example.com")
+    def example(parts: SplitResult) -> Optional[str]:
+        ...  # canonical URL, or None to keep the normalized one
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import SplitResult, unquote, urlsplit
+from glint.utils.url_utils import URL_CACHE_SIZE, normalize_url
+
+Canonicalizer = Callable[[SplitResult], Optional[str]]
+
+_CANONICALIZERS: Dict[str, List[Canonicalizer]] = {}  # by host of the normalized URL
+
+# New style ids (2312.12345) and old style ones (cs/0112017, math.GT/0309136), without version
+ARXIV_ID = re.compile(r'(\d{4}\.\d{4,5}|[a-z-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?', re.IGNORECASE)
+ARXIV_DOI_PREFIX = "10.48550/arxiv."  # DOIs arXiv registers for its papers
+
+
+def canonicalizer(*hosts: str):
+    """Register a function returning the canonical URL of links on `hosts`"""
+    def register(function: Canonicalizer) -> Canonicalizer:
+        for host in hosts:
+            _CANONICALIZERS.setdefault(host, []).append(function)
+        canonical_url.cache_clear()
+        return function
+    return register
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def canonical_url(url: str) -> str:
+    """
+    Canonical URL of a document: the first registered canonicalizer of its host
+    that recognizes the link, else the normalized URL
+    """
+    normalized = normalize_url(url)
+    parts = urlsplit(normalized)
+    for function in _CANONICALIZERS.get(parts.netloc, ()):
+        canonical = function(parts)
+        if canonical:
+            return canonical
+    return normalized
+
+
+def canonical_urls(urls: Iterable[str]) -> List[str]:
+    """Canonical URLs of many links, each distinct link is canonicalized once"""
+    urls = list(urls)
+    canonical = {url: canonical_url(url) for url in set(urls)}
+    return [canonical[url] for url in urls]
+
+
+def arxiv_url(arxiv_id: str) -> Optional[str]:
+    """Abstract page of an arXiv id, None if it is not one"""
+    match = ARXIV_ID.fullmatch(arxiv_id.strip())
+    return f"https://arxiv.org/abs/{match.group(1)}" if match else None
+
+
+def doi_url(doi: str) -> str:
+    """doi.org link of a DOI, arXiv DOIs become the arXiv abstract page (DOIs ignore case)"""
+    doi = doi.strip().lower()
+    if doi.startswith(ARXIV_DOI_PREFIX):
+        return arxiv_url(doi[len(ARXIV_DOI_PREFIX):]) or f"https://doi.org/{doi}"
+    return f"https://doi.org/{doi}"
+
+
+@canonicalizer("arxiv.org", "export.arxiv.org")
+def _arxiv(parts: SplitResult) -> Optional[str]:
+    # /abs/<id>, /pdf/<id>, /pdf/<id>.pdf, /html/<id>, each with an optional version
+    kind, _, arxiv_id = parts.path.lstrip("/").partition("/")
+    if kind not in ("abs", "pdf", "html"):
+        return None
+    if arxiv_id.endswith(".pdf"):
+        arxiv_id = arxiv_id[:-len(".pdf")]
+    return arxiv_url(arxiv_id)
+
+
+@canonicalizer("doi.org", "dx.doi.org")
+def _doi(parts: SplitResult) -> Optional[str]:
+    doi = unquote(parts.path.lstrip("/"))
+    return doi_url(doi) if doi.startswith("10.") else None
+
+
+@canonicalizer("github.com")
+def _github_repo(parts: SplitResult) -> Optional[str]:
+    # owner/repo and owner/repo.git are the same repository, names ignore case
+    segments = parts.path.strip("/").split("/")
+    if len(segments) != 2 or parts.query:
+        return None
+    owner, repo = segments
+    if repo.endswith(".git"):
+        repo = repo[:-len(".git")]
+    return f"https://github.com/{owner.lower()}/{repo.lower()}"
+
+
+@canonicalizer("redd.it", "reddit.com", "old.reddit.com", "np.reddit.com")
+def _reddit_post(parts: SplitResult) -> Optional[str]:
+    # redd.it/<id>, /comments/<id> and /r/<subreddit>/comments/<id>/<slug> are the same post
+    segments = parts.path.strip("/").split("/")
+    if parts.netloc == "redd.it":
+        post_id = segments[0] if len(segments) == 1 else None
+    elif "comments" in segments:
+        index = segments.index("comments")
+        # a longer path links to one comment of the post
+        post_id = segments[index + 1] if index + 1 < len(segments) <= index + 3 else None
+    else:
+        post_id = None
+    return f"https://reddit.com/comments/{post_id.lower()}" if post_id else None
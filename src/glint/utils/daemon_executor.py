@@ -0,0 +1,84 @@
+"""
+Thread pool whose workers never delay the exit of glint.
+
+concurrent.futures.ThreadPoolExecutor joins its workers when the interpreter
+exits, even after shutdown(wait=False): a `glint fetch` whose deadline
+abandoned a slow source would still wait for it. The workers of
+DaemonThreadPoolExecutor are daemon threads, so work still running at exit is
+dropped. Only use it for work that can be lost (fetches, cache refreshes):
+SQLite rolls back a transaction cut short.
+
+Tasks run in a copy of the context variables of the thread that submitted
+them, like asyncio tasks, so the fetch a worker belongs to follows it (see
+glint.core.fetch_state).
+"""
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import Executor, Future
+from typing import List
+
+
+class DaemonThreadPoolExecutor(Executor):
+    def __init__(self, max_workers: int, thread_name_prefix: str = "glint-worker"):
+        self.max_workers = max(1, max_workers)
+        self.thread_name_prefix = thread_name_prefix
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self._idle = threading.Semaphore(0)  # released by a worker waiting for work
+        self._lock = threading.Lock()
+        self._shutdown = False
+    #end __init__
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            self._queue.put((future, contextvars.copy_context(), fn, args, kwargs))
+            # Start a worker unless one is idle
+            if not self._idle.acquire(blocking=False) and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.thread_name_prefix}_{len(self._threads)}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            return future
+    #end submit
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:  # shutdown
+                return
+            future, context, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = context.run(fn, *args, **kwargs)
+                except BaseException as ex:
+                    future.set_exception(ex)
+                else:
+                    future.set_result(result)
+            del item, future, context
+            self._idle.release()
+    #end _work
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+            for _ in self._threads:
+                self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+    #end shutdown
+#end DaemonThreadPoolExecutor
@@ -2,7 +2,9 @@
 
 import re
 import hashlib
-from typing import Set
+import random
+import struct
+from typing import Iterable, List, Optional, Set, Tuple
 
 #common English stopwords that don't add much value to content fingerprinting
 STOPWORDS: Set[str] = {
@@ -17,6 +19,12 @@ STOPWORDS: Set[str] = {
 
 # TODO: Add more stopwords for other languages
 
+# Compiled once, these run on every fetched trend
+_URL = re.compile(r'https?://\S+')
+_VERSION = re.compile(r'(\d+)\.(\d+)')  # "3.13" -> "313"
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+_SPACES = re.compile(r'\s+')
+
 def generate_fingerprint(title: str, description: str= "") -> str:
     """
     Generate a content fingerprint based on title and description.
@@ -43,15 +51,40 @@ def generate_fingerprint(title: str, description: str= "") -> str:
     
     #step 1: Normalize text  
     #remove URLs
-    text = re.sub(r'https?://\S+', '', text)
+    text = _URL.sub('', text)
     #handle version numbers (join digits with dots)
-    text = re.sub(r'(\d+)\.(\d+)', r'\1\2', text)
+    text = _VERSION.sub(r'\1\2', text)
 
     #remove special characters and keep only alphanumeric and spaces
-    text = re.sub(r'[^a-z0-9\s]', ' ', text) # à revoir
+    text = _NON_ALNUM.sub(' ', text) # à revoir
+    return _hash_key_terms(text)
+#end generate_fingerprint
+
+def generate_fingerprints(items: Iterable[Tuple[str, Optional[str]]]) -> List[str]:
+    """
+    Fingerprints of many (title, description) pairs, equal to calling generate_fingerprint on each.
+
+    The texts are joined with newlines so every normalization regex runs
+    once over the whole batch instead of once per item. No pattern can
+    match across a newline, and newlines inside a text are only spaces.
+    """
+    texts = []
+    for title, description in items:
+        text = title.lower()
+        if description:
+            text += " " + description[:100].lower()
+        texts.append(text.replace("\n", " "))
+    if not texts:
+        return []
+    text = _NON_ALNUM.sub(' ', _VERSION.sub(r'\1\2', _URL.sub('', "\n".join(texts))))
+    return [_hash_key_terms(text) for text in text.split("\n")]
+#end generate_fingerprints
+
+def _hash_key_terms(text: str) -> str:
+    """Steps 2 to 5 of generate_fingerprint, on the normalized text"""
     #remove extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    
+    text = _SPACES.sub(' ', text).strip()
+
     #step 2: Split into words and remove stopwords
     words = text.split()
     meaningful_worlds = [word for word in words if word not in STOPWORDS and len(word) > 2]
@@ -75,7 +108,7 @@ def generate_fingerprint(title: str, description: str= "") -> str:
     
     #return the first 16 characters of the hash
     return full_hash[:16]
-#end generate_fingerprint
+#end _hash_key_terms
 
 def extract_core_terms(title: str, max_terms: int =4) -> list:
     """
@@ -93,9 +126,9 @@ def extract_core_terms(title: str, max_terms: int =4) -> list:
     #Normalize 
     text = title.lower()
     #handle version numbers (join digits with dots)
-    text = re.sub(r'(\d+)\.(\d+)', r'\1\2', text)
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _VERSION.sub(r'\1\2', text)
+    text = _NON_ALNUM.sub(' ', text)
+    text = _SPACES.sub(' ', text).strip()
 
     #remove stopwords
     words = text.split()
@@ -113,5 +146,69 @@ def fingerprints_match(fingerprint1: str, fingerprint2: str) -> bool:
     return fingerprint1 == fingerprint2
 #end fingerprints_match
 
-
-    
+# Near-duplicate detection (MinHash + banded LSH)
+#
+# The fingerprint above only matches the same key terms. Reworded cross-posts
+# ("Show HN: X, a ..." on HN, "I built X, a ..." on Reddit) share most of their
+# words, so each title is turned into a MinHash signature whose slots agree
+# with probability equal to the Jaccard similarity of the word sets.
+# The signature is cut in bands: two trends sharing one band are candidates,
+# which is one indexed lookup per band whatever the number of stored trends.
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # of 4 rows: pairs above ~0.5 Jaccard share a band, above 0.7 in 99% of cases
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+MIN_NEAR_DUPLICATE_TERMS = 3  # shorter titles are too ambiguous to compare
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # fixed seed: signatures are stored and compared across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+# Boilerplate of cross-posts, removed before comparing titles
+CROSSPOST_PREFIX = re.compile(
+    r'^\s*(show hn|ask hn|tell hn|launch hn|i (?:just )?(?:built|made|created|wrote|released)|'
+    r'introducing|announcing|presenting)\b[:\s,-]*',
+    re.IGNORECASE
+)
+
+def near_duplicate_terms(title: str) -> Set[str]:
+    """Distinct meaningful words of a title, without cross-post boilerplate"""
+    text = CROSSPOST_PREFIX.sub('', title).lower()
+    text = _URL.sub('', text)
+    text = _VERSION.sub(r'\1\2', text)
+    text = _NON_ALNUM.sub(' ', text)
+    return {word for word in text.split() if word not in STOPWORDS and len(word) > 2}
+#end near_duplicate_terms
+
+def minhash_signature(title: str) -> Optional[bytes]:
+    """
+    MinHash signature of a title, MINHASH_PERMUTATIONS packed 64-bit slots.
+    None when the title has fewer than MIN_NEAR_DUPLICATE_TERMS terms.
+    """
+    terms = near_duplicate_terms(title)
+    if len(terms) < MIN_NEAR_DUPLICATE_TERMS:
+        return None
+    # Stable term hashes, Python's hash() changes between processes
+    hashes = [int.from_bytes(hashlib.blake2b(term.encode(), digest_size=8).digest(), "big") for term in terms]
+    slots = [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+    return struct.pack(f">{MINHASH_PERMUTATIONS}Q", *slots)
+#end minhash_signature
+
+def lsh_bands(signature: bytes) -> List[int]:
+    """One signed 64-bit key per band (SQLite integers are signed), the band number is part of the key"""
+    size = LSH_ROWS * 8
+    keys = []
+    for band in range(LSH_BANDS):
+        digest = hashlib.blake2b(signature[band * size:(band + 1) * size], digest_size=8, person=bytes([band])).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+#end lsh_bands
+
+def signature_similarity(signature1: bytes, signature2: bytes) -> float:
+    """Estimated Jaccard similarity of two titles: the share of equal signature slots"""
+    slots1 = struct.unpack(f">{MINHASH_PERMUTATIONS}Q", signature1)
+    slots2 = struct.unpack(f">{MINHASH_PERMUTATIONS}Q", signature2)
+    return sum(1 for x, y in zip(slots1, slots2) if x == y) / MINHASH_PERMUTATIONS
+#end signature_similarity
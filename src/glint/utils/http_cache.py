@@ -0,0 +1,239 @@
+"""
+On-disk HTTP response cache for HTTPClient, following RFC 7234 for a private cache.
+
+Responses are kept in ~/.glint/http_cache.db with zlib-compressed bodies,
+so every glint process (CLI, GUI, daemon) shares the downloads of the others:
+
+- a response is fresh for Cache-Control max-age, else Expires - Date,
+  else 10% of its age since Last-Modified (at most an hour), minus its Age
+- fresh responses are served without touching the network
+- stale ones are revalidated with their ETag / Last-Modified, and a 304
+  refreshes the stored copy
+- no-store and Vary: * responses are never stored, no-cache ones are
+  always revalidated
+- once the cache grows past its size cap the least recently used entries are evicted
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # compressed bodies
+HEURISTIC_MAX_LIFETIME = 3600  # seconds, for responses with only Last-Modified
+CACHEABLE_STATUS = (200,)
+# Describe the stored (decoded) body no more
+DROPPED_HEADERS = ("Content-Encoding", "Transfer-Encoding", "Content-Length", "Connection")
+
+
+class CachedResponse:
+    """A stored response and its freshness"""
+
+    def __init__(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes, fresh_until: float):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+        self.fresh_until = fresh_until
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers to revalidate this response"""
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response, flagged with from_cache = True"""
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = self.url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+#end CachedResponse
+
+
+class HTTPCache:
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or Path.home() / ".glint" / "http_cache.db"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")  # shared by every glint process
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT,"
+                " vary TEXT, body BLOB, size INTEGER, fresh_until REAL, last_access REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_response_last_access ON response (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, url: str, request_headers: Dict[str, str]) -> Optional[CachedResponse]:
+        """Stored response for a GET of `url`, fresh or stale, None if there is none"""
+        key = _cache_key(url)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT status, headers, vary, body, fresh_until FROM response WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, headers, vary, body, fresh_until = row
+            # Vary: the stored response only answers requests with the same header values
+            if json.loads(vary) != _vary_values(json.loads(headers), request_headers):
+                return None
+            conn.execute("UPDATE response SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        return CachedResponse(key, url, status, json.loads(headers), zlib.decompress(body), fresh_until)
+
+    def store(self, url: str, request_headers: Dict[str, str], response) -> bool:
+        """Store a response if it is cacheable, return True if stored"""
+        if response.status_code not in CACHEABLE_STATUS:
+            return False
+        cache_control = _parse_cache_control(response.headers.get("Cache-Control"))
+        if "no-store" in cache_control or response.headers.get("Vary", "").strip() == "*":
+            return False
+        lifetime = _freshness_lifetime(response.headers, cache_control)
+        has_validators = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if lifetime <= 0 and not has_validators:
+            return False  # could never be reused
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.title() not in DROPPED_HEADERS
+        }
+        self._write(url, response.status_code, headers, request_headers, response.content, lifetime)
+        return True
+
+    def revalidated(self, cached: CachedResponse, not_modified, request_headers: Dict[str, str]) -> requests.Response:
+        """The server answered 304 to a revalidation: refresh the stored copy and return it"""
+        headers = dict(cached.headers)
+        # A 304 carries the updated metadata of the stored response
+        for name in ("Cache-Control", "Expires", "Date", "ETag", "Last-Modified", "Age"):
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+            elif name == "Age":
+                headers.pop(name, None)
+        headers = CaseInsensitiveDict(headers)
+        lifetime = _freshness_lifetime(headers, _parse_cache_control(headers.get("Cache-Control")))
+        self._write(cached.url, cached.status, dict(headers), request_headers, cached.body, lifetime)
+        cached.headers = headers
+        return cached.to_response()
+
+    def _write(self, url: str, status: int, headers: dict, request_headers: dict, body: bytes, lifetime: float):
+        compressed = zlib.compress(body)
+        now = time.time()
+        age = _parse_int(CaseInsensitiveDict(headers).get("Age")) or 0
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _cache_key(url), url, status, json.dumps(headers),
+                    json.dumps(_vary_values(headers, request_headers)),
+                    compressed, len(compressed), now + lifetime - age, now
+                )
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM response ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM response WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM response")
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of entries and compressed size on disk"""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response"
+            ).fetchone()
+        return {"entries": entries, "bytes": size}
+#end HTTPCache
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _vary_values(response_headers: dict, request_headers: dict) -> Dict[str, Optional[str]]:
+    """Request header values selected by the response's Vary header"""
+    vary = CaseInsensitiveDict(response_headers).get("Vary", "")
+    request_headers = CaseInsensitiveDict(request_headers)
+    names = sorted(name.strip().lower() for name in vary.split(",") if name.strip())
+    return {name: request_headers.get(name) for name in names}
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _freshness_lifetime(headers, cache_control: Dict[str, Optional[str]]) -> float:
+    """Seconds a response stays fresh after it was generated (RFC 7234, section 4.2.1)"""
+    if "no-cache" in cache_control:
+        return 0
+    max_age = _parse_int(cache_control.get("max-age"))
+    if max_age is not None:
+        return max_age
+    date = _parse_date(headers.get("Date")) or time.time()
+    if "Expires" in headers:
+        expires = _parse_date(headers.get("Expires"))
+        return max(0.0, expires - date) if expires else 0  # invalid Expires means already expired
+    last_modified = _parse_date(headers.get("Last-Modified"))
+    if last_modified:
+        return min(HEURISTIC_MAX_LIFETIME, max(0.0, (date - last_modified) / 10))
+    return 0
@@ -1,8 +1,49 @@
-
+import threading
+import time
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional
+from typing import Optional, Tuple
+from glint.core.config import config_manager
+from glint.core.fetch_state import fetch_state
+from glint.utils.http_cache import HTTPCache, DEFAULT_MAX_BYTES
+from glint.utils.rate_limiter import RateLimiter
+
+MAX_RATE_LIMIT_WAIT = 30  # seconds; a host blocked for longer fails fast
+RATE_LIMIT_RETRIES = 2  # resends after a 429 / exhausted quota, once the limiter allows
+
+
+class RateLimitExceeded(requests.RequestException):
+    """The host will not accept requests before MAX_RATE_LIMIT_WAIT seconds"""
+
+
+class InFlightLimiter:
+    """Counting limiter whose limit can change while requests hold it"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_flight = 0
+        self._condition = threading.Condition()
+    #end __init__
+
+    def resize(self, limit: int):
+        with self._condition:
+            self.limit = limit
+            self._condition.notify_all()  # a larger limit lets waiting requests go
+    #end resize
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+    #end __enter__
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+    #end __exit__
+#end InFlightLimiter
 
 class HTTPClient:
     """singleton HTTP client with connection pooling"""
@@ -17,13 +58,13 @@ class HTTPClient:
 
     def _initialize(self):
         self.session = requests.Session()
-        #retry strategy
+        #retry strategy (429 is handled by the rate limiter)
         retry_strategy = Retry(
             total=3,
             backoff_factor=0.1,
-            status_forcelist=[429, 500, 502, 503, 504]
+            status_forcelist=[500, 502, 503, 504]
         )
-        
+
         #connection pool : 20 connections max
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
@@ -35,12 +76,159 @@ class HTTPClient:
 
         #set defaut timeout
         self.timeout = 30
+
+        #global cap on requests in flight, shared by every source, topic worker and cache refresh
+        self.max_in_flight = 16
+        self._in_flight = InFlightLimiter(self.max_in_flight)
+
+        #one token bucket per host, settings -> rate_limits -> {host: [requests, seconds]} in config.json
+        self.rate_limiter = RateLimiter({
+            host: tuple(limit)
+            for host, limit in config_manager.get_setting("rate_limits", {}).items()
+        })
+
+        #on-disk HTTP cache shared by every glint process, settings -> http_cache_mb in config.json
+        max_mb = config_manager.get_setting("http_cache_mb", DEFAULT_MAX_BYTES // (1024 * 1024))
+        self.cache = HTTPCache(max_bytes=int(max_mb * 1024 * 1024))
     #end _initialize
-    
-    def get(self, url, **kwargs):
-        kwargs.setdefault('timeout', self.timeout)
-        return self.session.get(url, **kwargs)
+
+    def get(self, url, conditional: Optional[Tuple[str, str]] = None, **kwargs):
+        """
+        Args:
+            url: URL to fetch
+            conditional: optional (source, topic_name) key. The validators stored
+                for this request are sent back as If-None-Match / If-Modified-Since,
+                and the ones returned by the server are saved. On a 304 the caller
+                can skip parsing entirely.
+        Responses go through the on-disk HTTP cache, see glint.utils.http_cache.
+        Requests that need the network wait for the host's rate limiter first, see
+        glint.utils.rate_limiter. Raises RateLimitExceeded if the host is blocked
+        for more than MAX_RATE_LIMIT_WAIT. At most `max_in_flight` requests are
+        on the network at once, whatever thread sends them.
+        """
+        if not self._fresh_in_cache(url, kwargs):
+            time.sleep(self._reserve(url))
+        return self._send(url, conditional, **kwargs)
     #end get
 
+    def _request_url(self, url, params=None) -> str:
+        """Full URL, query string included"""
+        return requests.Request('GET', url, params=params).prepare().url
+    #end _request_url
+
+    def _fresh_in_cache(self, url, kwargs) -> bool:
+        """True if the request will be answered by the HTTP cache without network"""
+        try:
+            cached = self.cache.lookup(self._request_url(url, kwargs.get('params')), kwargs.get('headers') or {})
+        except Exception:
+            return False
+        return cached is not None and cached.is_fresh()
+    #end _fresh_in_cache
+
+    def _reserve(self, url) -> float:
+        delay = self.rate_limiter.reserve(url, MAX_RATE_LIMIT_WAIT)
+        if delay > MAX_RATE_LIMIT_WAIT:
+            raise RateLimitExceeded(f"Rate limited by {url.split('/')[2]} for {delay:.0f}s")
+        return delay
+    #end _reserve
+
+    def _send(self, url, conditional: Optional[Tuple[str, str]] = None, **kwargs):
+        """Send the request, resending it when the server says the rate limit is hit"""
+        response = self._send_once(url, conditional, **kwargs)
+        self.rate_limiter.update(url, response)
+        for _ in range(RATE_LIMIT_RETRIES):
+            if not self._is_rate_limited(response):
+                break
+            delay = self.rate_limiter.reserve(url, MAX_RATE_LIMIT_WAIT)
+            if delay > MAX_RATE_LIMIT_WAIT:
+                break  # the caller handles the 403 / 429
+            time.sleep(delay)
+            response = self._send_once(url, conditional, **kwargs)
+            self.rate_limiter.update(url, response)
+        return response
+    #end _send
+
+    def _is_rate_limited(self, response) -> bool:
+        if response.status_code == 429:
+            return True
+        # GitHub answers 403 once the quota is exhausted
+        return response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+    #end _is_rate_limited
+
+    def _send_once(self, url, conditional: Optional[Tuple[str, str]] = None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        headers = dict(kwargs.pop('headers', None) or {})
+        #cache entries and validators are stored per full URL, query string included
+        request_url = self._request_url(url, kwargs.get('params'))
+        response = self._cached_get(url, request_url, headers, conditional, **kwargs)
+        if conditional is None:
+            return response
+
+        source, topic_name = conditional
+        etag, last_modified = fetch_state.get_validators(source, topic_name, request_url)
+        if response.status_code == 200:
+            new_etag = response.headers.get('ETag')
+            new_last_modified = response.headers.get('Last-Modified')
+            fetch_state.save_validators(source, topic_name, request_url, new_etag, new_last_modified)
+            if (etag and new_etag == etag) or (not etag and last_modified and new_last_modified == last_modified):
+                #same representation as the caller's last fetch (e.g. from the HTTP cache)
+                return self._not_modified(response)
+        elif response.status_code == 304:
+            #unchanged: keep the validators, only record the fetch time
+            fetch_state.save_validators(source, topic_name, request_url, etag, last_modified)
+        return response
+    #end _send_once
+
+    def _cached_get(self, url, request_url, headers, conditional, **kwargs):
+        """
+        GET through the HTTP cache: fresh entries are served from disk, stale ones
+        are revalidated, and cacheable responses are stored.
+        """
+        try:
+            cached = self.cache.lookup(request_url, headers)
+        except Exception:
+            cached = None
+        if cached is not None and cached.is_fresh():
+            return cached.to_response()
+
+        request_headers = dict(headers)
+        if cached is not None:
+            request_headers.update(cached.validators())
+        elif conditional is not None:
+            #nothing on disk: send the validators of the caller's last fetch instead
+            etag, last_modified = fetch_state.get_validators(*conditional, request_url)
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        with self._in_flight:
+            response = self.session.get(url, headers=request_headers, **kwargs)
+        try:
+            if response.status_code == 304 and cached is not None:
+                return self.cache.revalidated(cached, response, headers)
+            self.cache.store(request_url, headers, response)
+        except Exception:
+            pass  # the cache is best effort
+        return response
+    #end _cached_get
+
+    def _not_modified(self, response) -> requests.Response:
+        """A 304 for the caller, built from a response it has already processed"""
+        not_modified = requests.Response()
+        not_modified.status_code = 304
+        not_modified.headers = response.headers
+        not_modified._content = b""
+        not_modified.url = response.url
+        return not_modified
+    #end _not_modified
+
+    def set_max_in_flight(self, max_in_flight: int):
+        """Change the global cap on requests in flight"""
+        self.max_in_flight = max(1, max_in_flight)
+        # requests already in flight count against the new limit
+        self._in_flight.resize(self.max_in_flight)
+    #end set_max_in_flight
+
 #end HTTPClient
-http_client = HTTPClient()
\ No newline at end of file
+http_client = HTTPClient()
@@ -0,0 +1,154 @@
+"""
+Per-host rate limiting for HTTPClient.
+
+Every host with a known limit gets a token bucket. Requests reserve a token
+and wait for their turn, so a burst of topics is spread at the rate the API
+accepts instead of hitting 403/429 and starting over. The buckets follow
+the server: X-RateLimit-Remaining / X-RateLimit-Reset spread the remaining
+quota until the reset, and Retry-After blocks the host until the given time.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# host -> (requests, per seconds), before any rate limit header is seen
+DEFAULT_LIMITS: Dict[str, Tuple[int, float]] = {
+    "api.github.com": (10, 60),  # search API without token: 10 requests per minute
+    "www.reddit.com": (10, 60),  # unauthenticated JSON listings
+    "export.arxiv.org": (1, 3),  # arXiv asks for one request every 3 seconds
+    "api.semanticscholar.org": (1, 1),  # shared pool without API key
+}
+
+
+class TokenBucket:
+    """
+    Token bucket where requests reserve their token in advance.
+    A negative token count means requests are already scheduled in the future.
+    """
+
+    def __init__(self, capacity: float, per_second: float):
+        self.capacity = max(1.0, capacity)
+        self.per_second = per_second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()  # may be in the future while the host is blocked
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+            self.updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """
+        Take one token, return the seconds to wait before sending the request.
+        When that is more than `max_wait` the request is refused: the token is not taken.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        deficit = max(0.0, 1.0 - self.tokens)
+        delay = max(0.0, self.updated - now) + deficit / self.per_second
+        if max_wait is not None and delay > max_wait:
+            return delay
+        # At most one refill window of debt
+        self.tokens = max(-self.capacity, self.tokens - 1)
+        return delay
+
+    def block_until(self, until: float):
+        """No request before `until` (monotonic time), then one right away"""
+        if until > self.updated:
+            self.updated = until
+            self.tokens = 1.0
+
+    def spread(self, remaining: float, reset_at: float):
+        """Server says `remaining` requests are left until `reset_at`: pace them evenly"""
+        now = time.monotonic()
+        if remaining < 1:
+            self.block_until(reset_at)
+            return
+        self._refill(now)
+        self.per_second = remaining / max(1.0, reset_at - now)
+        self.tokens = min(self.tokens, remaining)
+#end TokenBucket
+
+
+class RateLimiter:
+    """One TokenBucket per host, shared by every fetcher through http_client"""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, host: str, create: bool = False) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(host)
+        if bucket is None and (create or host in self.limits):
+            # Hosts without a known limit are only limited once they send rate limit headers
+            requests, seconds = self.limits.get(host, (10, 1))
+            bucket = TokenBucket(requests, requests / seconds)
+            self._buckets[host] = bucket
+        return bucket
+
+    def reserve(self, url: str, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve a request to the host of `url`, return the seconds to wait before sending it.
+        Nothing is reserved when the wait is over `max_wait`, see TokenBucket.reserve.
+        """
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            bucket = self._get_bucket(host)
+            return bucket.reserve(max_wait) if bucket else 0.0
+
+    def update(self, url: str, response):
+        """Adjust the host's bucket to the rate limit headers of a response"""
+        headers = response.headers
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        reset_at = _parse_reset(headers.get("X-RateLimit-Reset"))
+        if retry_after is None and remaining is None:
+            return
+
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            bucket = self._get_bucket(host, create=True)
+            if retry_after is not None:
+                bucket.block_until(retry_after)
+            elif reset_at is not None:
+                bucket.spread(remaining, reset_at)
+#end RateLimiter
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    X-RateLimit-Reset as monotonic time.
+    GitHub sends an epoch timestamp, Reddit the seconds left in the window.
+    """
+    reset = _parse_float(value)
+    if reset is None:
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return time.monotonic() + max(0.0, reset)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After (seconds or HTTP date) as monotonic time"""
+    if not value:
+        return None
+    seconds = _parse_float(value)
+    if seconds is None:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return time.monotonic() + max(0.0, seconds)
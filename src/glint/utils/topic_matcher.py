@@ -0,0 +1,68 @@
+"""
+Match fetched posts against every watched topic in one regex scan.
+
+A topic matches a text when its name starts a word of the text, ignoring
+case ("react" matches "reactjs" and "react-native"). All the names go into a
+single regex shaped as a trie ("react(?:js| native)?"), so each position of
+the text costs one step per character whatever the number of topics. Behind a
+lookahead, the scan reports the longest name starting at each word boundary;
+every shorter name starting there is a prefix of it.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+from glint.core.models import Topic
+
+
+class TopicMatcher:
+    def __init__(self, topics: Sequence[Topic]):
+        self.topics = list(topics)
+        names = {topic.name.lower() for topic in self.topics}
+        # name -> positions in self.topics of every topic whose name starts it
+        self._indexes_by_name: Dict[str, FrozenSet[int]] = {
+            name: frozenset(i for i, topic in enumerate(self.topics) if name.startswith(topic.name.lower()))
+            for name in names
+        }
+        self._pattern = re.compile(rf'\b(?=({_trie_pattern(names)}))') if names else None
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def _found(self, texts) -> Set[int]:
+        """Positions of the topics mentioned in one of the texts"""
+        names: Set[str] = set()
+        if self._pattern is not None:
+            for text in texts:
+                if text:
+                    names.update(self._pattern.findall(text.lower()))
+        return set().union(*(self._indexes_by_name[name] for name in names))
+
+    def matches(self, *texts: Optional[str]) -> List[Topic]:
+        """Every topic mentioned in one of the texts, in watch order"""
+        return [self.topics[i] for i in sorted(self._found(texts))]
+
+    def match(self, *texts: Optional[str]) -> Optional[Topic]:
+        """First watched topic mentioned in one of the texts"""
+        found = self._found(texts)
+        return self.topics[min(found)] if found else None
+#end TopicMatcher
+
+
+def _trie_pattern(names: Set[str]) -> str:
+    """Regex matching any of `names`, the longest one when several start at the same place"""
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}  # a name ends here
+    return _render(trie)
+
+
+def _render(node: dict) -> str:
+    branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Greedy: the continuation is tried first, so the longest name wins
+    return f"(?:{pattern})?" if "" in node else pattern
@@ -1,8 +1,18 @@
 
 """URL utilities for deduplication and normalization"""
 
+from functools import lru_cache
+from typing import Iterable, List
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term','utm_content',
+    'ref', 'source','campaign','fbclid','gclid','mc_cid','mc_eid',
+    'si', 'igsh', 'yclid', '_hsenc', '_hsmi', 'hsCtaTracking'
+})
+URL_CACHE_SIZE = 8192  # sources return the same stories fetch after fetch
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def normalize_url(url: str) -> str:
     """
     Normalize a URL to help detect duplicates
@@ -26,15 +36,10 @@ def normalize_url(url: str) -> str:
         #parse the URL into components
         #urlparse returns: ParseResult(scheme, netloc, path, params, query, fragment)
         parsed = urlparse(url)
-        query_params = parse_qs(parsed.query)
+        query_params = parse_qs(parsed.query) if parsed.query else {}
 
-        tracking_params = {
-            'utm_source', 'utm_medium', 'utm_campaign', 'utm_term','utm_content',
-            'ref', 'source','campaign','fbclid','gclid','mc_cid','mc_eid',
-            'si', 'igsh', 'yclid', '_hsenc', '_hsmi', 'hsCtaTracking'
-        }
         clean_params = {
-            k: v for k, v in query_params.items() if k.lower() not in tracking_params
+            k: v for k, v in query_params.items() if k.lower() not in TRACKING_PARAMS
         }
         #sorted query parameters
         clean_query = urlencode(sorted(clean_params.items()), doseq=True) if clean_params else ""
@@ -67,6 +72,20 @@ def normalize_url(url: str) -> str:
         #better to have duplicates than lose data
         return url
 
+def normalize_urls(urls: Iterable[str]) -> List[str]:
+    """
+    Normalize many URLs at once, each distinct URL is normalized once
+
+    Args:
+        urls: the URLs to normalize
+
+    Returns:
+        the normalized URLs, in the same order
+    """
+    urls = list(urls)
+    normalized = {url: normalize_url(url) for url in set(urls)}
+    return [normalized[url] for url in urls]
+
 def urls_are_equivalent(url1: str, url2:str) -> bool:
     """
     check if two URLS point to the same content
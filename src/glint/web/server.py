@@ -1,7 +1,7 @@
 from flask import Flask, render_template, redirect, request, jsonify
-from sqlmodel import Session, select
+from sqlmodel import Session, select, delete
 from glint.core.database import get_engine
-from glint.core.models import Trend, Topic, UserActivity
+from glint.core.models import Trend, TrendBand, Topic, UserActivity
 from datetime import datetime
 import webbrowser
 import threading
@@ -101,6 +101,8 @@ def delete_trend(trend_id):
         if not trend:
             return jsonify({"success": False, "error": "Trend not found"}), 404
             
+        # its near-duplicate index rows go with it
+        session.exec(delete(TrendBand).where(TrendBand.trend_id == trend.id))
         session.delete(trend)
         session.commit()
         return jsonify({"success": True})
@@ -122,12 +124,14 @@ def setup():
                 session.add(Topic(name=topic_name, is_active=True))
         session.commit()
     
-    # Run initial fetch
-    try:
-        from glint.cli.commands.fetch import fetch
-        fetch()
-    except Exception as e:
-        print(f"Fetch error: {e}")
+        # Run initial fetch
+        try:
+            from glint.core.parallel_fetcher import ParallelFetcher
+            from glint.core.pipeline import run_pipeline
+            all_topics = session.exec(select(Topic)).all()
+            run_pipeline(session, ParallelFetcher().fetch_all(all_topics), all_topics)
+        except Exception as e:
+            print(f"Fetch error: {e}")
     
     return redirect('/')
 
@@ -136,6 +140,8 @@ def show_help():
     return """
 Available Commands:
   fetch                Fetch latest trends from all sources
+  fetch --full         Refetch the whole window, ignoring watermarks
+  fetch --timings      Show the time spent in each pipeline stage
   status               Show current system status
   list                 List all watched topics
   add <topic>          Add a new topic to watch
@@ -190,7 +196,7 @@ def execute_command():
             add(topic_name=' '.join(args).lower())
         elif cmd_name == 'fetch':
             from glint.cli.commands.fetch import fetch
-            fetch()
+            fetch(full='--full' in args, timings='--timings' in args, deadline=None)
         elif cmd_name == 'list':
             from glint.cli.commands.topics import list_topics
             list_topics()
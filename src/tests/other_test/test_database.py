@@ -0,0 +1,72 @@
+"""Test the upgrade of databases created by older versions."""
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel, create_engine
+import glint.core.models  # noqa: F401 (registers the tables)
+from glint.core.database import upgrade_schema
+from glint.utils.fingerprint import minhash_signature, lsh_bands
+
+TITLE = "Show HN: a fast Rust compiler for embedded boards"
+
+
+def old_database():
+    """Trend table of the first releases: no unique indexes, no engagement columns"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE trend (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description VARCHAR,"
+            " url VARCHAR NOT NULL, url_normalized VARCHAR, content_fingerprint VARCHAR,"
+            " relevance_score FLOAT, status VARCHAR, source VARCHAR NOT NULL, category VARCHAR NOT NULL,"
+            " published_at DATETIME NOT NULL, fetched_at DATETIME NOT NULL, is_read BOOLEAN NOT NULL,"
+            " topic_id INTEGER)"
+        ))
+        conn.execute(text('CREATE INDEX "ix_trend_url_normalized" ON trend (url_normalized)'))
+        conn.execute(text('CREATE INDEX "ix_trend_content_fingerprint" ON trend (content_fingerprint)'))
+        conn.execute(text(
+            "CREATE TABLE useractivity (id INTEGER PRIMARY KEY, trend_id INTEGER NOT NULL,"
+            " clicked_at DATETIME NOT NULL, time_spent INTEGER)"
+        ))
+        for id, url, fingerprint in [(1, "https://a.com", "f1"), (2, "https://a.com", "f2"), (3, "https://b.com", "f1"),
+                                     (4, "https://c.com", None), (5, "https://d.com", None),
+                                     # stored before canonical URLs: two links to the same paper
+                                     (6, "https://arxiv.org/pdf/2312.12345v2", "f6"),
+                                     (7, "https://arxiv.org/abs/2312.12345", "f7")]:
+            conn.execute(text(
+                "INSERT INTO trend VALUES (:id, 'T', NULL, :url, :url, :fp, NULL, 'approved', 's', 'general',"
+                " '2024-01-01', '2024-01-01', 0, NULL)"
+            ), {"id": id, "url": url, "fp": fingerprint})
+        conn.execute(text("INSERT INTO useractivity VALUES (1, 2, '2024-01-02', 30)"))
+        conn.execute(text("INSERT INTO useractivity VALUES (2, 3, '2024-01-02', 10)"))
+        conn.execute(text("INSERT INTO useractivity VALUES (3, 7, '2024-01-02', 5)"))
+        # stored before near-duplicate detection: no signature, no bands
+        conn.execute(text("UPDATE trend SET title = :title WHERE id = 4"), {"title": TITLE})
+    return engine
+
+
+def test_upgrade_collapses_duplicates():
+    """Duplicates are deleted, keeping the oldest row, and activity follows the kept row"""
+    engine = old_database()
+    SQLModel.metadata.create_all(engine)
+    assert upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(text("SELECT id FROM trend ORDER BY id"))]
+        activity = [row[0] for row in conn.execute(text("SELECT trend_id FROM useractivity ORDER BY id"))]
+        paper = conn.execute(text("SELECT url_normalized FROM trend WHERE id = 6")).scalar()
+        signatures = dict(conn.execute(text("SELECT id, minhash FROM trend")).all())
+        bands = conn.execute(text("SELECT trend_id, key FROM trendband ORDER BY id")).all()
+    # 2 shares the URL of 1, 3 the fingerprint of 1; NULL fingerprints are not duplicates;
+    # 7 is the same paper as 6 once both URLs are canonical
+    assert ids == [1, 4, 5, 6]
+    assert activity == [1, 1, 6]
+    assert paper == "https://arxiv.org/abs/2312.12345"
+    # Near-duplicate index built for the stored trends, titles too short to compare are skipped
+    assert signatures == {1: None, 4: minhash_signature(TITLE), 5: None, 6: None}
+    assert bands == [(4, key) for key in lsh_bands(signatures[4])]
+    assert not upgrade_schema(engine)  # data migrations run once
+
+    inspector = inspect(engine)
+    assert "points" in {column["name"] for column in inspector.get_columns("trend")}
+    assert inspector.has_table("trendband")
+    unique = {index["name"] for index in inspector.get_indexes("trend") if index["unique"]}
+    assert {"ix_trend_url_normalized", "ix_trend_content_fingerprint"} <= unique
+    print(f"✓ Upgrade passed: kept {ids}, activity on {activity}")
@@ -1,6 +1,7 @@
 """Test content fingerprinting."""
 from glint.utils.fingerprint import (
     generate_fingerprint,
+    generate_fingerprints,
     extract_core_terms,
     fingerprints_match
 )
@@ -69,5 +70,21 @@ def test_fingerprinting():
     # Note: Exact matching depends on term extraction, but they should be similar
     
     print("\n All tests passed!")
+
+
+def test_batch_fingerprints():
+    """The batch variant returns what generate_fingerprint returns item by item"""
+    items = [
+        ("Python 3.13 Released", "See https://python.org/3.13 for details"),
+        ("Multi\nline title v1.2.3", None),
+        ("The", ""),
+        ("!!!", "1.0\n2.0"),
+        ("Rust 2.0 announced", "Score: 42 by someone"),
+    ]
+    assert generate_fingerprints(items) == [generate_fingerprint(title, description) for title, description in items]
+    assert generate_fingerprints([]) == []
+    print("✓ Batch fingerprints match")
+
+
 if __name__ == "__main__":
     test_fingerprinting()
@@ -0,0 +1,211 @@
+"""Test the Hacker News strategies against a local stub server."""
+import json
+import tempfile
+import threading
+from datetime import datetime
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from sqlmodel import SQLModel, Session, create_engine, select
+from glint.core.models import HackerNewsItem, Topic
+from glint.sources.hackernews import HackerNewsFetcher
+from glint.utils.http_cache import HTTPCache
+from glint.utils.http_client import http_client
+
+HITS = [
+    {"title": "Rust 2.0 is out", "url": "https://blog.rust-lang.org/2", "author": "steve",
+     "points": 320, "created_at_i": 1760000000},
+    # Matched by the search engine on another field, not by our topic matcher
+    {"title": "A new linker", "url": "https://example.com/linker", "author": "bob",
+     "points": 40, "created_at_i": 1760000100},
+    # Ask HN without a link
+    {"title": "Ask HN: Rust jobs?", "url": None, "author": "alice",
+     "points": 12, "created_at_i": 1760000200},
+]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        StubHandler.requests.append(self.path)
+        body = json.dumps({"hits": HITS}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def use_temporary_http_cache():
+    """Point the shared http_client at a throwaway HTTP cache, not ~/.glint/http_cache.db"""
+    directory = tempfile.TemporaryDirectory()
+    previous_cache = http_client.cache
+    http_client.cache = HTTPCache(path=Path(directory.name) / "http_cache.db")
+    return directory, previous_cache
+
+
+def test_hackernews_search():
+    """One search_by_date request per topic, hits turned into Trends"""
+    server = HTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    directory, previous_cache = use_temporary_http_cache()
+    try:
+        fetcher = HackerNewsFetcher()
+        fetcher.search_url = f"http://127.0.0.1:{server.server_port}/api/v1"
+        fetcher.backfill = True  # ignore stored watermarks
+        topic = Topic(id=7, name="rust")
+
+        url, params = fetcher._build_search(topic)
+        trends = fetcher._parse_search(fetcher.http.get(url, params=params), topic)
+
+        assert len(StubHandler.requests) == 1
+        request = urlsplit(StubHandler.requests[0])
+        query = parse_qs(request.query)
+        assert request.path == "/api/v1/search_by_date"
+        assert query["query"] == ["rust"]
+        assert query["numericFilters"][0].startswith("created_at_i>")
+        print("✓ Search request passed")
+
+        assert [trend.url for trend in trends] == ["https://blog.rust-lang.org/2"]
+        assert trends[0].topic_id == 7
+        assert trends[0].description == "Score: 320 by steve"
+        assert trends[0].published_at == datetime.utcfromtimestamp(1760000000)
+        print("✓ Search hits passed")
+    finally:
+        http_client.cache = previous_cache
+        directory.cleanup()
+        server.shutdown()
+
+
+def test_hackernews_strategy():
+    """Few topics: search per topic, many topics: scan the top stories"""
+    fetcher = HackerNewsFetcher()
+    fetcher.strategy = "auto"
+    fetcher.search_max_topics = 2
+    few = [Topic(id=1, name="rust")]
+    many = [Topic(id=i, name=f"topic{i}") for i in range(5)]
+    assert fetcher._use_search(few)
+    assert not fetcher._use_search(many)
+    fetcher.strategy = "top"
+    assert not fetcher._use_search(few)
+    print("✓ Strategy selection passed")
+
+
+ITEMS = {
+    1: {"id": 1, "title": "Rust in the kernel", "url": "https://example.com/rust", "by": "linus", "time": 1760000000},
+    2: {"id": 2, "title": "A new linker", "url": "https://example.com/linker", "by": "bob", "time": 1760000100},
+    3: {"id": 3, "title": "Ask HN: Rust jobs?", "by": "alice", "time": 1760000200},
+}
+
+
+class FirebaseHandler(BaseHTTPRequestHandler):
+    """Top stories and items, each item scoring one more point every time it is requested"""
+    requests = []
+    scores = {}
+    failing = set()  # item ids answered with a 500
+
+    def do_GET(self):
+        FirebaseHandler.requests.append(self.path)
+        if self.path == "/v0/topstories.json":
+            data = list(ITEMS)
+        else:
+            item_id = int(self.path.rsplit("/", 1)[1].split(".")[0])
+            if item_id in FirebaseHandler.failing:
+                self.send_response(500)
+                self.end_headers()
+                return
+            FirebaseHandler.scores[item_id] = FirebaseHandler.scores.get(item_id, 0) + 1
+            data = dict(ITEMS[item_id], score=FirebaseHandler.scores[item_id])
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_hackernews_item_cache():
+    """Cached items are not requested again, matching stories only once score_ttl has passed"""
+    server = HTTPServer(("127.0.0.1", 0), FirebaseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    directory, previous_cache = use_temporary_http_cache()
+    try:
+        fetcher = HackerNewsFetcher()
+        fetcher.base_url = f"http://127.0.0.1:{server.server_port}/v0"
+        fetcher.strategy = "top"
+        fetcher._engine = engine
+        fetch = HackerNewsFetcher.fetch.__wrapped__  # bypass the 3 minutes result cache
+        topics = [Topic(id=7, name="rust")]
+
+        def item_requests():
+            requested = [path for path in FirebaseHandler.requests if path.startswith("/v0/item/")]
+            FirebaseHandler.requests.clear()
+            return sorted(requested)
+
+        trends = fetch(fetcher, topics)
+        assert item_requests() == ["/v0/item/1.json", "/v0/item/2.json", "/v0/item/3.json"]
+        assert [(trend.url, trend.points) for trend in trends] == [("https://example.com/rust", 1)]
+        # naive UTC on both strategies, whatever the local timezone
+        assert trends[0].published_at == datetime.utcfromtimestamp(ITEMS[1]["time"])
+        print("✓ First fetch requested every item")
+
+        trends = fetch(fetcher, topics)
+        assert item_requests() == []
+        assert trends[0].points == 1
+        print("✓ Cached items not requested again")
+
+        # The score of the matching story goes stale, the others never do
+        with Session(engine) as session:
+            for item in session.exec(select(HackerNewsItem)).all():
+                item.score_fetched_at = datetime.utcnow() - fetcher.score_ttl
+                session.add(item)
+            session.commit()
+        trends = fetch(fetcher, topics)
+        assert item_requests() == ["/v0/item/1.json"]
+        assert trends[0].points == 2
+        print("✓ Stale score of the matching story refreshed")
+    finally:
+        http_client.cache = previous_cache
+        directory.cleanup()
+        server.shutdown()
+
+
+def test_hackernews_failed_item():
+    """An item request failing does not lose the items fetched with it"""
+    server = HTTPServer(("127.0.0.1", 0), FirebaseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    directory, previous_cache = use_temporary_http_cache()
+    FirebaseHandler.requests.clear()
+    FirebaseHandler.failing = {1}
+    try:
+        fetcher = HackerNewsFetcher()
+        fetcher.base_url = f"http://127.0.0.1:{server.server_port}/v0"
+        fetcher.strategy = "top"
+        fetcher._engine = engine
+        fetch = HackerNewsFetcher.fetch.__wrapped__
+        topics = [Topic(id=7, name="rust"), Topic(id=8, name="linker")]
+
+        trends = fetch(fetcher, topics)
+        assert [trend.url for trend in trends] == ["https://example.com/linker"]
+        print("✓ Items fetched next to a failed one kept")
+
+        FirebaseHandler.failing = set()
+        FirebaseHandler.requests.clear()
+        trends = fetch(fetcher, topics)
+        assert [path for path in FirebaseHandler.requests if path.startswith("/v0/item/")] == ["/v0/item/1.json"]
+        assert [trend.url for trend in trends] == ["https://example.com/rust", "https://example.com/linker"]
+        print("✓ Failed item requested again on the next fetch")
+    finally:
+        FirebaseHandler.failing = set()
+        http_client.cache = previous_cache
+        directory.cleanup()
+        server.shutdown()
@@ -0,0 +1,129 @@
+"""Test the on-disk HTTP response cache."""
+import json
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+import requests
+from sqlmodel import SQLModel, create_engine
+from glint.core.fetch_state import FetchStateStore
+from glint.sources.github import GitHubFetcher
+from glint.utils import http_client
+from glint.utils.http_cache import HTTPCache
+
+
+def make_response(body: bytes, headers: dict, status: int = 200):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response._content = body
+    return response
+
+
+def test_http_cache_freshness():
+    """Cache-Control decides what is stored and for how long"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HTTPCache(path=Path(directory) / "http_cache.db")
+        url = "https://api.example.com/items?page=1"
+
+        assert cache.store(url, {}, make_response(b'{"a": 1}', {"Cache-Control": "max-age=60"}))
+        cached = cache.lookup(url, {})
+        assert cached.is_fresh()
+        assert cached.to_response().json() == {"a": 1}
+        print("✓ Fresh response served from cache")
+
+        # Revalidated on every use, but kept for its validator
+        assert cache.store(url, {}, make_response(b"{}", {"Cache-Control": "no-cache", "ETag": '"v2"'}))
+        cached = cache.lookup(url, {})
+        assert not cached.is_fresh()
+        assert cached.validators() == {"If-None-Match": '"v2"'}
+        print("✓ no-cache response kept for revalidation")
+
+        assert not cache.store(url + "2", {}, make_response(b"{}", {"Cache-Control": "no-store, max-age=60"}))
+        assert not cache.store(url + "3", {}, make_response(b"{}", {}))  # nothing to reuse it with
+        assert cache.lookup(url + "2", {}) is None
+        print("✓ Uncacheable responses skipped")
+
+
+def test_http_cache_vary_and_eviction():
+    """Vary selects the request headers, the least recently used entries go first"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = HTTPCache(path=Path(directory) / "http_cache.db", max_bytes=2500)
+        headers = {"Cache-Control": "max-age=60", "Vary": "Authorization"}
+        cache.store("https://a/1", {"Authorization": "token x"}, make_response(b"1", headers))
+        assert cache.lookup("https://a/1", {"Authorization": "token x"}) is not None
+        assert cache.lookup("https://a/1", {}) is None
+        print("✓ Vary honored")
+
+        for i in range(3):
+            # ~1 KB compressed each
+            cache.store(f"https://b/{i}", {}, make_response(os.urandom(1000), {"Cache-Control": "max-age=60"}))
+            cache.lookup(f"https://b/{i}", {})
+        assert cache.stats()["bytes"] <= 2500
+        assert cache.lookup("https://b/2", {}) is not None
+        assert cache.lookup("https://b/0", {}) is None
+        print(f"✓ LRU eviction passed: {cache.stats()}")
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """GitHub search answering 304 to a request carrying the current ETag"""
+    etag = '"v1"'
+    item = {
+        "id": 1, "full_name": "octo/repo", "html_url": "https://github.com/octo/repo",
+        "description": "A repo", "stargazers_count": 100, "forks_count": 10, "open_issues_count": 1,
+        "language": "Python", "topics": [], "created_at": "2024-01-01T00:00:00Z",
+    }
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+        body = json.dumps({"items": [self.item]}).encode()
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_not_modified_keeps_validators():
+    """A 304 produces no trends and leaves the stored validators as they were"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    search_url = f"http://127.0.0.1:{server.server_address[1]}/search/repositories"
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    store = FetchStateStore()
+    store._engine = engine
+    previous = http_client.fetch_state, http_client.http_client.cache
+    with tempfile.TemporaryDirectory() as directory:
+        http_client.fetch_state = store
+        http_client.http_client.cache = HTTPCache(path=Path(directory) / "http_cache.db")
+        try:
+            fetcher = GitHubFetcher()
+            fetcher._search_url = lambda query: search_url
+            token = store.begin()
+            with store.staging(token):
+                assert [trend.title for trend in fetcher._fetch_single_topic(None)] == ["octo/repo"]
+            store.commit(token)
+            assert store.get_validators(fetcher.name, "*", search_url) == ('"v1"', None)
+            print("✓ First fetch stored its validators")
+
+            token = store.begin()
+            with store.staging(token):
+                assert fetcher._fetch_single_topic(None) == []
+            store.commit(token)
+            reloaded = FetchStateStore()
+            reloaded._engine = engine
+            assert reloaded.get_validators(fetcher.name, "*", search_url) == ('"v1"', None)
+            print("✓ 304 produced no trends, validators kept")
+        finally:
+            http_client.fetch_state, http_client.http_client.cache = previous
+            server.shutdown()
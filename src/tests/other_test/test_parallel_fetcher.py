@@ -0,0 +1,264 @@
+"""Test the parallel fetch: its deadline, the results arriving after it and the in-flight cap."""
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from sqlmodel import SQLModel, create_engine
+from glint.core.fetch_state import FetchStateStore
+from glint.core.models import Topic, TrendRecord
+from glint.core import parallel_fetcher
+from glint.core.parallel_fetcher import ParallelFetcher
+from glint.sources.base import BaseFetcher
+from glint.utils.daemon_executor import DaemonThreadPoolExecutor
+from glint.utils.http_cache import HTTPCache
+from glint.utils.http_client import InFlightLimiter
+
+
+class FakeFetcher:
+    """Source answering `trends` after `delay` seconds"""
+    def __init__(self, delay, trends):
+        self.name = type(self).__name__.lower()
+        self.delay = delay
+        self.trends = trends
+
+    def fetch(self, topics):
+        time.sleep(self.delay)
+        return self.trends
+
+
+def coordinator(*fetchers):
+    coordinator = ParallelFetcher(deadline=0.3)
+    coordinator.fetchers = list(fetchers)
+    return coordinator
+
+
+def test_deadline_and_late_results():
+    """A slow source is abandoned at the deadline, the next fetch yields its result"""
+    Quick = type("Quick", (FakeFetcher,), {})
+    Slow = type("Slow", (FakeFetcher,), {})
+
+    first = coordinator(Quick(0, ["quick"]), Slow(0.8, ["slow"]))
+    start = time.monotonic()
+    assert list(first.fetch_all([])) == [["quick"]]
+    assert time.monotonic() - start < 0.6
+    assert first.timed_out == ["Slow"]
+
+    # Still running: not restarted, but reported
+    second = coordinator(Slow(0, ["restarted"]))
+    assert list(second.fetch_all([])) == []
+    assert second.timed_out == ["Slow"]
+
+    # Finished since: another fetcher of the process yields it first
+    time.sleep(0.8)
+    third = coordinator(Quick(0, ["quick"]))
+    assert list(third.fetch_all([])) == [["slow"], ["quick"]]
+    assert third.timed_out == []
+    assert list(coordinator().fetch_all([])) == []  # handed over once
+    print("✓ Deadline passed: slow sources abandoned, their results kept for the next fetch")
+
+
+def test_abandoned_source_does_not_delay_exit():
+    """A fetch command exits at its deadline, not when its slowest source finishes"""
+    script = textwrap.dedent("""
+        import time
+        from glint.core.parallel_fetcher import ParallelFetcher
+
+        class Stuck:
+            def fetch(self, topics):
+                time.sleep(30)
+                return []
+
+        coordinator = ParallelFetcher(deadline=0.2)
+        coordinator.fetchers = [Stuck()]
+        list(coordinator.fetch_all([]))
+    """)
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=20)
+    assert time.monotonic() - start < 15
+    print(f"✓ Exit passed: {time.monotonic() - start:.1f}s with a source stuck for 30s")
+
+
+def test_fetch_state_stored_after_commit():
+    """Watermarks and validators are stored only once the consumer committed the trends"""
+    class Watermarked(FakeFetcher):
+        def fetch(self, topics):
+            state = parallel_fetcher.fetch_state
+            # from a topic worker thread, like BaseFetcher.fetch_all
+            with DaemonThreadPoolExecutor(1) as executor:
+                executor.submit(state.set_cursor, self.name, "python", self.trends[0]).result()
+            state.save_validators(self.name, "python", "https://api", '"v1"', None)
+            with state.staging(None):  # like a background cache refresh
+                state.set_cursor(self.name, "rust", self.trends[0])
+            return self.trends
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    store = FetchStateStore()
+    store._engine = engine
+    previous, parallel_fetcher.fetch_state = parallel_fetcher.fetch_state, store
+    try:
+        fetcher = Watermarked(0, ["2024-01-02"])
+        with_error = coordinator(fetcher).fetch_all([])
+        assert next(with_error) == ["2024-01-02"]
+        with_error.close()  # the consumer failed to commit them
+        assert store.get_cursor("watermarked", "python") is None
+        print("✓ Nothing stored when the trends were not committed")
+
+        assert list(coordinator(fetcher).fetch_all([])) == [["2024-01-02"]]
+        reloaded = FetchStateStore()
+        reloaded._engine = engine
+        assert reloaded.get_cursor("watermarked", "python") == "2024-01-02"
+        assert reloaded.get_validators("watermarked", "python", "https://api") == ('"v1"', None)
+        assert reloaded.get_cursor("watermarked", "rust") is None
+        print("✓ Stored once the consumer asked for the next batch, not what a refresh set")
+
+        # Two fetches of the same source at once: each one stores or drops only its own state
+        failing = coordinator(Watermarked(0, ["2024-01-03"])).fetch_all([])
+        succeeding = coordinator(Watermarked(0, ["2024-01-04"])).fetch_all([])
+        assert next(failing) == ["2024-01-03"]
+        assert next(succeeding) == ["2024-01-04"]
+        failing.close()
+        assert list(succeeding) == []
+        reloaded = FetchStateStore()
+        reloaded._engine = engine
+        assert reloaded.get_cursor("watermarked", "python") == "2024-01-04"
+        print("✓ Concurrent fetches of one source kept apart")
+    finally:
+        parallel_fetcher.fetch_state = previous
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers after 50ms, recording the most requests it served at once"""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.in_flight += 1
+            SlowHandler.peak = max(SlowHandler.peak, SlowHandler.in_flight)
+        time.sleep(0.05)
+        with SlowHandler.lock:
+            SlowHandler.in_flight -= 1
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(self.path.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class StubFetcher(BaseFetcher):
+    """Source requesting one page per topic, through BaseFetcher.fetch_all()"""
+    base_url = ""
+
+    def fetch(self, topics):
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic):
+        response = self.http.get(f"{self.base_url}/{self.name}/{topic.name}")
+        return [TrendRecord(title=topic.name, description="", url=response.text, source="Stub", category="test")]
+
+
+def test_max_in_flight_caps_requests():
+    """max_in_flight caps the requests of every source and topic worker together"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubFetcher.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    OtherStubFetcher = type("OtherStubFetcher", (StubFetcher,), {})
+    # a throwaway HTTP cache, not ~/.glint/http_cache.db
+    directory = tempfile.TemporaryDirectory()
+    previous_cache = parallel_fetcher.http_client.cache
+    parallel_fetcher.http_client.cache = HTTPCache(path=Path(directory.name) / "http_cache.db")
+    try:
+        coordinator = ParallelFetcher(max_in_flight=2, deadline=10)
+        coordinator.fetchers = [StubFetcher(), OtherStubFetcher()]
+        topics = [Topic(id=i, name=f"topic{i}") for i in range(6)]
+        batches = list(coordinator.fetch_all(topics))
+
+        urls = sorted(trend.url for batch in batches for trend in batch)
+        assert len(batches) == 2 and len(urls) == 12
+        assert urls[0] == "/otherstub/topic0" and urls[-1] == "/stub/topic5"
+        # 2 sources x 5 topic workers, but never more than 2 requests at once
+        assert SlowHandler.peak == 2
+        print(f"✓ In-flight cap passed: {len(urls)} trends, at most {SlowHandler.peak} requests in flight")
+    finally:
+        server.shutdown()
+        parallel_fetcher.http_client.set_max_in_flight(16)
+        parallel_fetcher.http_client.cache = previous_cache
+        directory.cleanup()
+
+
+class SlowTopicFetcher(BaseFetcher):
+    """Source whose "slow" topic never answers in time"""
+    def fetch(self, topics):
+        return self.fetch_all(topics)
+
+    def _fetch_single_topic(self, topic):
+        if topic.name == "slow":
+            time.sleep(2)
+        return [TrendRecord(title=topic.name, description="", url=f"https://example.com/{topic.name}",
+                            source="Stub", category="test")]
+
+
+def test_topic_timeout():
+    """A topic running longer than topic_timeout is abandoned, the other topics are kept in order"""
+    fetcher = SlowTopicFetcher()
+    fetcher.max_workers = 2
+    fetcher.topic_timeout = 0.3
+    topics = [Topic(id=i, name=name) for i, name in enumerate(["rust", "slow", "go", "zig"])]
+    start = time.monotonic()
+    trends = fetcher.fetch(topics)
+    assert time.monotonic() - start < 1.5
+    assert [trend.title for trend in trends] == ["rust", "go", "zig"]
+    print(f"✓ Topic timeout passed: slow topic abandoned after {time.monotonic() - start:.1f}s")
+
+
+def test_resized_limit_holds():
+    """Requests holding the limiter count against a new limit, a larger one lets waiting requests go"""
+    limiter = InFlightLimiter(2)
+    peak, in_flight, lock = [0], [0], threading.Lock()
+
+    def request(release):
+        with limiter:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            release.wait()
+            with lock:
+                in_flight[0] -= 1
+
+    first = threading.Event()
+    holders = [threading.Thread(target=request, args=(first,)) for _ in range(2)]
+    for thread in holders:
+        thread.start()
+    time.sleep(0.05)
+    limiter.resize(3)  # one more slot, not three
+    second = threading.Event()
+    waiters = [threading.Thread(target=request, args=(second,)) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    time.sleep(0.1)
+    assert in_flight[0] == 3
+
+    first.set()
+    time.sleep(0.1)
+    assert in_flight[0] == 3  # the two released slots went to the waiting requests
+    second.set()
+    for thread in holders + waiters:
+        thread.join(timeout=1)
+    assert peak[0] == 3 and in_flight[0] == 0
+    print(f"✓ Resize passed: at most {peak[0]} requests held the limiter")
+
+
+if __name__ == "__main__":
+    test_deadline_and_late_results()
+    test_abandoned_source_does_not_delay_exit()
+    test_fetch_state_stored_after_commit()
+    test_max_in_flight_caps_requests()
+    test_topic_timeout()
+    test_resized_limit_holds()
@@ -0,0 +1,223 @@
+"""Test the ingestion pipeline."""
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlmodel import SQLModel, Session, create_engine, select
+from glint.core.models import Trend, TrendRecord, Topic
+from glint.core import pipeline
+from glint.core.parse_clock import timed_parse
+from glint.core.pipeline import run_pipeline
+from glint.core.seen_filter import SeenFilter
+
+
+def make_trend(title, url, topic_id=1):
+    return TrendRecord(
+        title=title,
+        description="",
+        url=url,
+        source="Test",
+        published_at=datetime(2024, 1, 1),
+        topic_id=topic_id
+    )
+
+
+def test_pipeline_dedup():
+    """Copies in a chunk are merged, stored duplicates dropped by URL then by fingerprint"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+
+    with Session(engine) as session:
+        stored = Trend(**make_trend("Rust 2.0 announced", "https://example.com/rust").to_row())
+        stored.url_normalized = "https://example.com/rust"
+        session.add(stored)
+        session.commit()
+
+        batches = [
+            [
+                make_trend("Python 3.13 Released", "https://example.com/py"),
+                # Same URL as the previous trend, tracking params removed
+                make_trend("Python 3.13 Released", "https://example.com/py?utm_source=hn"),
+            ],
+            [
+                # Already stored
+                make_trend("Rust 2.0 announced", "https://example.com/rust"),
+                # Same content under another URL
+                make_trend("Python 3.13 is Released!", "https://other.com/python-313"),
+                make_trend("Go 1.23 generics", "https://example.com/go"),
+            ],
+        ]
+        result = run_pipeline(session, batches, [topic], chunk_size=2)
+
+        assert result.fetched == 5
+        assert result.added == 2
+        assert result.merged == 1
+        assert result.dropped_by_url == 1
+        assert result.dropped_by_fingerprint == 1
+        assert result.updated == 2
+        assert result.stages["normalize"].items_in == 5
+        assert result.stages["dedup"].items_out == 2
+        assert result.stages["commit"].items_out == 2
+        print(f"✓ Dedup passed: {result.added} added, "
+              f"{result.dropped_by_url} by URL, {result.dropped_by_fingerprint} by fingerprint")
+
+
+def test_pipeline_dedup_across_chunks():
+    """The IN (...) lookups keep one row per URL, over chunks and over split lookups"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+    titles = ["Python packaging", "Rust async traits", "Go generics", "Zig comptime",
+              "Kotlin coroutines", "Swift macros", "Elixir releases"]
+    urls = [f"https://example.com/{i}" for i in range(len(titles))]
+
+    previous, pipeline.IN_QUERY_SIZE = pipeline.IN_QUERY_SIZE, 3  # several IN (...) queries per lookup
+    try:
+        with Session(engine) as session:
+            batch = [make_trend(title, url) for title, url in zip(titles, urls)]
+            first = run_pipeline(session, [batch], [topic], chunk_size=2)
+            # Same URLs reworded, tracking parameters added, in other chunks and another run
+            again = [make_trend(f"{title} explained", url + "?utm_source=x") for title, url in zip(titles, urls)]
+            second = run_pipeline(session, [again[:4], again[4:]], [topic], chunk_size=3)
+            stored = session.exec(select(Trend.url_normalized)).all()
+    finally:
+        pipeline.IN_QUERY_SIZE = previous
+
+    assert first.added == 7 and first.chunks == 4
+    assert second.added == 0 and second.dropped_by_url == 7
+    assert sorted(stored) == sorted(urls)
+    print(f"✓ Dedup across chunks passed: {len(stored)} rows for {len(urls)} URLs")
+
+
+def test_pipeline_commits_each_source():
+    """A source's trends are committed before a slower source answers"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+    committed_before_slow_source = []
+
+    def sources():
+        yield [make_trend("Python 3.13 Released", "https://example.com/py")]
+        with Session(engine) as reader:
+            committed_before_slow_source.extend(reader.exec(select(Trend.url)).all())
+        yield [make_trend("Go 1.23 generics", "https://example.com/go")]
+
+    with Session(engine) as session:
+        result = run_pipeline(session, sources(), [topic])
+
+    assert committed_before_slow_source == ["https://example.com/py"]
+    assert result.added == 2 and result.chunks == 2
+    print("✓ Each source committed as it arrives")
+
+
+def test_pipeline_parse_stage():
+    """Time the sources spend parsing is its own stage, inside the fetch wait"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+
+    @timed_parse
+    def parse(response):
+        time.sleep(0.05)
+        return [make_trend(response, f"https://example.com/{response}")]
+
+    def sources():
+        yield parse("python")
+        yield parse("rust")
+
+    with Session(engine) as session:
+        result = run_pipeline(session, sources(), [topic])
+
+    parse_stage = result.stages["parse"]
+    assert parse_stage.seconds >= 0.1 and parse_stage.items_in == 2
+    assert result.stages["fetch"].seconds >= parse_stage.seconds
+    assert result.total_seconds == sum(
+        stage.seconds for name, stage in result.stages.items() if name != "parse"
+    )
+    print(f"✓ Parse stage passed: {parse_stage.seconds:.3f}s over {parse_stage.items_in} responses")
+
+
+def test_pipeline_merges_sources():
+    """A story posted on two sources is stored once, with the engagement of both"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+
+    def posted(source, points, comments):
+        trend = make_trend("Python 3.13 Released", "https://example.com/py")
+        return TrendRecord(trend.title, "", trend.url, source, published_at=trend.published_at,
+                           topic_id=1, points=points, comments=comments)
+
+    with Session(engine) as session:
+        result = run_pipeline(session, [[posted("Hacker News", 120, 40), posted("Reddit", 80, 25)]], [topic])
+        assert result.added == 1
+        assert result.merged == 1
+
+        # Seen again on Hacker News: its numbers are refreshed, not added twice
+        result = run_pipeline(session, [[posted("Hacker News", 150, 60)]], [topic])
+        assert result.added == 0
+        assert result.updated == 1
+
+        row = session.exec(select(Trend)).one()
+        assert json.loads(row.sources) == {"Hacker News": [150, 60], "Reddit": [80, 25]}
+        assert row.points == 230
+        assert row.comments == 85
+        print(f"✓ Sources merged: {row.sources}")
+
+
+def test_pipeline_near_duplicates():
+    """Reworded cross-posts are dropped through the LSH band index"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="cli", is_active=True)
+
+    with Session(engine) as session:
+        first = run_pipeline(session, [[
+            make_trend("Show HN: Glint, a local-first tech watch CLI", "https://news.ycombinator.com/item?id=1"),
+        ]], [topic])
+        assert first.added == 1
+
+        result = run_pipeline(session, [[
+            make_trend("I built Glint - a local-first tech watch CLI for developers", "https://reddit.com/r/python/1"),
+            make_trend("A local-first CLI to watch tech trends, Glint", "https://dev.to/glint"),
+            make_trend("Rust 2.0 announced with async closures", "https://example.com/rust"),
+        ]], [topic], similarity_threshold=0.7)
+        assert result.dropped_as_near_duplicate == 2
+        assert result.added == 1
+        print(f"✓ Near-duplicates dropped: {result.dropped_as_near_duplicate}")
+
+        disabled = run_pipeline(session, [[
+            make_trend("I made Glint: local-first tech watch CLI", "https://lobste.rs/glint"),
+        ]], [topic], similarity_threshold=1.1)
+        assert disabled.added == 1
+        print("✓ A threshold above 1 turns near-duplicate detection off")
+
+
+def test_pipeline_seen_filter():
+    """New trends skip the SQL probes, duplicates are still caught"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    topic = Topic(id=1, name="python", is_active=True)
+    batch = [
+        make_trend("Python 3.13 Released", "https://example.com/py"),
+        make_trend("Rust 2.0 announced", "https://example.com/rust"),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory, Session(engine) as session:
+        path = Path(directory) / "seen.bloom"
+        first = run_pipeline(session, [batch], [topic], seen_filter=SeenFilter(path))
+        assert first.added == 2
+        assert first.probes_skipped == 4  # 2 URLs + 2 fingerprints, none stored yet
+        print(f"✓ {first.probes_skipped} lookups skipped for new trends")
+
+        # A fresh process loads the saved filter
+        again = [make_trend(trend.title, trend.url) for trend in batch]
+        again.append(make_trend("Go 1.23 generics", "https://example.com/go"))
+        second = run_pipeline(session, [again], [topic], seen_filter=SeenFilter(path))
+        assert second.dropped_by_url == 2
+        assert second.added == 1
+        assert second.probes_skipped == 2
+        assert [file.name for file in Path(directory).iterdir()] == ["seen.bloom"]  # no temporary left
+        print("✓ Saved filter reloaded, duplicates still probed and dropped")
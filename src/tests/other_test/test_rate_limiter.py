@@ -0,0 +1,56 @@
+"""Test the per-host rate limiter."""
+import time
+from glint.utils.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_token_bucket():
+    """Requests beyond the burst are scheduled at the refill rate"""
+    bucket = TokenBucket(capacity=2, per_second=10)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[0] == 0 and delays[1] == 0
+    assert 0.05 < delays[2] <= 0.1
+    assert 0.15 < delays[3] <= 0.2
+    print(f"✓ Token bucket passed: {[round(d, 2) for d in delays]}")
+
+
+def test_rate_limit_headers():
+    """Retry-After blocks the host, hosts without limit or headers are not limited"""
+    limiter = RateLimiter(limits={})
+    url = "https://api.example.com/items"
+    assert limiter.reserve(url) == 0.0
+
+    limiter.update(url, FakeResponse({"Retry-After": "5"}))
+    assert 4 < limiter.reserve(url) <= 5
+
+    # Exhausted quota: wait until the reset
+    limiter.update(url, FakeResponse({
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(int(time.time()) + 20)
+    }))
+    assert limiter.reserve(url) > 15
+    assert limiter.reserve("https://other.example.com/") == 0.0
+    print("✓ Rate limit headers passed")
+
+
+def test_refused_requests_do_not_lock_the_host():
+    """Requests refused for waiting too long take no token, the host recovers after a window"""
+    bucket = TokenBucket(capacity=10, per_second=10 / 60)  # GitHub search without token
+    allowed = sum(1 for _ in range(150) if bucket.reserve(max_wait=30) <= 30)
+    assert allowed == 15  # the burst, then 30 seconds of refill
+    assert bucket.tokens > -6
+
+    # One refill window later the quota is back
+    bucket.updated -= 60
+    allowed = sum(1 for _ in range(150) if bucket.reserve(max_wait=30) <= 30)
+    assert allowed >= 10
+
+    # Without a limit on the wait the debt stays within one window
+    for _ in range(100):
+        bucket.reserve()
+    assert bucket.tokens >= -bucket.capacity
+    print(f"✓ Refusals passed: {allowed} allowed after the window")
@@ -0,0 +1,33 @@
+"""Test matching posts against the watched topics."""
+from glint.core.models import Topic
+from glint.utils.topic_matcher import TopicMatcher
+
+
+def test_topic_matcher():
+    """Every topic starting a word of the title or text matches, in watch order"""
+    topics = [
+        Topic(id=1, name="Rust"),
+        Topic(id=2, name="React Native"),
+        Topic(id=3, name="react"),
+        Topic(id=4, name="C++"),
+        Topic(id=5, name="go"),
+    ]
+    matcher = TopicMatcher(topics)
+
+    # Prefix of a word, case ignored: "react" matches "ReactJS"
+    assert matcher.match("Why we moved to ReactJS") is topics[2]
+    # "react native" and "react" start at the same place, both match
+    assert matcher.matches("Shipping with React Native") == [topics[1], topics[2]]
+    # The text counts too, and names with symbols match as written
+    assert matcher.matches("Weekly digest", "Modern C++ and Rust interop") == [topics[0], topics[3]]
+    # Only at the start of a word: "cargo" does not mention "go"
+    assert matcher.match("Cargo workspaces explained") is None
+    assert matcher.match("Golang generics") is topics[4]
+    assert matcher.match("", None) is None
+
+    assert TopicMatcher([]).match("anything") is None
+    print("✓ Topic matcher passed")
+
+
+if __name__ == "__main__":
+    test_topic_matcher()
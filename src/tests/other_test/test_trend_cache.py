@@ -0,0 +1,173 @@
+"""Test the per-(source, topic) result cache of cached_fetch."""
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+from glint.core.models import Topic, TrendRecord
+from glint.utils import cache
+from glint.utils.cache import cached_fetch
+
+
+class CountingFetcher:
+    backfill = False
+
+    def __init__(self):
+        self.calls = []
+
+    @cached_fetch(ttl=60)
+    def fetch(self, topics):
+        self.calls.append([topic.name for topic in topics])
+        return [
+            TrendRecord(title=topic.name, description="", url=f"https://example.com/{topic.name}",
+                  source="Test", category="test", topic_id=topic.id)
+            for topic in topics
+        ]
+
+
+class ExpiringFetcher(CountingFetcher):
+    @cached_fetch(ttl=0)
+    def fetch(self, topics):
+        return CountingFetcher.fetch.__wrapped__(self, topics)
+
+
+def test_cached_fetch_per_topic():
+    """Adding a topic only fetches that topic"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = cache.CacheManager(ttl_seconds=60)
+        store._cache_file = Path(directory) / "cache.db"
+        previous, cache.trend_cache = cache.trend_cache, store
+        try:
+            fetcher = CountingFetcher()
+            topics = [Topic(id=i, name=f"topic{i}") for i in range(1, 41)]
+            assert len(fetcher.fetch(topics)) == 40
+            print("✓ First fetch gets every topic")
+
+            trends = fetcher.fetch(topics + [Topic(id=41, name="topic41")])
+            assert fetcher.calls[-1] == ["topic41"]
+            assert [trend.topic_id for trend in trends] == list(range(1, 42))
+            print("✓ A new topic costs one topic's fetch, merged in topic order")
+
+            assert len(fetcher.fetch(topics)) == 40
+            assert len(fetcher.calls) == 2
+            print("✓ Cached topics are not fetched again")
+
+            fetcher.backfill = True
+            fetcher.fetch(topics)
+            assert len(fetcher.calls[-1]) == 40
+            print("✓ Backfill bypasses the cache")
+        finally:
+            cache.trend_cache = previous
+
+
+def test_cached_fetch_stale_while_revalidate():
+    """Expired entries are served at once and refreshed in the background"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = cache.CacheManager(max_stale=60)
+        store._cache_file = Path(directory) / "cache.db"
+        previous, cache.trend_cache = cache.trend_cache, store
+        try:
+            fetcher = ExpiringFetcher()
+            topics = [Topic(id=1, name="python"), Topic(id=2, name="rust")]
+            fetcher.fetch(topics)
+
+            assert len(fetcher.fetch(topics)) == 2
+            print("✓ Stale entries served without waiting")
+
+            for _ in range(50):
+                if len(fetcher.calls) == 2:
+                    break
+                time.sleep(0.05)
+            assert fetcher.calls == [["python", "rust"], ["python", "rust"]]
+            print("✓ Stale entries refreshed by a background worker")
+
+            store.max_stale = 0
+            fetcher.fetch(topics)
+            assert len(fetcher.calls) == 3
+            print("✓ Past the hard expiry the fetch waits for the source")
+        finally:
+            cache.trend_cache = previous
+
+
+def test_background_refresh_does_not_delay_exit():
+    """A process exits while a refresh is stuck, giving back its leases"""
+    with tempfile.TemporaryDirectory() as directory:
+        script = textwrap.dedent(f"""
+            import time
+            from pathlib import Path
+            from glint.core.models import Topic
+            from glint.utils import cache
+            from glint.utils.cache import cached_fetch
+
+            cache.trend_cache._cache_file = Path({directory!r}) / "cache.db"
+            cache.trend_cache.max_stale = 60
+
+            class Fetcher:
+                backfill = False
+                calls = 0
+
+                @cached_fetch(ttl=0)
+                def fetch(self, topics):
+                    Fetcher.calls += 1
+                    if Fetcher.calls > 1:
+                        time.sleep(30)  # the background refresh hangs
+                    return []
+
+            fetcher = Fetcher()
+            fetcher.fetch([Topic(id=1, name="python")])
+            fetcher.fetch([Topic(id=1, name="python")])  # stale: refreshed in the background
+            time.sleep(0.2)
+        """)
+        start = time.monotonic()
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=20)
+        assert time.monotonic() - start < 15
+
+        store = cache.CacheManager(max_stale=60)
+        store._cache_file = Path(directory) / "cache.db"
+        key = store._generate_key("Fetcher", "python")
+        assert store.get_many([key], allow_stale=True)
+        assert store.leased([key]) == []
+        print("✓ A stuck refresh neither delays the exit nor keeps its lease")
+
+
+def test_cache_eviction_and_stats():
+    """Least recently used entries go first, counters are kept per source"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = cache.CacheManager(max_entries=2)
+        store._cache_file = Path(directory) / "cache.db"
+        store.set("a", [1], source="GitHubFetcher")
+        store.set("b", [2], ttl=0, source="GitHubFetcher")
+        assert store.get("a") == [1]
+        assert store.get("b") is None
+        print("✓ Each entry expires after its own ttl")
+
+        store.set("c", [3], source="RedditFetcher")
+        assert store.get("a") == [1] and store.get("c") == [3]
+        assert store.get_many(["b"], allow_stale=True) == {}
+        print("✓ Least recently used entry evicted")
+
+        store.record("GitHubFetcher", hits=3, misses=1)
+        stats = store.stats()
+        assert stats["evictions"] == 1 and stats["entries"] == 2
+        assert stats["sources"]["GitHubFetcher"]["hits"] == 3
+        assert stats["sources"]["RedditFetcher"]["bytes"] > 0
+        print("✓ Stats report entries, bytes and counters per source")
+
+
+def test_cache_leases():
+    """Only one owner at a time fetches a key"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = cache.CacheManager()
+        store._cache_file = Path(directory) / "cache.db"
+        assert store.acquire(["a", "b"], "gui") == ["a", "b"]
+        assert store.acquire(["b", "c"], "daemon") == ["c"]
+        assert store.leased(["a", "b", "c", "d"]) == ["a", "b", "c"]
+        print("✓ Leased keys are not handed to a second owner")
+
+        store.release(["a", "b"], "gui")
+        store.release(["c"], "gui")  # not its lease
+        assert store.leased(["a", "b", "c"]) == ["c"]
+        assert store.acquire(["a"], "daemon", seconds=0) == ["a"]
+        assert store.acquire(["a"], "web") == ["a"]
+        print("✓ Released and expired leases can be taken again")
@@ -1,4 +1,5 @@
 from glint.utils.url_utils import normalize_url, urls_are_equivalent
+from glint.utils.canonical import canonical_url, canonical_urls
 
 def test_normalization():
     """Test various URL normalization scenarios. """
@@ -41,5 +42,26 @@ def test_normalization():
     print("✓ Test 6 passed: Real-world URLs matched")
     
     print("\n All tests passed!")
+
+
+def test_canonical_urls():
+    """Links to the same paper, repository or post share one canonical URL"""
+    paper = [
+        "http://arxiv.org/abs/2312.12345v1",
+        "https://arxiv.org/pdf/2312.12345v2",
+        "https://doi.org/10.48550/arXiv.2312.12345",
+    ]
+    assert set(canonical_urls(paper)) == {"https://arxiv.org/abs/2312.12345"}
+    assert canonical_url("https://dx.doi.org/10.1145/ABC.123") == canonical_url("https://doi.org/10.1145/abc.123")
+    assert canonical_url("https://github.com/Foo/Bar.git") == canonical_url("https://www.github.com/foo/bar/")
+    assert canonical_url("https://redd.it/abc12") == canonical_url(
+        "https://www.reddit.com/r/python/comments/abc12/some_title/"
+    )
+    # Other links are only normalized
+    assert canonical_url("https://github.com/foo/bar/issues/1") == "https://github.com/foo/bar/issues/1"
+    assert canonical_url("http://www.example.com/a/?utm_source=x") == normalize_url("http://www.example.com/a/?utm_source=x")
+    print("✓ Canonical URLs matched")
+
+
 if __name__ == "__main__":
     test_normalization()